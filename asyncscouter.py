@@ -0,0 +1,226 @@
+import geturl
+import parsetag
+import equipment
+import browserpool
+import httpclient
+import urlcache
+import rawcache
+import scouter
+import metrics
+import asyncio
+
+
+class AsyncItemScouter:
+    """
+    ItemScouter 의 asyncio 버전. 하나의 event loop 에서 많은 캐릭터를 동시에 scout.
+
+    url 획득, 장비 정보 page 요청, 점검/비공개 확인, 착용 장비 확인, 장비 정보 요청을
+    httpclient.AsyncHttpClient 로 수행하고, 파싱은 ItemScouter 와 같은 클래스(equipment) 를 사용.
+    event loop 를 막는 작업 (html 파싱, urlcache / rawcache 의 sqlite 및 파일 I/O) 은 asyncio.to_thread 로 실행.
+    한 캐릭터의 장비 정보 요청들도 동시에 보내며, 전체 요청 속도는 ratelimit 이 host 별로 제한.
+
+    결과는 scouter_class (ItemScouter 또는 PandasScouter 등) 객체이므로 동기 버전과 똑같이 사용할 수 있음.
+    HTTP 로 장비 정보를 얻지 못한 부위는 ItemScouter 와 같이 selenium 브라우저로 추출하되, thread 에서 실행.
+
+        async with AsyncItemScouter(concurrency=500) as async_scouter:
+            result = await async_scouter.scout_many(nicknames)
+
+    :param concurrency: maximum number of characters scouted concurrently (int)
+    :param client: async http client, created and closed by this object if None (httpclient.AsyncHttpClient or None)
+    :param background: selenium browser background run or not option (bool)
+    :param extractor: equipment information extractor, 'http' or 'selenium' (str)
+    :param browser_pool: pool to borrow selenium browsers from (browserpool.BrowserPool or None)
+    :param scouter_class: ItemScouter or its subclass such as PandasScouter (type)
+    :param breaker: to pause or abort during maintenance (circuitbreaker.CircuitBreaker or None)
+    """
+    def __init__(self, concurrency: int = 100, client: httpclient.AsyncHttpClient | None = None,
+                 background: bool = False, extractor: str = 'http', browser_pool: browserpool.BrowserPool = None,
+                 scouter_class: type = scouter.ItemScouter, breaker=None):
+        if concurrency < 1:
+            raise ValueError(f"concurrency : should be positive, but it is {concurrency}.")
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._own_client = client is None
+        self._client = httpclient.AsyncHttpClient() if client is None else client
+        self._background = background
+        self._extractor = extractor
+        self._browser_pool = browser_pool
+        self._scouter_class = scouter_class
+        self._breaker = breaker
+
+    async def scout(self, nickname: str, previous: scouter.ItemScouter = None) -> scouter.ItemScouter:
+        """
+        :param nickname: want to search (str)
+        :param previous: last scouted result of the same character (ItemScouter or None)
+        :return: scouted result (scouter_class)
+        """
+        # breaker 가 닫히기를 기다리는 캐릭터는 semaphore 를 차지하지 않음
+        if self._breaker is not None:
+            return await self._breaker.acall(self._scout_character, nickname, previous)
+        return await self._scout_character(nickname, previous)
+
+    async def _scout_character(self, nickname: str, previous: scouter.ItemScouter | None) -> scouter.ItemScouter:
+        async with self._semaphore:
+            item_scouter = self._scouter_class._deferred(nickname, self._background, False, self._extractor,
+                                                         self._browser_pool, previous)
+            parsed = await self._scout(item_scouter)
+            await asyncio.to_thread(item_scouter._finish, parsed)
+            return item_scouter
+
+    async def _equipment_page(self, equipment_url: str, validators: dict | None) -> parsetag.EquipmentPage:
+        response = await self._client.get(equipment_url,
+                                          headers=parsetag.EquipmentPage.conditional_headers(validators))
+        return await asyncio.to_thread(parsetag.EquipmentPage.from_response, equipment_url, response)
+
+    async def _scout(self, item_scouter: scouter.ItemScouter) -> dict:
+        """
+        ItemScouter._iter_item_tags() 와 같은 과정을 비동기로 수행한 후 파싱.
+
+        :param item_scouter: scouter created by _deferred() (scouter.ItemScouter)
+        :return: (TrimmedInformation, SummaryInformation) of each item, or None to reuse the previous one
+                 (dict[str, tuple or None])
+        """
+        nickname = item_scouter.nickname
+        previous = item_scouter._previous
+        validators = previous.validators if previous is not None else None
+        with metrics.timer('url_resolution', nickname=nickname):
+            equipment_url, from_cache = await geturl.resolve_equipment_url(self._client, nickname)
+        with metrics.timer('equipment_page', nickname=nickname):
+            equipment_page = await self._equipment_page(equipment_url, validators)
+        # cache 에 있던 url 이 에러를 돌려주면 cache 를 무시하고 url 을 다시 찾음
+        if from_cache and not equipment_page.ok:
+            await asyncio.to_thread(urlcache.get_cache().invalidate, nickname)
+            with metrics.timer('url_resolution', nickname=nickname):
+                equipment_url, _ = await geturl.resolve_equipment_url(self._client, nickname, use_cache=False)
+            with metrics.timer('equipment_page', nickname=nickname):
+                equipment_page = await self._equipment_page(equipment_url, validators)
+
+        i_equip_dict = await asyncio.to_thread(item_scouter._accept_page, equipment_page)
+        if i_equip_dict is None:
+            return dict.fromkeys(previous.equipments_info_dict)
+
+        # incremental 모드 : item pot 이 그대로인 부위는 이전 정보를 재사용
+        items = [item for item in i_equip_dict.keys() if not item_scouter._is_unchanged(item)]
+        item_info_tags = await self._extract(nickname, equipment_page, items)
+        return await asyncio.to_thread(self._parse_items, equipment_url, list(i_equip_dict.keys()), item_info_tags)
+
+    @staticmethod
+    def _parse_items(equipment_url: str, items: list[str], item_info_tags: dict) -> dict:
+        """
+        thread 에서 실행. 추출한 장비 정보 Tag 를 (record 모드이면 저장한 후) 파싱.
+
+        :param equipment_url: url of equipment detail page (str)
+        :param items: every worn category (list[str])
+        :param item_info_tags: Tag of information about each extracted equipment (dict[str, bs4.element.Tag])
+        :return: (TrimmedInformation, SummaryInformation) of each item, or None to reuse the previous one
+                 (dict[str, tuple or None])
+        """
+        parsed = {}
+        for item in items:
+            if item not in item_info_tags:
+                parsed[item] = None
+                continue
+            if rawcache.get_mode() == 'record':
+                rawcache.get_cache().put(rawcache.RawHtmlCache.item_key(equipment_url, item),
+                                         str(item_info_tags[item]).encode())
+            parsed[item] = equipment.get_item_memo().parse(item_info_tags[item])
+        return parsed
+
+    async def _extract(self, nickname: str, equipment_page: parsetag.EquipmentPage, items: list[str]) -> dict:
+        """
+        장비 정보 Tag 를 추출. http extractor 는 모든 부위를 동시에 요청하고, 실패한 부위만 selenium 으로 추출.
+
+        :param nickname: scouted character (str)
+        :param equipment_page: snapshot of equipment detail page (parsetag.EquipmentPage)
+        :param items: categories to extract (list[str])
+        :return: Tag of information about each equipment (dict[str, bs4.element.Tag])
+        """
+        import requests
+        item_info_tags = {}
+        # replay 모드에서는 저장해둔 장비 정보 Tag 만 사용하고 브라우저는 띄우지 않음
+        if rawcache.get_mode() == 'replay':
+            return await asyncio.to_thread(self._replayed_equipment_info_tags, equipment_page, items)
+        failed = items
+        if self._extractor == 'http':
+            tag_extractor = parsetag.HttpEquipmentTag(equipment_page)
+            results = await asyncio.gather(*(self._http_equipment_info_tag(tag_extractor, nickname, item)
+                                             for item in items), return_exceptions=True)
+            failed = []
+            for item, result in zip(items, results):
+                if isinstance(result, (RuntimeError, requests.RequestException)):
+                    metrics.count('http_fallbacks')
+                    metrics.event('http_fallback', nickname=nickname, slot=item)
+                    failed.append(item)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    item_info_tags[item] = result
+        if failed:
+            item_info_tags.update(await asyncio.to_thread(self._browser_equipment_info_tags, nickname,
+                                                          equipment_page.url, failed))
+        return {item: item_info_tags[item] for item in items}
+
+    @staticmethod
+    def _replayed_equipment_info_tags(equipment_page: parsetag.EquipmentPage, items: list[str]) -> dict:
+        # thread 에서 실행. rawcache 에 저장해둔 장비 정보 Tag 를 읽음
+        tag_extractor = parsetag.ReplayEquipmentTag(equipment_page)
+        return {item: tag_extractor.get_equipment_info_tag(item) for item in items}
+
+    async def _http_equipment_info_tag(self, tag_extractor: parsetag.HttpEquipmentTag, nickname: str, item: str):
+        link = tag_extractor._get_equipment_link(item)
+        with metrics.timer('slot_extract', nickname=nickname, slot=item, extractor='http'):
+            response = await self._client.get(link, headers=tag_extractor._request_headers())
+            return await asyncio.to_thread(tag_extractor._find_equipment_info_tag, response, item)
+
+    def _browser_equipment_info_tags(self, nickname: str, equipment_url: str, items: list[str]) -> dict:
+        # thread 에서 실행. 브라우저 하나로 모든 부위를 차례로 추출
+        browser_pool = self._browser_pool
+        if browser_pool is None:
+            browser_pool = browserpool.shared_pool(self._background)
+        with metrics.timer('browser_startup', nickname=nickname):
+            open_browser = parsetag.BrowserForEquipmentTag(equipment_url, self._background, browser_pool)
+        try:
+            item_info_tags = {}
+            for item in items:
+                with metrics.timer('slot_extract', nickname=nickname, slot=item, extractor='selenium'):
+                    item_info_tags[item] = open_browser.get_equipment_info_tag(item)
+            return item_info_tags
+        finally:
+            open_browser.quit_browser()
+
+    async def scout_many(self, nicknames) -> scouter.BatchScoutResult:
+        """
+        scouter.scout_many() 의 asyncio 버전. 최대 concurrency 개의 캐릭터를 동시에 scout.
+
+        :param nicknames: want to search (Iterable[str])
+        :return: scouters and failures keyed by nickname (scouter.BatchScoutResult)
+        """
+        # 중복 nickname 은 한 번만 scout (순서 유지)
+        nicknames = list(dict.fromkeys(nicknames))
+        result = scouter.BatchScoutResult()
+
+        async def scout_one(nickname: str):
+            try:
+                result._add_scouter(nickname, await self.scout(nickname))
+            except Exception as error:
+                result._add_failure(nickname, error)
+
+        await asyncio.gather(*(scout_one(nickname) for nickname in nicknames))
+        return result
+
+    async def close(self):
+        if self._own_client:
+            await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def client(self):
+        return self._client
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,103 @@
+"""
+각 module 의 import 시간을 새 python process 에서 측정하고, 무거운 dependency 를 import 시점에 불러오는지 확인.
+
+selenium, pandas, bs4, requests 등은 실제로 사용할 때 (브라우저 실행, PandasScouter, 파싱, 요청) 불러와야 하므로
+module 을 import 한 것만으로 이들이 sys.modules 에 들어가면 실패로 처리.
+import 시간은 baseline 과 비교하여 느려진 경우도 실패로 처리.
+
+usage : python benchmarks/bench_import.py [--repeat N] [--baseline FILE] [--save-baseline]
+                                          [--tolerance 0.5] [--min-ms 10]
+"""
+from pathlib import Path
+import statistics
+import subprocess
+import argparse
+import json
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "import_baseline.json"
+# 측정할 module 과 그 module 이 import 시점에 불러오면 안 되는 dependency
+MODULES = {'scouter': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'geturl': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'parsetag': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'equipment': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'browserpool': ('selenium',),
+           'ranking': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'metrics': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'asyncscouter': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp'),
+           'store': ('selenium', 'pandas', 'bs4', 'requests', 'aiohttp', 'pyarrow')}
+# 새 process 에서 실행하는 측정 코드. import 시간(ms) 과 불러온 dependency 를 JSON 으로 출력
+PROBE = """
+import time, sys, json
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'ms': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def probe(module: str, heavy: tuple[str, ...]) -> dict:
+    """
+    :param module: module to import (str)
+    :param heavy: dependencies which should not be imported (tuple[str, ...])
+    :return: {'ms', 'loaded'} (dict)
+    """
+    completed = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=heavy)], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(module: str, heavy: tuple[str, ...], repeat: int) -> dict:
+    """
+    :return: median import milliseconds of repeat runs and dependencies loaded at import (dict)
+    """
+    results = [probe(module, heavy) for _ in range(repeat)]
+    return {'ms': statistics.median(result['ms'] for result in results), 'loaded': results[0]['loaded']}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    arg_parser.add_argument("--tolerance", type=float, default=0.5,
+                            help="report a module as slower beyond this ratio (default 0.5)")
+    arg_parser.add_argument("--min-ms", type=float, default=10.0,
+                            help="ignore differences smaller than this many milliseconds (default 10)")
+    args = arg_parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'modules': {}}
+    for module, heavy in MODULES.items():
+        report['modules'][module] = measure(module, heavy, args.repeat)
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    failed = False
+    print(f"{'module':<14}{'ms':>10}{'baseline':>10}{'ratio':>8}  result")
+    for module, current in report['modules'].items():
+        row = f"{module:<14}{current['ms']:>10.1f}"
+        result = "ok"
+        if current['loaded']:
+            result, failed = f"imports {', '.join(current['loaded'])}", True
+        previous = None if baseline is None else baseline['modules'].get(module)
+        if previous is None:
+            print(row + f"{'':>18}  {result}")
+            continue
+        ratio = current['ms'] / previous['ms'] if previous['ms'] > 0 else float('inf')
+        # 짧은 import 는 측정 오차가 비율로는 크게 보이므로 절대 차이도 함께 확인
+        if (current['ms'] - previous['ms'] >= args.min_ms) and (ratio > 1 + args.tolerance):
+            result, failed = result + ", slower", True
+        print(row + f"{previous['ms']:>10.1f}{ratio:>8.2f}  {result}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nbaseline saved : {args.baseline}")
+    elif baseline is None:
+        print(f"\nno baseline : run with --save-baseline to create {args.baseline}.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+fixture (benchmarks/record_fixtures.py 로 녹화) 의 장비 정보로 많은 캐릭터를 scout 한 것처럼 ItemScouter 를 만들면서
+process 의 RSS 변화를 측정.
+
+- 파싱 결과 (TrimmedInformation, SummaryInformation) 가 장비 정보 Tag 나 page 전체 (bs4 / selectolax 객체) 를
+  참조하고 있지 않은지 확인
+- 결과를 바로 버리는 경우 (main.py 처럼 저장하고 버리는 batch) 캐릭터 수가 늘어도 RSS 가 일정한지 확인
+- --keep 이면 결과를 모두 보관 (BatchScoutResult 처럼) 하고 캐릭터 당 늘어나는 메모리를 출력
+
+모든 캐릭터가 서로 다른 장비를 착용한 경우를 가정하여 ParsedItemMemo 는 사용하지 않음.
+
+usage : python benchmarks/bench_memory.py [--fixtures DIR] [--characters 3000] [--keep] [--max-growth-mb 16]
+"""
+from pathlib import Path
+import argparse
+import gc
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import htmlparser
+import equipment
+import scouter
+from bench_pipeline import FIXTURES_DIR, load_fixtures, item_info_tag
+
+# 이 module 의 객체가 파싱 결과에서 참조되면 html 이 메모리에 남아있다는 뜻
+DOM_MODULES = ('bs4', 'selectolax', 'htmlparser')
+
+
+def rss_mb() -> float:
+    """
+    현재 process 의 RSS (MB). psutil 이 없으면 /proc/self/statm 을 사용.
+
+    :return: resident set size in MB (float)
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        import os
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def dom_references(root, limit: int = 100000) -> list[str]:
+    """
+    root 에서 참조를 따라가며 html 파싱 결과 (DOM_MODULES 의 객체) 가 있는지 찾음.
+
+    :param root: object to inspect (object)
+    :param limit: maximum number of objects to visit (int)
+    :return: type names of found DOM objects (list[str])
+    """
+    found = set()
+    seen = {id(root)}
+    stack = [root]
+    while stack and (len(seen) < limit):
+        obj = stack.pop()
+        module = type(obj).__module__.split('.')[0]
+        if module in DOM_MODULES:
+            found.add(f"{type(obj).__module__}.{type(obj).__name__}")
+            continue
+        # class, module 등 공용 객체까지 따라가지 않도록 instance 와 container 만 확인
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, (type, type(sys))) or id(referent) in seen:
+                continue
+            seen.add(id(referent))
+            stack.append(referent)
+    return sorted(found)
+
+
+def scout_fixture(character: dict, nickname: str) -> scouter.ItemScouter:
+    """
+    fixture 한 캐릭터의 장비 정보 html 을 파싱하여 ItemScouter 를 완성 (요청은 하지 않음).
+
+    :param character: loaded fixture (dict)
+    :param nickname: nickname of the new scouter (str)
+    :return: scouted result (scouter.ItemScouter)
+    """
+    memo = equipment.get_item_memo()
+    item_scouter = scouter.ItemScouter._deferred(nickname)
+    item_scouter._finish({slot: memo.parse(item_info_tag(html)) for slot, html in character['items'].items()})
+    return item_scouter
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    arg_parser.add_argument("--characters", type=int, default=3000)
+    arg_parser.add_argument("--backend", choices=htmlparser.BACKENDS, default=None)
+    arg_parser.add_argument("--keep", action="store_true", help="keep every result like BatchScoutResult")
+    arg_parser.add_argument("--max-growth-mb", type=float, default=16.0,
+                            help="fail if RSS grows more than this after warm-up, without --keep (default 16)")
+    args = arg_parser.parse_args()
+
+    if (not args.fixtures.exists()) or not any(path.is_dir() for path in args.fixtures.iterdir()):
+        print(f"no fixtures : record some with benchmarks/record_fixtures.py into {args.fixtures}.")
+        return 1
+    htmlparser.configure(args.backend)
+    characters = [character for character in load_fixtures(args.fixtures) if character['items']]
+    if not characters:
+        print("no fixtures with equipment items.")
+        return 1
+    equipment.configure_item_memo(0)
+
+    sample = scout_fixture(characters[0], characters[0]['nickname'])
+    references = dom_references(sample)
+    print(f"fixtures : {len(characters)} characters, backend : {htmlparser.get_backend()}")
+    print(f"DOM references from a result : {', '.join(references) if references else 'none'}")
+    del sample
+
+    kept = []
+    checkpoints = max(1, args.characters // 10)
+    warm_up = None
+    samples = []
+    print(f"\n{'characters':>10}{'items':>10}{'RSS MB':>10}")
+    items = 0
+    for index in range(args.characters):
+        character = characters[index % len(characters)]
+        item_scouter = scout_fixture(character, f"{character['nickname']}#{index}")
+        items += len(character['items'])
+        if args.keep:
+            kept.append(item_scouter)
+        del item_scouter
+        if (index + 1) % checkpoints == 0:
+            gc.collect()
+            rss = rss_mb()
+            samples.append((index + 1, rss))
+            # 첫 checkpoint 는 import, 정규식, 파서 초기화 등을 포함하므로 기준에서 제외
+            if warm_up is None:
+                warm_up = rss
+            print(f"{index + 1:>10}{items:>10}{rss:>10.1f}")
+
+    failed = bool(references)
+    growth = samples[-1][1] - warm_up
+    if args.keep:
+        first, last = samples[0], samples[-1]
+        per_character = (last[1] - first[1]) * 1024 / max(1, last[0] - first[0])
+        print(f"\nkept {len(kept)} results : {per_character:.1f} KB per character")
+    else:
+        print(f"\nRSS growth after warm-up : {growth:.1f} MB (limit {args.max_growth_mb} MB)")
+        failed = failed or (growth > args.max_growth_mb)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+parser backend 별 page 당 파싱 시간 측정 및 추출 결과 비교.
+
+저장해둔 html (랭킹 검색 결과, 캐릭터 정보, 장비 정보 page, 장비 정보 Tag) 각각을
+backend 별로 파싱하여 실제로 사용하는 정보를 추출하고,
+html.parser 의 추출 결과와 다른 backend 가 있으면 표시함.
+
+usage : python benchmarks/bench_parser.py [html files ...] [--repeat N] [--backends lxml selectolax ...]
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import htmlparser
+import geturl
+import parsetag
+import equipment
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+REFERENCE_BACKEND = 'html.parser'
+
+
+def page_kind(html: str) -> str:
+    """
+    :param html: saved html (str)
+    :return: 'ranking', 'equipment', 'item' or 'detail' (str)
+    """
+    if 'rank_table' in html:
+        return 'ranking'
+    # 비공개 캐릭터나 점검 중인 장비 정보 page 에는 item_pot 대신 안내 이미지만 있음
+    if ('item_pot' in html) or ('공개하지 않은 정보입니다.' in html) or ('게임 점검 중에는' in html):
+        return 'equipment'
+    if 'item_title' in html:
+        return 'item'
+    return 'detail'
+
+
+def equipped_slots(page: parsetag.EquipmentPage) -> list[str]:
+    # scouter.ItemScouter._equip_or_not_dict 와 같은 selector
+    slots = []
+    for key, value in parsetag.EQUIPMENT_INDEX.items():
+        item_pot = page.soup.select_one(f"#container ul.item_pot > li:nth-child({value}) a")
+        if (item_pot is not None) and (item_pot["href"] != ""):
+            slots.append(key)
+    return slots
+
+
+def item_fields(info: equipment.TrimmedInformation) -> dict:
+    return {'name': info.name, 'scroll': info.scroll, 'category': info.category,
+            'stat_options': dict(info.stat_options),
+            'potential': (info.potential_tier, dict(info.potential_options)),
+            'additional': (info.additional_tier, dict(info.additional_options)),
+            'starforce': (info.starforce_max, info.starforce_now),
+            'superior': info.superior, 'hammer': info.hammer}
+
+
+def extract(kind: str, html: str):
+    """
+    현재 backend 로 html 을 파싱하고, 해당 page 에서 실제로 사용하는 정보를 추출
+
+    :param kind: page kind (str)
+    :param html: saved html (str)
+    :return: extracted fields (object)
+    """
+    if kind == 'ranking':
+        return geturl.GetCharacterDetailUrl._find_ranking_urls(htmlparser.parse(html))
+    if kind == 'detail':
+        return geturl.GetDetailEquipmentUrl._find_equipment_url(htmlparser.parse(html))
+    if kind == 'equipment':
+        page = parsetag.EquipmentPage.from_html("", html)
+        try:
+            parsetag.is_available(page)
+            available = "available"
+        except RuntimeError as error:
+            available = str(error)
+        return available, equipped_slots(page)
+    soup = htmlparser.parse(html)
+    item_info = soup.select_one("div.item_info > div") or soup
+    return item_fields(equipment.TrimmedInformation(item_info))
+
+
+def available_backends(requested) -> list[str]:
+    backends = []
+    for backend in requested:
+        try:
+            htmlparser.parse("<p></p>", backend)
+        except Exception as error:
+            print(f"skip {backend} : {error}")
+            continue
+        backends.append(backend)
+    return backends
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("paths", nargs="*", type=Path)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--backends", nargs="+", default=list(htmlparser.BACKENDS))
+    args = arg_parser.parse_args()
+
+    paths = args.paths or sorted(FIXTURES_DIR.rglob("*.html"))
+    if not paths:
+        print(f"no html fixtures : record some into {FIXTURES_DIR} or pass paths.")
+        return 1
+    backends = available_backends([REFERENCE_BACKEND] + [b for b in args.backends if b != REFERENCE_BACKEND])
+    pages = [(path, page_kind(path.read_text(encoding="utf-8")), path.read_text(encoding="utf-8")) for path in paths]
+
+    mismatches = 0
+    print(f"{'page':<40} {'kind':<10}" + "".join(f"{backend:>14}" for backend in backends) + "   (ms / page)")
+    for path, kind, html in pages:
+        reference = None
+        row = f"{path.name[:40]:<40} {kind:<10}"
+        for backend in backends:
+            htmlparser.configure(backend)
+            result = extract(kind, html)
+            if reference is None:
+                reference = result
+            same = result == reference
+            mismatches += not same
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                extract(kind, html)
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            row += f"{elapsed:>13.2f}{' ' if same else '!'}"
+        print(row)
+    htmlparser.configure(None)
+    if mismatches:
+        print(f"\n{mismatches} result(s) marked with ! differ from {REFERENCE_BACKEND}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
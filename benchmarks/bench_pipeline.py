@@ -0,0 +1,250 @@
+"""
+저장해둔 fixture (benchmarks/record_fixtures.py 로 녹화) 로 scout 의 각 단계를 따로 측정하고 baseline 과 비교.
+
+단계 : url 추출, 장비 정보 page 파싱, 점검/비공개 확인, 착용 장비 확인,
+       장비 정보 Tag html 파싱, Tag 파싱 (ParseInfoTag ~ TrimmedInformation), 요약 (SummaryInformation),
+       DataFrame 생성 (SummaryFrameBuilder, total_stat)
+
+각 단계는 앞 단계의 결과를 미리 만들어두고 그 단계만 repeat 번 실행하여 가장 빠른 시간을 기록.
+단계별 결과의 hash 도 함께 기록하여, 속도뿐 아니라 추출 결과가 바뀌었는지도 baseline 과 비교.
+
+fixture 구조 : benchmarks/fixtures/<nickname>/{ranking,detail,equipment}.html, items/<부위>.html
+
+usage : python benchmarks/bench_pipeline.py [--fixtures DIR] [--repeat N] [--baseline FILE] [--save-baseline]
+                                            [--tolerance 0.25] [--min-ms 0.5]
+"""
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import time
+import gc
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import htmlparser
+import geturl
+import parsetag
+import equipment
+import scouter
+from bench_parser import item_fields
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+PAGE_KINDS = ('ranking', 'detail', 'equipment')
+
+
+def load_fixtures(root: Path) -> list[dict]:
+    """
+    :param root: fixtures directory (Path)
+    :return: {'nickname', 'ranking', 'detail', 'equipment', 'items'} of each character (list[dict])
+    """
+    characters = []
+    for directory in sorted(path for path in root.iterdir() if path.is_dir()):
+        character = {'nickname': directory.name}
+        for kind in PAGE_KINDS:
+            path = directory / f"{kind}.html"
+            character[kind] = path.read_text(encoding="utf-8") if path.exists() else None
+        item_paths = sorted((directory / "items").glob("*.html"),
+                            key=lambda path: parsetag.EQUIPMENT_INDEX.get(path.stem, len(parsetag.EQUIPMENT_INDEX)))
+        character['items'] = {path.stem: path.read_text(encoding="utf-8") for path in item_paths}
+        characters.append(character)
+    return characters
+
+
+def item_info_tag(html: str):
+    soup = htmlparser.parse(html)
+    return soup.select_one("div.item_info > div") or soup
+
+
+def coverage(trimmed: list[equipment.TrimmedInformation]) -> dict:
+    """
+    fixture 의 장비들이 어떤 경우를 포함하고 있는지 (잠재옵션 등급, 슈페리얼, 황금망치 등)
+
+    :param trimmed: parsed items (list[equipment.TrimmedInformation])
+    :return: counts of each case (dict)
+    """
+    result = {'items': len(trimmed), 'superior': 0, 'hammer': 0, 'starforce': 0, 'scroll': 0,
+              'potential_tiers': {}, 'additional_tiers': {}}
+    for info in trimmed:
+        result['superior'] += info.superior
+        result['hammer'] += info.hammer
+        result['starforce'] += info.starforce_now > 0
+        result['scroll'] += info.scroll > 0
+        for key, tier in (('potential_tiers', info.potential_tier), ('additional_tiers', info.additional_tier)):
+            result[key][tier] = result[key].get(tier, 0) + 1
+    return result
+
+
+def digest(result) -> str:
+    encoded = json.dumps(result, ensure_ascii=False, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class Stages:
+    """
+    fixture 로 각 단계의 입력을 미리 만들어두고, 단계 별 함수를 제공.
+    각 함수는 그 단계만 수행하고 비교할 결과를 반환.
+
+    :param characters: loaded fixtures (list[dict])
+    """
+    STAGES = ('url_extraction', 'page_parse', 'availability', 'slot_detection',
+              'item_html_parse', 'tag_parsing', 'summarization', 'dataframe')
+
+    def __init__(self, characters: list[dict]):
+        self._characters = characters
+        self._pages = [parsetag.EquipmentPage.from_html("", character['equipment'])
+                       for character in characters if character['equipment'] is not None]
+        self._available_pages = []
+        for page in self._pages:
+            try:
+                parsetag.is_available(page)
+                self._available_pages.append(page)
+            except RuntimeError:
+                continue
+        self._item_htmls = [(character['nickname'], slot, html)
+                            for character in characters for slot, html in character['items'].items()]
+        self._item_tags = [(nickname, slot, item_info_tag(html)) for nickname, slot, html in self._item_htmls]
+        self._trimmed = [(nickname, slot, equipment.TrimmedInformation(tag))
+                         for nickname, slot, tag in self._item_tags]
+        self._summaries = {}
+        for nickname, slot, info in self._trimmed:
+            self._summaries.setdefault(nickname, {})[slot] = equipment.SummaryInformation(info)
+
+    def url_extraction(self):
+        urls = []
+        for character in self._characters:
+            if character['ranking'] is not None:
+                ranking_urls = geturl.GetCharacterDetailUrl._find_ranking_urls(htmlparser.parse(character['ranking']))
+                urls.append(ranking_urls.get(character['nickname']))
+            if character['detail'] is not None:
+                urls.append(geturl.GetDetailEquipmentUrl._find_equipment_url(htmlparser.parse(character['detail'])))
+        return urls
+
+    def page_parse(self):
+        pages = [parsetag.EquipmentPage.from_html("", character['equipment'])
+                 for character in self._characters if character['equipment'] is not None]
+        return len(pages)
+
+    def availability(self):
+        results = []
+        for page in self._pages:
+            try:
+                parsetag.is_available(page)
+                results.append("available")
+            except RuntimeError as error:
+                results.append(str(error))
+        return results
+
+    def slot_detection(self):
+        return [list(scouter.ItemScouter._equip_or_not_dict(page)) for page in self._available_pages]
+
+    def item_html_parse(self):
+        return [slot for _, slot, html in self._item_htmls if item_info_tag(html) is not None]
+
+    def tag_parsing(self):
+        return [item_fields(equipment.TrimmedInformation(tag)) for _, _, tag in self._item_tags]
+
+    def summarization(self):
+        return [list(equipment.SummaryInformation(info).stats.values) for _, _, info in self._trimmed]
+
+    def dataframe(self):
+        builder = scouter.SummaryFrameBuilder()
+        for nickname, summary_info_dict in self._summaries.items():
+            builder.add(nickname, summary_info_dict)
+        df = builder.build()
+        total = scouter.total_stat(df)
+        return [df.to_json(), scouter.drop_zero_columns(total).to_json()]
+
+    @property
+    def trimmed(self):
+        return [info for _, _, info in self._trimmed]
+
+
+def measure(function, repeat: int) -> float:
+    """
+    timeit 과 같이 gc 를 끄고 측정한 repeat 번 중 가장 빠른 실행 시간.
+    느린 실행은 대부분 다른 process 나 gc 때문이므로, 중앙값보다 실행마다의 차이가 작음.
+
+    :return: minimum elapsed milliseconds of repeat runs (float)
+    """
+    elapsed = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(elapsed)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--backend", choices=htmlparser.BACKENDS, default=None)
+    arg_parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="report a stage as slower / faster beyond this ratio (default 0.25)")
+    arg_parser.add_argument("--min-ms", type=float, default=0.5,
+                            help="ignore differences smaller than this many milliseconds (default 0.5)")
+    args = arg_parser.parse_args()
+
+    if (not args.fixtures.exists()) or not any(path.is_dir() for path in args.fixtures.iterdir()):
+        print(f"no fixtures : record some with benchmarks/record_fixtures.py into {args.fixtures}.")
+        return 1
+    htmlparser.configure(args.backend)
+    characters = load_fixtures(args.fixtures)
+    stages = Stages(characters)
+    print(f"fixtures : {len(characters)} characters, backend : {htmlparser.get_backend()}")
+    print(f"coverage : {json.dumps(coverage(stages.trimmed), ensure_ascii=False)}")
+    print()
+
+    report = {'backend': htmlparser.get_backend(), 'characters': len(characters), 'stages': {}}
+    for name in Stages.STAGES:
+        function = getattr(stages, name)
+        report['stages'][name] = {'ms': measure(function, args.repeat), 'digest': digest(function())}
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    failed = False
+    print(f"{'stage':<16}{'ms':>10}{'baseline':>10}{'ratio':>8}  result")
+    for name, current in report['stages'].items():
+        row = f"{name:<16}{current['ms']:>10.2f}"
+        previous = None if baseline is None else baseline['stages'].get(name)
+        if previous is None:
+            print(row)
+            continue
+        ratio = current['ms'] / previous['ms'] if previous['ms'] > 0 else float('inf')
+        mark = ""
+        # 아주 짧은 단계는 측정 오차가 비율로는 크게 보이므로 절대 차이도 함께 확인
+        if abs(current['ms'] - previous['ms']) < args.min_ms:
+            pass
+        elif ratio > 1 + args.tolerance:
+            mark, failed = " slower", True
+        elif ratio < 1 - args.tolerance:
+            mark = " faster"
+        same = current['digest'] == previous['digest']
+        failed = failed or not same
+        print(row + f"{previous['ms']:>10.2f}{ratio:>8.2f}  {'same' if same else 'CHANGED'}{mark}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nbaseline saved : {args.baseline}")
+    elif baseline is None:
+        print(f"\nno baseline : run with --save-baseline to create {args.baseline}.")
+    elif baseline.get('backend') != report['backend']:
+        print(f"\nnote : baseline backend is {baseline.get('backend')}.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
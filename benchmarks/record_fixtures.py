@@ -0,0 +1,116 @@
+"""
+bench_pipeline.py 와 bench_parser.py 에서 사용할 fixture 를 실제 홈페이지에서 녹화.
+
+각 캐릭터를 rawcache record 모드로 scout 하여 (url cache 는 사용하지 않음)
+랭킹 검색 결과, 캐릭터 정보, 장비 정보 page 와 착용 장비 각각의 장비 정보 Tag 를
+benchmarks/fixtures/<nickname>/{ranking,detail,equipment}.html, items/<부위>.html 로 저장.
+점검 중이거나 비공개인 캐릭터도 녹화된 page 까지 저장 (점검/비공개 확인 단계의 fixture).
+
+녹화가 끝나면 fixture 전체가 잠재옵션 등급, 슈페리얼, 황금망치 장비를 포함하는지 출력하고,
+빠진 경우가 있으면 해당 장비를 착용한 캐릭터를 더 녹화하도록 알림.
+
+usage : python benchmarks/record_fixtures.py nickname [nickname ...] [--out DIR] [--extractor http|selenium]
+"""
+from pathlib import Path
+import tempfile
+import argparse
+import json
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import htmlparser
+import geturl
+import parsetag
+import rawcache
+import urlcache
+import scouter
+from bench_pipeline import FIXTURES_DIR, load_fixtures, coverage, item_info_tag
+import equipment
+
+POTENTIAL_TIERS = ('레어', '에픽', '유니크', '레전드리')
+
+
+def decode(record: dict) -> str:
+    return record['content'].decode(record['encoding'] or 'utf-8', errors='replace')
+
+
+def export(cache: rawcache.RawHtmlCache, nickname: str, out: Path) -> int:
+    """
+    녹화된 page 들을 nickname 의 fixture directory 에 저장. 녹화되지 않은 단계에서 멈춤.
+
+    :param cache: cache recorded while scouting (rawcache.RawHtmlCache)
+    :param nickname: scouted character (str)
+    :param out: fixtures directory (Path)
+    :return: number of saved files (int)
+    """
+    directory = out / nickname
+    saved = 0
+
+    def save(name: str, html: str):
+        nonlocal saved
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html, encoding="utf-8")
+        saved += 1
+
+    ranking = cache.get(geturl.GetCharacterDetailUrl.ranking_search_url(nickname))
+    if ranking is None:
+        return saved
+    save("ranking.html", decode(ranking))
+    detail_url = geturl.GetCharacterDetailUrl._find_ranking_urls(htmlparser.parse(decode(ranking))).get(nickname)
+    detail = None if detail_url is None else cache.get(detail_url)
+    if detail is None:
+        return saved
+    save("detail.html", decode(detail))
+    try:
+        equipment_url = geturl.GetDetailEquipmentUrl._find_equipment_url(htmlparser.parse(decode(detail)))
+    except RuntimeError:
+        return saved
+    equipment_page = cache.get(equipment_url)
+    if equipment_page is None:
+        return saved
+    save("equipment.html", decode(equipment_page))
+    for slot in parsetag.EQUIPMENT_INDEX.keys():
+        item = cache.get(rawcache.RawHtmlCache.item_key(equipment_url, slot))
+        if item is not None:
+            save(f"items/{slot}.html", decode(item))
+    return saved
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("nicknames", nargs="+")
+    arg_parser.add_argument("--out", type=Path, default=FIXTURES_DIR)
+    arg_parser.add_argument("--extractor", choices=scouter.ItemScouter.EXTRACTORS, default='http')
+    args = arg_parser.parse_args()
+
+    # 모든 단계의 page 가 녹화되도록 url cache 는 사용하지 않음
+    urlcache.configure(None)
+    with tempfile.TemporaryDirectory() as root:
+        rawcache.configure(root, 'record')
+        for nickname in args.nicknames:
+            try:
+                scouter.ItemScouter(nickname, background=True, extractor=args.extractor)
+                status = "scouted"
+            except RuntimeError as error:
+                status = str(error)
+            saved = export(rawcache.get_cache(), nickname, args.out)
+            print(f"{nickname} : {status}, {saved} file(s) saved")
+        rawcache.configure()
+
+    trimmed = [equipment.TrimmedInformation(item_info_tag(html))
+               for character in load_fixtures(args.out) for html in character['items'].values()]
+    result = coverage(trimmed)
+    print(f"\ncoverage : {json.dumps(result, ensure_ascii=False)}")
+    missing = [f"potential {tier}" for tier in POTENTIAL_TIERS if tier not in result['potential_tiers']]
+    missing += [f"additional {tier}" for tier in POTENTIAL_TIERS if tier not in result['additional_tiers']]
+    missing += [case for case in ('superior', 'hammer') if result[case] == 0]
+    if missing:
+        print(f"missing : {', '.join(missing)} - record characters wearing such items.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
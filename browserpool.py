@@ -0,0 +1,216 @@
+from contextlib import contextmanager
+import threading
+import atexit
+
+
+class BrowserPool:
+    """
+    selenium 브라우저(webdriver.Chrome) 를 미리 띄워두고 여러 ItemScouter 가 빌려 쓰도록 하는 pool.
+    selenium 은 브라우저를 처음 띄울 때 import.
+
+    브라우저 실행 시간이 캐릭터 당 소요 시간의 대부분을 차지하므로,
+    한 번 띄운 브라우저를 캐릭터 사이에 초기화(쿠키 삭제, about:blank) 하여 재사용.
+
+    다음의 경우 해당 브라우저는 종료하고, 다음 요청 시 새 브라우저를 띄움.
+    - 사용 중 WebDriverException 발생 (crash)
+    - 누적 page 수가 max_pages 초과
+    - 브라우저 메모리 사용량이 max_memory_mb 초과
+
+    :param size: maximum number of browsers (int)
+    :param background: webdriver.ChromeOptions --headless (bool)
+    :param max_pages: recycle a browser after this many page loads and clicks (int)
+    :param max_memory_mb: recycle a browser when its memory usage exceeds this (MB) (int)
+    """
+    def __init__(self, size: int = 2, background: bool = True, max_pages: int = 500, max_memory_mb: int = 1024):
+        if size < 1:
+            raise ValueError(f"size : should be positive, but it is {size}.")
+        self._size = size
+        self._background = background
+        self._max_pages = max_pages
+        self._max_memory_mb = max_memory_mb
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._page_counts = {}
+        self._closed = False
+
+    def _launch(self):
+        """
+        새 브라우저 실행
+
+        :return: new browser (webdriver.Chrome)
+        """
+        from selenium import webdriver
+        # chrome browser 를 열지 않고 background 에서 실행
+        options = webdriver.ChromeOptions()
+        if self._background:
+            options.add_argument("--headless")
+        browser = webdriver.Chrome('./chromedriver', chrome_options=options)
+        with self._lock:
+            self._page_counts[id(browser)] = 0
+        return browser
+
+    def _discard(self, browser):
+        """
+        브라우저 종료 후 pool 에서 제거. 이미 죽은 브라우저일 수 있으므로 종료 중 예외는 무시.
+
+        :param browser: browser to discard (webdriver.Chrome)
+        :return: None
+        """
+        from selenium.common.exceptions import WebDriverException
+        with self._lock:
+            self._page_counts.pop(id(browser), None)
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def _memory_mb(browser) -> float:
+        """
+        브라우저의 메모리 사용량(MB).
+
+        psutil 이 설치되어 있으면 chromedriver 하위 프로세스 전체의 RSS 합을,
+        없으면 현재 page 의 JS heap 사용량을 사용.
+        chromedriver 프로세스가 이미 없거나 접근할 수 없으면 교체하도록 inf.
+
+        :param browser: target browser (webdriver.Chrome)
+        :return: memory usage in MB (float)
+        """
+        try:
+            import psutil
+        except ImportError:
+            heap = browser.execute_script(
+                "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0")
+            return heap / 2 ** 20
+        try:
+            process = psutil.Process(browser.service.process.pid)
+            rss = sum(child.memory_info().rss for child in process.children(recursive=True))
+        except (psutil.Error, AttributeError):
+            # NoSuchProcess, AccessDenied 또는 service.process 가 None
+            return float('inf')
+        return rss / 2 ** 20
+
+    def _is_worn_out(self, browser) -> bool:
+        """
+        page 수 또는 메모리 한도를 넘어 교체해야 하는 브라우저인지 확인
+
+        :param browser: target browser (webdriver.Chrome)
+        :return: whether to recycle the browser or not (bool)
+        """
+        with self._lock:
+            pages = self._page_counts.get(id(browser), 0)
+        if pages >= self._max_pages:
+            return True
+        return self._memory_mb(browser) >= self._max_memory_mb
+
+    def acquire(self):
+        """
+        쉬고 있는 브라우저를 빌려줌. 없으면 새로 띄우고, pool 이 가득 찼다면 반납될 때까지 대기.
+
+        :return: warm browser (webdriver.Chrome)
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed.")
+        self._slots.acquire()
+        with self._lock:
+            browser = self._idle.pop() if self._idle else None
+        if browser is not None:
+            return browser
+        try:
+            return self._launch()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, browser, pages: int = 0, broken: bool = False):
+        """
+        빌려간 브라우저를 반납. 다음 캐릭터를 위해 초기화하고, crash 또는 한도 초과 시 교체.
+
+        :param browser: borrowed browser (webdriver.Chrome)
+        :param pages: number of page loads and clicks done while borrowed (int)
+        :param broken: whether the browser raised WebDriverException or not (bool)
+        :return: None
+        """
+        from selenium.common.exceptions import WebDriverException
+        try:
+            with self._lock:
+                if id(browser) in self._page_counts:
+                    self._page_counts[id(browser)] += pages
+            if broken or self._closed:
+                self._discard(browser)
+                return
+            try:
+                browser.delete_all_cookies()
+                browser.get("about:blank")
+                worn_out = self._is_worn_out(browser)
+            except WebDriverException:
+                worn_out = True
+            if worn_out:
+                self._discard(browser)
+            else:
+                with self._lock:
+                    self._idle.append(browser)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def browser(self):
+        """
+        with pool.browser() as browser: 형태로 브라우저를 빌리고 자동으로 반납.
+        블록 안에서 WebDriverException 이 발생하면 해당 브라우저는 교체.
+
+        :return: warm browser (webdriver.Chrome)
+        """
+        from selenium.common.exceptions import WebDriverException
+        browser = self.acquire()
+        try:
+            yield browser
+        except WebDriverException:
+            self.release(browser, broken=True)
+            raise
+        except BaseException:
+            self.release(browser)
+            raise
+        else:
+            self.release(browser)
+
+    def close(self):
+        """
+        쉬고 있는 모든 브라우저 종료. 빌려간 브라우저는 반납 시 종료됨.
+
+        :return: None
+        """
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._discard(browser)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def background(self):
+        return self._background
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def shared_pool(background: bool = True) -> BrowserPool:
+    """
+    pool 을 따로 지정하지 않은 ItemScouter 들이 함께 쓰는 기본 BrowserPool (background 옵션 별로 하나씩).
+    프로그램 종료 시 자동으로 close.
+
+    :param background: webdriver.ChromeOptions --headless (bool)
+    :return: shared pool (BrowserPool)
+    """
+    with _shared_pools_lock:
+        if background not in _shared_pools:
+            pool = BrowserPool(background=background)
+            atexit.register(pool.close)
+            _shared_pools[background] = pool
+        return _shared_pools[background]
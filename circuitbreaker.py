@@ -0,0 +1,211 @@
+from contextlib import contextmanager, asynccontextmanager
+import threading
+import time
+import errors
+import metrics
+
+
+# 홈페이지가 정상적으로 동작하고 있다는 뜻의 결과 (캐릭터 자체의 문제)
+HEALTHY_ERRORS = (errors.PrivateCharacterError, errors.CharacterNotFoundError)
+MODES = ('pause', 'abort')
+
+
+class CircuitBreaker:
+    """
+    batch 의 모든 worker 가 공유하는 circuit breaker.
+    점검 중이거나 html 구조가 바뀐 동안 캐릭터마다 요청과 브라우저 시간을 쓰고 실패하지 않도록 함.
+
+    - closed : 평소 상태. 모든 캐릭터를 scout
+    - open : MaintenanceError 가 발생하거나 LayoutChangedError 가 layout_threshold 번 연속 발생하면 열림.
+             mode 가 'abort' 이면 이후의 모든 캐릭터는 요청 없이 CircuitOpenError 로 실패.
+             mode 가 'pause' 이면 다른 캐릭터는 기다리고, pause 초마다 캐릭터 하나만 시험 삼아 scout (probe).
+    - probe 가 성공하면 (비공개, 존재하지 않는 캐릭터도 홈페이지는 정상이므로 성공) 다시 closed 로 돌아가 재개하고,
+      실패하면 다음 probe 까지의 간격을 두 배로 (최대 max_pause) 늘림.
+      처음 열린 후 max_wait 초가 지나도 회복되지 않으면 'abort' 와 같이 포기.
+
+    with breaker.guard(): 블록 안에서 한 캐릭터를 scout 하거나, call() 로 점검 중 실패한 캐릭터를 재개 후 다시 scout.
+    (asyncio 에서는 aguard(), acall())
+
+    :param mode: 'pause' to wait and probe, 'abort' to give up the rest of the batch (str)
+    :param layout_threshold: consecutive LayoutChangedError to open the breaker (int)
+    :param pause: seconds until the first probe (float)
+    :param max_pause: maximum seconds between probes (float)
+    :param max_wait: give up after the breaker stays open this long (seconds) (float)
+    """
+    def __init__(self, mode: str = 'pause', layout_threshold: int = 5, pause: float = 60.0, max_pause: float = 600.0,
+                 max_wait: float = 3 * 60 * 60):
+        if mode not in MODES:
+            raise ValueError(f"mode : should be one of {MODES}, but it is {mode!r}.")
+        if layout_threshold < 1:
+            raise ValueError(f"layout_threshold : should be positive, but it is {layout_threshold}.")
+        self._mode = mode
+        self._layout_threshold = layout_threshold
+        self._base_pause = pause
+        self._max_pause = max_pause
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        closed 상태로 초기화. (포기한 이후 다음 batch 에서 다시 사용할 때)
+
+        :return: None
+        """
+        with self._lock:
+            self._state = 'closed'
+            self._reason = None
+            self._layout_failures = 0
+            self._pause = self._base_pause
+            self._opened_at = None
+            self._next_probe_at = None
+            self._probing = False
+
+    def _try_admit(self) -> tuple[float, bool]:
+        """
+        :return: (0, whether admitted as a probe) if admitted, otherwise (seconds to wait, False) (tuple[float, bool])
+        """
+        with self._lock:
+            if self._state == 'closed':
+                return 0.0, False
+            now = time.monotonic()
+            if (self._state == 'aborted') or (self._mode == 'abort') or (now - self._opened_at >= self._max_wait):
+                if self._state != 'aborted':
+                    self._state = 'aborted'
+                    metrics.event('circuit_aborted', reason=self._reason)
+                raise errors.CircuitOpenError(self._reason)
+            if (not self._probing) and (now >= self._next_probe_at):
+                self._probing = True
+                return 0.0, True
+            # probe 결과를 기다리는 중이면 자주 확인
+            wait = 1.0 if self._probing else self._next_probe_at - now
+            return max(0.01, min(wait, self._opened_at + self._max_wait - now)), False
+
+    def _open(self, reason: str, probe: bool):
+        # lock 안에서 호출. 이미 열려 있을 때 probe 가 아닌 (열리기 전에 시작한) 캐릭터의 실패는 무시
+        now = time.monotonic()
+        if self._state == 'closed':
+            self._opened_at = now
+            self._pause = self._base_pause
+            metrics.count('circuit_trips')
+            metrics.event('circuit_open', reason=reason)
+        elif probe:
+            self._pause = min(self._pause * 2, self._max_pause)
+        else:
+            return
+        self._state = 'open'
+        self._reason = reason
+        self._next_probe_at = now + self._pause
+
+    def _record(self, error: BaseException | None, probe: bool):
+        """
+        한 캐릭터의 결과를 반영.
+
+        :param error: exception raised while scouting, None if succeeded (BaseException or None)
+        :param probe: whether the character was admitted as a probe (bool)
+        :return: None
+        """
+        with self._lock:
+            if probe:
+                self._probing = False
+            if (error is None) or isinstance(error, HEALTHY_ERRORS):
+                self._layout_failures = 0
+                if probe and (self._state == 'open'):
+                    self._state = 'closed'
+                    self._layout_failures = 0
+                    metrics.event('circuit_closed', reason=self._reason)
+            elif isinstance(error, errors.MaintenanceError):
+                self._open('maintenance', probe)
+            elif isinstance(error, errors.LayoutChangedError):
+                self._layout_failures += 1
+                if probe or (self._layout_failures >= self._layout_threshold):
+                    self._open('layout_changed', probe)
+            elif probe and (self._state == 'open'):
+                # 요청 실패 등으로 probe 가 판단하지 못했다면 다음 probe 를 기다림
+                self._open(self._reason, probe)
+
+    @contextmanager
+    def guard(self):
+        """
+        with breaker.guard(): 블록 안에서 한 캐릭터를 scout. 열려 있으면 probe 차례가 올 때까지 sleep 하거나
+        CircuitOpenError 를 raise 하고, 블록의 결과 (예외) 를 breaker 에 반영.
+
+        :return: None
+        """
+        while True:
+            wait, probe = self._try_admit()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        try:
+            yield
+        except BaseException as error:
+            self._record(error, probe)
+            raise
+        self._record(None, probe)
+
+    @asynccontextmanager
+    async def aguard(self):
+        """
+        guard() 의 asyncio 버전. 기다리는 동안 event loop 를 막지 않음.
+
+        :return: None
+        """
+        import asyncio
+        while True:
+            wait, probe = self._try_admit()
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+        try:
+            yield
+        except BaseException as error:
+            self._record(error, probe)
+            raise
+        self._record(None, probe)
+
+    def call(self, function, *args, **kwargs):
+        """
+        guard() 안에서 function 을 호출. 'pause' mode 에서 점검 중이라 실패하면 breaker 가 닫힐 때까지 기다린 후 다시 호출.
+
+        :param function: e.g. ItemScouter (callable)
+        :return: return value of the function
+        """
+        while True:
+            try:
+                with self.guard():
+                    return function(*args, **kwargs)
+            except errors.MaintenanceError:
+                if self._mode != 'pause':
+                    raise
+
+    async def acall(self, function, *args, **kwargs):
+        """
+        call() 의 asyncio 버전.
+
+        :param function: coroutine function, e.g. AsyncItemScouter.scout (callable)
+        :return: return value of the function
+        """
+        while True:
+            try:
+                async with self.aguard():
+                    return await function(*args, **kwargs)
+            except errors.MaintenanceError:
+                if self._mode != 'pause':
+                    raise
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def reason(self):
+        return self._reason
+
+    @property
+    def mode(self):
+        return self._mode
+
+
+if __name__ == "__main__":
+    pass
@@ -1,174 +1,196 @@
 from parsetag import ParseInfoTag
-from bs4.element import Tag
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from types import MappingProxyType
+from array import array
+import threading
+import hashlib
+import metrics
 import re
 
+if TYPE_CHECKING:
+    from bs4.element import Tag
 
-class EquipmentInformation:
+
+# stats_dict 의 항목 분류표. key 가 prefix 로 시작하면 해당 분류, 어디에도 속하지 않으면 일반 옵션.
+STATS_SECTIONS = (("잠재옵션", 'potential'),
+                  ("에디셔널 잠재옵션", 'additional'),)
+ETC_KEY = "기타"
+# 기타 항목의 각 줄에서 찾는 keyword
+STARFORCE_KEYWORD = "성까지 강화 가능"
+ETC_FLAGS = (("슈페리얼", 'superior'),
+             ("황금망치 제련 적용", 'hammer'),)
+DEFAULT_TIER = '일반'
+
+# 모든 정규식은 import 시 한 번만 compile
+TITLE_NAME_PATTERN = re.compile(r".+(?=\s\(\+\d+\))")
+TITLE_SCROLL_PATTERN = re.compile(r"\s\(\+(\d+)\)")
+MULTI_SPACE_PATTERN = re.compile(' +')
+TIER_PATTERN = re.compile(r"\((\w+).+\)")
+INTEGER_PATTERN = re.compile(r"[0-9]+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class _ReadOnlyRecord:
+    """
+    각 slot 에 한 번만 (생성 중에만) 값을 넣을 수 있는 __slots__ record.
+    ParsedItemMemo 로 여러 캐릭터가 같은 record 를 공유하므로, 한 캐릭터에서 바꾼 값이 다른 캐릭터에 퍼지지 않도록 함.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{name} : {type(self).__name__} is read-only.")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{name} : {type(self).__name__} is read-only.")
+
+
+class EquipmentInformation(_ReadOnlyRecord):
     """
     1차 parsing 된 정보를 담고 있는 ParseInfoTag 클래스를 받아
     그 많은 정보들 중 스펙 시뮬레이터에 필요할 수 있는 이하의 정보만 선택적으로 2차 parsing
 
     name, scroll, category, stats_dict, potential, additional, starforce, superior, (amazing,) hammer
 
+    stats_dict 는 한 번만 순회하면서 각 항목을 일반 옵션 / 잠재옵션 / 에디셔널 잠재옵션 / 기타 로 분류 (STATS_SECTIONS),
+    기타 항목도 한 번만 순회하면서 스타포스, 슈페리얼, 황금망치 여부를 모두 확인 (ETC_FLAGS).
+
+    ParseInfoTag (와 그 Tag 가 붙잡고 있는 page 전체) 는 생성 중에만 사용하고 저장하지 않음.
+    모든 값은 str, int, bool 과 이들의 tuple, dict 이며 __slots__ 로 저장하여,
+    파싱이 끝나면 html 과 무관한 작은 record 만 남고 process 간 전달(pickle) 도 그대로 가능.
+    생성 후에는 값을 바꿀 수 없고, dict 는 읽기 전용 view (MappingProxyType) 로만 돌려줌.
+
     :param parsed_tag: pre-parsed information of the target equipment (ParseInfoTag)
     """
+    __slots__ = ('_name', '_scroll', '_category', '_stats_dict', '_potential', '_additional',
+                 '_starforce_max', '_starforce_now', '_superior', '_amazing', '_hammer')
+
     def __init__(self, parsed_tag: ParseInfoTag):
-        self._parsed_tag = parsed_tag
-        self._name = self._set_title()
-        self._scroll = self._set_scroll()
-        self._category = self._set_category()
-        self._stats_dict = self._set_stats_dict()
-        self._potential = self._set_potential()
-        self._additional = self._set_additional_potential()
-        starforce_tuple = self._set_starforce()
-        self._starforce_max = starforce_tuple[0]
-        self._starforce_now = starforce_tuple[1]
-        self._superior = self._set_superior()
+        self._name = self._set_title(parsed_tag.title)
+        self._scroll = self._set_scroll(parsed_tag.title)
+        self._category = self._set_category(parsed_tag.category)
+        sections, etc_list = self._classify_stats(parsed_tag.stats_dict)
+        self._stats_dict = sections['basic']
+        self._potential = sections['potential']
+        self._additional = sections['additional']
+        etc = self._parse_etc(etc_list)
+        self._starforce_max = etc['starforce'][0]
+        self._starforce_now = etc['starforce'][1]
+        self._superior = etc['superior']
         self._amazing = self._set_amazing()
-        self._hammer = self._set_hammer()
+        self._hammer = etc['hammer']
 
-    def _set_title(self) -> str:
+    def _set_title(self, title: str) -> str:
         """
         ParseInfoTag.title 에서 장비 이름을 추출
 
+        :param title: ParseInfoTag.title (str)
         :return: name of the target equipment (str)
         """
         # title 에 ' (+숫자)' 가 있다면
-        if self._parsed_tag.title[-1] != ")":
-            equip_name = self._parsed_tag.title
+        if title[-1] != ")":
+            equip_name = title
         # title 이 ' (+숫자)' 로 끝난다면.
         else:
-            equip_name = re.match(r".+(?=\s\(\+\d+\))", self._parsed_tag.title).group()
+            equip_name = TITLE_NAME_PATTERN.match(title).group()
         self._type_checker(equip_name, str)
         # title 의 multi whitespace 삭제
-        equip_name = re.sub(' +', ' ', equip_name)
+        equip_name = MULTI_SPACE_PATTERN.sub(' ', equip_name)
         return equip_name
 
-    def _set_scroll(self) -> int:
+    def _set_scroll(self, title: str) -> int:
         """
         ParseInfoTag.title 에서 주문서 성공횟수를 추출
 
+        :param title: ParseInfoTag.title (str)
         :return: scroll success times (int)
         """
-        if self._parsed_tag.title[-1] != ")":
+        if title[-1] != ")":
             scroll_times = 0
         else:
             # title 에 ' (+숫자)' 가 있는지.
-            scroll_times = re.search(r"\s\(\+(\d+)\)", self._parsed_tag.title).group(1)
+            scroll_times = TITLE_SCROLL_PATTERN.search(title).group(1)
         scroll_times = int(scroll_times)
         self._type_checker(scroll_times, int)
         return scroll_times
 
-    def _set_category(self) -> str:
+    def _set_category(self, category: str) -> str:
         """
         ParseInfoTag.category 에서 장비분류를 추출
 
+        :param category: ParseInfoTag.category (str)
         :return: category of the equipment (str)
         """
-        self._type_checker(self._parsed_tag.category, str)
-        equip_category = self._parsed_tag.category
+        # Tag 의 문자열(NavigableString) 은 page 전체를 참조하므로 순수한 str 로 저장
+        equip_category = str(category)
+        self._type_checker(equip_category, str)
         return equip_category
 
-    def _set_stats_dict(self) -> dict:
-        """
-        ParseInfoTag.stats_dict 에서 잠재옵션, 에디셔널 잠재옵션, 기타 항목이 아닌
-        일반 옵션(STR, DEX, INT, LUK, MaxHP, 공격력, 마력 등) 부분을 dictionary 로 저장 (중복되지 않으므로)
-
-        :return: options of the equipment (dict[str, str])
+    @staticmethod
+    def _classify_stats(stats_dict: dict) -> tuple[dict, list[str]]:
         """
-        equip_stats_dict = {}
-        for key_str, value_tag in self._parsed_tag.stats_dict.items():
-            if (key_str[:4] == "잠재옵션") | (key_str[:9] == "에디셔널 잠재옵션") | (key_str == "기타"):
-                pass
-            else:
-                equip_stats_dict[key_str] = value_tag.text
-        return equip_stats_dict
+        ParseInfoTag.stats_dict 를 한 번 순회하면서 각 항목을 분류.
 
-    def _set_potential(self) -> tuple[str, list]:
-        """
-        ParseInfoTag.stats_dict 에서 잠재옵션 항목(등급 및 옵션)을 tuple[str, list] 로 저장 (중복 가능성 있으므로)
+        - 일반 옵션(STR, DEX, INT, LUK, MaxHP, 공격력, 마력 등) : dictionary 로 저장 (중복되지 않으므로)
+        - 잠재옵션, 에디셔널 잠재옵션 : 등급 및 옵션을 tuple[str, tuple] 로 저장 (중복 가능성 있으므로)
+        - 기타 : split 된 list 로 저장
 
-        :return: tier and 3 (or less) options of potential (tuple[str, list])
-        """
-        tier = '일반'
-        options_list = []
-        for key_str, value_tag in self._parsed_tag.stats_dict.items():
-            if key_str[:4] == "잠재옵션":
-                pattern = re.compile(r"\((\w+).+\)")
-                if pattern.search(key_str) is not None:
-                    tier = pattern.search(key_str).group(1)
-                options_list = value_tag.get_text(strip=True, separator='\n').splitlines()
-            else:
-                pass
-        return tier, options_list
+        Tag 에서 꺼낸 문자열은 모두 순수한 str 이므로 결과는 Tag 를 참조하지 않음.
 
-    def _set_additional_potential(self) -> tuple[str, list]:
-        """
-        ParseInfoTag.stats_dict 에서 에디셔널 잠재옵션 항목(등급 및 옵션)을 tuple[str, list] 로 저장 (중복 가능성 있으므로)
-
-        :return: tier and 3 (or less) options of additional potential (tuple[str, list])
-        """
-        tier = '일반'
-        options_list = []
-        for key_str, value_tag in self._parsed_tag.stats_dict.items():
-            if key_str[:9] == "에디셔널 잠재옵션":
-                pattern = re.compile(r"\((\w+).+\)")
-                if pattern.search(key_str) is not None:
-                    tier = pattern.search(key_str).group(1)
-                options_list = value_tag.get_text(strip=True, separator='\n').splitlines()
-            else:
-                pass
-        return tier, options_list
-
-    def _etc_to_list(self) -> list[str]:
-        """
-        ParseInfoTag.stats_dict 에서 기타 항목의 값을 split 된 list 로 저장
-
-        :return: contents of etc. (list[str])
+        :param stats_dict: ParseInfoTag.stats_dict (dict[str, bs4.element.Tag])
+        :return: {'basic': dict[str, str], 'potential': tuple[str, tuple], 'additional': tuple[str, tuple]}
+                 and contents of etc. (tuple[dict, list[str]])
         """
+        sections = {'basic': {}}
+        for _, section in STATS_SECTIONS:
+            sections[section] = (DEFAULT_TIER, ())
         etc_list = []
-        for key_str, value_tag in self._parsed_tag.stats_dict.items():
-            if key_str == "기타":
+        for key_str, value_tag in stats_dict.items():
+            key_str = str(key_str)
+            if key_str == ETC_KEY:
                 etc_list = value_tag.get_text(strip=True, separator='\n').splitlines()
-        return etc_list
+                continue
+            for prefix, section in STATS_SECTIONS:
+                if key_str.startswith(prefix):
+                    tier = sections[section][0]
+                    tier_match = TIER_PATTERN.search(key_str)
+                    if tier_match is not None:
+                        tier = tier_match.group(1)
+                    options = tuple(value_tag.get_text(strip=True, separator='\n').splitlines())
+                    sections[section] = (tier, options)
+                    break
+            else:
+                sections['basic'][key_str] = value_tag.get_text()
+        return sections, etc_list
 
-    def _set_starforce(self) -> tuple[int, int]:
+    @staticmethod
+    def _parse_etc(etc_list: list[str]) -> dict:
         """
-        ParseInfoTag.stats_dict 기타 항목에서 최대 스타포스 수치, 현재 스타포스 수치를 확인하고 tuple 로 저장
+        기타 항목을 한 번 순회하면서
+        최대 / 현재 스타포스 수치, 슈페리얼 아이템 여부, 황금망치 제련 적용 여부를 확인
 
-        :return: max starforce and present starforce (tuple[int, int])
+        :param etc_list: contents of etc. (list[str])
+        :return: {'starforce': (max, present), 'superior': bool, 'hammer': bool} (dict)
         """
-        etc_list = self._etc_to_list()
+        etc = {flag: False for _, flag in ETC_FLAGS}
         star_values = []
         for text in etc_list:
-            if text.__contains__("성까지 강화 가능"):
-                positive_integers_str = ''.join((ch if ch in '0123456789' else ' ') for ch in text).split()
-                for integer in positive_integers_str:
-                    star_values.append(int(integer))
-            else:
-                pass
+            if STARFORCE_KEYWORD in text:
+                star_values.extend(int(integer) for integer in INTEGER_PATTERN.findall(text))
+            for keyword, flag in ETC_FLAGS:
+                if keyword in text:
+                    etc[flag] = True
         if len(star_values) == 0:
-            star_values = (0, 0)
+            etc['starforce'] = (0, 0)
         elif len(star_values) == 1:
-            star_values = (star_values[-1], 0)
+            etc['starforce'] = (star_values[-1], 0)
         elif len(star_values) == 2:
-            star_values = (star_values[-1], star_values[0])
+            etc['starforce'] = (star_values[-1], star_values[0])
         else:
             raise ValueError("Wrong starforce parsing.")
-        return star_values
-
-    def _set_superior(self) -> bool:
-        """
-        ParseInfoTag.stats_dict 기타 항목에서 슈페리얼 아이템인지 여부를 확인하고 boolean 값으로 저장
-
-        :return: whether superior or not (bool)
-        """
-        etc_list = self._etc_to_list()
-        superior = False
-        for text in etc_list:
-            if text.__contains__("슈페리얼"):
-                superior = True
-        return superior
+        return etc
 
     def _set_amazing(self) -> bool:
         """
@@ -180,19 +202,6 @@ class EquipmentInformation:
         """
         pass
 
-    def _set_hammer(self) -> bool:
-        """
-        ParseInfoTag.stats_dict 기타 항목에서 황금망치 제련 적용 여부를 확인하고 boolean 값으로 저장.
-
-        :return: whether to use hammer or not (bool)
-        """
-        etc_list = self._etc_to_list()
-        hammer_used = False
-        for text in etc_list:
-            if text.__contains__("황금망치 제련 적용"):
-                hammer_used = True
-        return hammer_used
-
     @staticmethod
     def _type_checker(checked, type_restraint: object):
         if type(checked) != type_restraint:
@@ -212,7 +221,7 @@ class EquipmentInformation:
 
     @property
     def stats_dict(self):
-        return self._stats_dict
+        return MappingProxyType(self._stats_dict)
 
     @property
     def potential(self):
@@ -248,10 +257,13 @@ class TrimmedInformation(EquipmentInformation):
     EquipmentInformation 에서 2차 parsing 한 장비 정보를 재가공.
 
     2차 parsing 으로 충분했던 정보는 그대로 두고, 추가로 가공해야하는 정보만 재가공함.
+    EquipmentInformation 과 같이 __slots__ record 이며, 장비 정보 Tag 는 저장하지 않음.
 
-    :param equipment_info_tag: 2nd parsed information of the target equipment (EquipmentInformation)
+    :param equipment_info_tag: Tag of information about the target equipment (bs4.element.Tag)
     """
-    def __init__(self, equipment_info_tag: Tag):
+    __slots__ = ('_stat_options', '_potential_tier', '_potential_options', '_additional_tier', '_additional_options')
+
+    def __init__(self, equipment_info_tag: "Tag"):
         parsed_tag = ParseInfoTag(equipment_info_tag)
         super(TrimmedInformation, self).__init__(parsed_tag)
         self._stat_options = self._trim_stats_dict()
@@ -275,14 +287,14 @@ class TrimmedInformation(EquipmentInformation):
         return trimmed
 
     @staticmethod
-    def _trim_potential(super_pot_add: tuple[str, list]) -> dict:
+    def _trim_potential(super_pot_add: tuple[str, tuple]) -> dict:
         """
         장비의 잠재능력 또는 에디셔널 잠재능력의 option 에 대한 정보를 전달받아 재가공.
 
         잠재능력 또는 에디셔널 잠재능력은 중복가능성이 있어 dictionary 로 저장하지 못했던 것을,
         중복된 내용은 하나의 key 에 string 이어 붙이기(+로 구분됨) 하여 dictionary 로 저장.
 
-        :param super_pot_add: potential tuple or additional potential tuple of parent class (tuple[str, list])
+        :param super_pot_add: potential tuple or additional potential tuple of parent class (tuple[str, tuple])
         :return: trimmed option information about potential or additional potential (dict[str, str])
         """
         trimmed = {}
@@ -318,7 +330,7 @@ class TrimmedInformation(EquipmentInformation):
 
     @property
     def stat_options(self):
-        return self._stat_options
+        return MappingProxyType(self._stat_options)
 
     @property
     def potential_tier(self):
@@ -326,7 +338,7 @@ class TrimmedInformation(EquipmentInformation):
 
     @property
     def potential_options(self):
-        return self._potential_options
+        return MappingProxyType(self._potential_options)
 
     @property
     def additional_tier(self):
@@ -334,43 +346,122 @@ class TrimmedInformation(EquipmentInformation):
 
     @property
     def additional_options(self):
-        return self._additional_options
+        return MappingProxyType(self._additional_options)
 
     def print_all_attribute(self):
-        for attr, value in self.__dict__.items():
-            print(f"{attr:>19} :", value)
+        # __slots__ record 이므로 __dict__ 대신 상위 클래스부터 차례로 slot 을 출력
+        for cls in reversed(type(self).__mro__):
+            for attr in getattr(cls, '__slots__', ()):
+                print(f"{attr:>19} :", getattr(self, attr))
+
+
+# SummaryInformation 이 요약하는 stat 과, 장비 정보에서 그 stat 을 부르는 이름(alias) 들.
+# StatVector 의 배치 순서이자 PandasScouter 의 column 순서.
+STAT_ALIASES = (('str', ('STR',)),
+                ('dex', ('DEX',)),
+                ('int', ('INT',)),
+                ('luk', ('LUK',)),
+                ('maxhp', ('MaxHP', '최대 HP')),
+                ('allstat', ('올스탯',)),
+                ('attack', ('공격력',)),
+                ('magic_attack', ('마력',)),
+                ('critical_damage', ('크리티컬 데미지',)),
+                ('boss_damage', ('보스 몬스터공격 시 데미지', '보스 몬스터 공격 시 데미지')),
+                ('damage', ('데미지',)),
+                ('ignore_def', ('몬스터 방어율 무시', '몬스터 방어력 무시')),
+                ('critical_rate', ('크리티컬 확률',)),)
+STAT_NAMES = tuple(name for name, _ in STAT_ALIASES)
+STAT_INDEX = {alias: index for index, (_, aliases) in enumerate(STAT_ALIASES) for alias in aliases}
+
+
+class StatVector:
+    """
+    STAT_ALIASES 순서대로 stat 별 (고정 상승치, % 상승치) 를 담는 고정 길이 정수 배열.
+
+    [str 고정, str %, dex 고정, dex %, ...] 순으로 array('l') 하나에 저장하며,
+    벡터끼리 더할 수 있어 여러 장비, 여러 캐릭터의 합계도 문자열 변환 없이 계산.
+
+    :param values: flat values in STAT_ALIASES order (Iterable[int] or None)
+    """
+    __slots__ = ('_values',)
+
+    def __init__(self, values=None):
+        if values is None:
+            self._values = array('l', bytes(array('l').itemsize * 2 * len(STAT_NAMES)))
+        else:
+            self._values = array('l', values)
+            if len(self._values) != 2 * len(STAT_NAMES):
+                raise ValueError(f"values : should have {2 * len(STAT_NAMES)} items, but it has {len(self._values)}.")
 
+    def add_option(self, index: int, option: str):
+        """
+        '+45', '+12%+9%' 와 같은 option 수치를 + 기준으로 split 한 후,
+        고정값 상승치와 %값 상승치를 구분하여 index 번째 stat 에 더함.
+
+        :param index: index of the stat in STAT_ALIASES (int)
+        :param option: option value string ('+45+12%+9%+9%') (str)
+        :return: None
+        """
+        for split in option.split('+'):
+            if split == '':
+                pass
+            elif split[-1] == '%':
+                self._values[2 * index + 1] += int(split[:-1])
+            else:
+                self._values[2 * index] += int(split)
+
+    def __getitem__(self, name: str) -> tuple[int, int]:
+        index = STAT_NAMES.index(name)
+        return self._values[2 * index], self._values[2 * index + 1]
+
+    def __add__(self, other: "StatVector") -> "StatVector":
+        return StatVector(a + b for a, b in zip(self._values, other._values))
+
+    def __iadd__(self, other: "StatVector") -> "StatVector":
+        for i, value in enumerate(other._values):
+            self._values[i] += value
+        return self
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StatVector) and (self._values == other._values)
+
+    def __repr__(self):
+        return f"StatVector({dict(self.items())})"
+
+    def items(self):
+        """
+        :return: (stat name, (fixed, percent)) in STAT_ALIASES order (Iterator[tuple[str, tuple[int, int]]])
+        """
+        for index, name in enumerate(STAT_NAMES):
+            yield name, (self._values[2 * index], self._values[2 * index + 1])
+
+    @property
+    def values(self):
+        return self._values
+
+
+class SummaryInformation(_ReadOnlyRecord):
+    __slots__ = ('_equipment_information', '_name', '_category', '_stats')
 
-class SummaryInformation:
     def __init__(self, equipment_information: TrimmedInformation):
         """
         장비 정보의 최종 가공(요약).
         스펙 시뮬레이터에 필수적인 정보만 저장.
 
         option, potential, additional potential 을 구분하지 않고,
-        STR, DEX, INT, LUK, ... 등 stat 별로 option 수치를 저장.
+        STR, DEX, INT, LUK, ... 등 stat 별로 option 수치를 StatVector 에 저장.
 
-        이때 고정값 상승치과 % 상승치를 구분하여 tuple 로 저장.
-        tuple 의 첫번째 값이 고정상승치, 두번째 값이 % 상승치.
+        이때 고정값 상승치과 % 상승치를 구분하여 저장.
+        stat(name) 으로 얻는 tuple 의 첫번째 값이 고정상승치, 두번째 값이 % 상승치.
+
+        EquipmentInformation 과 같이 읽기 전용이며, stats 는 더하더라도 원본이 바뀌지 않도록 복사본을 돌려줌.
 
         :param equipment_information: 3rd parsed information of the target equipment (TrimmedInformation)
         """
         self._equipment_information = equipment_information
         self._name = self._set_name()
         self._category = self._set_category()
-        self._str = self._set_str()
-        self._dex = self._set_dex()
-        self._int = self._set_int()
-        self._luk = self._set_luk()
-        self._maxhp = self._set_maxhp()
-        self._allstat = self._set_allstat()
-        self._attack = self._set_attack_power()
-        self._magic_attack = self._set_magic_attack()
-        self._critical_damage = self._set_critical_damage()
-        self._boss_damage = self._set_boss_damage()
-        self._damage = self._set_damage()
-        self._ignore_def = self._set_ignore_def()
-        self._critical_rate = self._set_critical_rate()
+        self._stats = self._set_stats()
 
     def _set_name(self):
         return self._equipment_information.name
@@ -378,112 +469,146 @@ class SummaryInformation:
     def _set_category(self):
         return self._equipment_information.category
 
-    def _search_and_append_stats(self, stat_keyword: str) -> str:
+    def _set_stats(self) -> StatVector:
         """
-        특정 stat (예: STR, DEX, 보공, 크뎀 등) 의 상승수치가 저장되어 있을 dictionary 에서 그 상승수치를 검색한 다음,
-        모든 상승수치(str) 을 addition 한 string 을 반환
-
-        (반환 값 예시 : '+45+12%+9%+9%')
+        option, potential, additional potential 의 각 항목을 STAT_INDEX 로 찾아 해당 stat 에 바로 더함.
 
-        :param stat_keyword: search keyword (str)
-        :return: added string about options of 'search keyword' (str)
+        :return: (+fixed option, +% option) of every stat (StatVector)
         """
-        try:
-            basic = self._equipment_information.stat_options[stat_keyword]
-        except KeyError:
-            basic = ""
-        try:
-            potential = self._equipment_information.potential_options[stat_keyword]
-        except KeyError:
-            potential = ""
-        try:
-            additional = self._equipment_information.additional_options[stat_keyword]
-        except KeyError:
-            additional = ""
-        return basic + potential + additional
+        stats = StatVector()
+        information = self._equipment_information
+        for options in (information.stat_options, information.potential_options, information.additional_options):
+            for key, value in options.items():
+                index = STAT_INDEX.get(key)
+                if index is not None:
+                    stats.add_option(index, value)
+        return stats
 
-    @staticmethod
-    def _summate_stat(string: str) -> tuple[int, int]:
+    def stat(self, name: str) -> tuple[int, int]:
         """
-        '+45+12%+9%+9%' 와 같이 저장된 string 에서 + 기준으로 split 한 후,
-        고정값 상승치와 %값 상승치를 구분하여 tuple 로 저장.
-
-        :param string: added string of stat options ('+45+12%+9%+9%') (str)
+        :param name: one of STAT_NAMES ('str', 'maxhp', 'boss_damage', ...) (str)
         :return: (+fixed option, +% option) (tuple[int, int])
         """
-        fixed, percent = 0, 0
-        split_list = string.split('+')
-        for split in split_list:
-            if split == '':
-                pass
-            elif split[-1] == '%':
-                percent += int(split[:-1])
-            else:
-                fixed += int(split)
-        return fixed, percent
-
-    def _set_str(self):
-        aggregated = self._search_and_append_stats('STR')
-        return self._summate_stat(aggregated)
-
-    def _set_dex(self):
-        aggregated = self._search_and_append_stats('DEX')
-        return self._summate_stat(aggregated)
-
-    def _set_int(self):
-        aggregated = self._search_and_append_stats('INT')
-        return self._summate_stat(aggregated)
-
-    def _set_luk(self):
-        aggregated = self._search_and_append_stats('LUK')
-        return self._summate_stat(aggregated)
-
-    def _set_maxhp(self):
-        # alias 확인 완료
-        agg1 = self._search_and_append_stats('MaxHP')
-        agg2 = self._search_and_append_stats('최대 HP')
-        aggregated = agg1 + agg2
-        return self._summate_stat(aggregated)
-
-    def _set_allstat(self):
-        aggregated = self._search_and_append_stats('올스탯')
-        return self._summate_stat(aggregated)
-
-    def _set_attack_power(self):
-        aggregated = self._search_and_append_stats('공격력')
-        return self._summate_stat(aggregated)
-
-    def _set_magic_attack(self):
-        aggregated = self._search_and_append_stats('마력')
-        return self._summate_stat(aggregated)
-
-    def _set_critical_damage(self):
-        aggregated = self._search_and_append_stats('크리티컬 데미지')
-        return self._summate_stat(aggregated)
-
-    def _set_boss_damage(self):
-        agg1 = self._search_and_append_stats('보스 몬스터공격 시 데미지')
-        agg2 = self._search_and_append_stats('보스 몬스터 공격 시 데미지')
-        aggregated = agg1 + agg2
-        return self._summate_stat(aggregated)
-
-    def _set_damage(self):
-        aggregated = self._search_and_append_stats('데미지')
-        return self._summate_stat(aggregated)
-
-    def _set_ignore_def(self):
-        agg1 = self._search_and_append_stats('몬스터 방어율 무시')
-        agg2 = self._search_and_append_stats('몬스터 방어력 무시')
-        aggregated = agg1 + agg2
-        return self._summate_stat(aggregated)
-
-    def _set_critical_rate(self):
-        aggregated = self._search_and_append_stats('크리티컬 확률')
-        return self._summate_stat(aggregated)
+        return self._stats[name]
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def category(self):
+        return self._category
+
+    @property
+    def stats(self):
+        return StatVector(self._stats.values)
 
     def print_all_attribute(self):
-        for attr, value in self.__dict__.items():
-            print(f"{attr:>16} :", value)
+        print(f"{'_equipment_information':>16} :", self._equipment_information)
+        print(f"{'_name':>16} :", self._name)
+        print(f"{'_category':>16} :", self._category)
+        for name, value in self._stats.items():
+            print(f"{'_' + name:>16} :", value)
+
+
+class ParsedItemMemo:
+    """
+    장비 정보 Tag 의 html 이 같으면 이미 만든 (TrimmedInformation, SummaryInformation) 을 재사용하는 LRU memo.
+
+    보스 장신구 세트, 엠블렘 등 여러 캐릭터가 똑같은 아이템을 착용하는 경우가 많으므로,
+    공백을 정규화한 html 의 hash 를 key 로 하여 파싱 결과를 최대 maxsize 개까지 보관.
+    같은 record 를 여러 캐릭터가 공유하지만, record 는 읽기 전용이므로 한 캐릭터에서 값을 바꿀 수 없음.
+    stats() 의 hit rate 로 batch 규모에 맞게 maxsize 를 조정할 수 있음.
+
+    :param maxsize: maximum number of memoized items, 0 to disable (int)
+    """
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _key(equipment_info_tag: "Tag") -> bytes:
+        normalized = WHITESPACE_PATTERN.sub(' ', str(equipment_info_tag)).strip()
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _parse(equipment_info_tag: "Tag") -> tuple[TrimmedInformation, "SummaryInformation"]:
+        # 파싱 단계와 요약 단계의 소요 시간을 각각 기록. 파싱 중 예외는 parse_errors 로 셈
+        try:
+            with metrics.timer('parsing'):
+                trimmed = TrimmedInformation(equipment_info_tag)
+        except Exception:
+            metrics.count('parse_errors')
+            raise
+        with metrics.timer('summarization'):
+            summary = SummaryInformation(trimmed)
+        return trimmed, summary
+
+    def parse(self, equipment_info_tag: "Tag") -> tuple[TrimmedInformation, "SummaryInformation"]:
+        """
+        memo 에 있으면 재사용하고, 없으면 파싱하여 memo 에 추가.
+
+        :param equipment_info_tag: Tag of information about the target equipment (bs4.element.Tag)
+        :return: trimmed and summarized information (tuple[TrimmedInformation, SummaryInformation])
+        """
+        if self._maxsize <= 0:
+            return self._parse(equipment_info_tag)
+        key = self._key(equipment_info_tag)
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self._hits += 1
+                hit = self._items[key]
+            else:
+                hit = None
+                self._misses += 1
+        if hit is not None:
+            metrics.count('memo_hits')
+            return hit
+        parsed = self._parse(equipment_info_tag)
+        with self._lock:
+            self._items[key] = parsed
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+                self._evictions += 1
+        return parsed
+
+    def stats(self) -> dict:
+        """
+        :return: hits, misses, evictions, size, maxsize and hit_rate (dict)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                    'size': len(self._items), 'maxsize': self._maxsize,
+                    'hit_rate': self._hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+_item_memo = ParsedItemMemo()
+
+
+def configure_item_memo(maxsize: int = 1024):
+    """
+    ItemScouter 가 공유하는 memo 의 크기 변경. 기존 memo 내용과 통계는 초기화됨.
+
+    :param maxsize: maximum number of memoized items, 0 to disable (int)
+    :return: None
+    """
+    global _item_memo
+    _item_memo = ParsedItemMemo(maxsize)
+
+
+def get_item_memo() -> ParsedItemMemo:
+    return _item_memo
 
 
 if __name__ == "__main__":
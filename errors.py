@@ -0,0 +1,48 @@
+class ScoutError(RuntimeError):
+    """
+    캐릭터를 scout 할 수 없는 이유를 구분하기 위한 예외의 base class.
+
+    기존과 같이 RuntimeError 의 subclass 이므로 except RuntimeError 로도 처리할 수 있음.
+    """
+
+
+class MaintenanceError(ScoutError):
+    """
+    메이플스토리 홈페이지가 점검 중. 잠시 후 다시 시도해야 하며, 같은 시각의 다른 캐릭터도 모두 실패함.
+    """
+
+
+class PrivateCharacterError(ScoutError):
+    """
+    캐릭터의 정보가 공개되어 있지 않음.
+    """
+
+
+class CharacterNotFoundError(ScoutError):
+    """
+    랭킹 검색 결과에 캐릭터가 없음. (존재하지 않거나 랭킹에 노출되지 않는 캐릭터, 또는 잘못된 닉네임)
+    """
+
+
+class LayoutChangedError(ScoutError):
+    """
+    page 에서 찾아야 하는 부분(url, 장비 정보 등) 을 찾지 못함. 홈페이지의 html 구조가 바뀐 경우.
+    """
+
+
+class CircuitOpenError(ScoutError):
+    """
+    circuitbreaker.CircuitBreaker 가 열려 있어 (점검 중, html 변경) 요청하지 않고 포기함.
+
+    :param reason: why the breaker opened, 'maintenance' or 'layout_changed' (str)
+    """
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+    def __str__(self):
+        return f"circuit open : {self.reason}"
+
+
+if __name__ == "__main__":
+    pass
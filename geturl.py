@@ -1,43 +1,95 @@
-import requests
-from bs4 import BeautifulSoup
+import htmlparser
+import parsetag
+import errors
+import httpclient
+import urlcache
+import rawcache
 import re
 
 
+def url_cache() -> urlcache.UrlCache | None:
+    """
+    url 을 찾을 때 사용할 urlcache. rawcache 가 replay 모드이면 None.
+    (replay 는 기록된 응답만으로 url 을 다시 찾아야 하고, 기록된 url 로 실제 cache 를 덮어쓰지 않아야 함)
+
+    :return: shared url cache, or None if disabled or replaying (urlcache.UrlCache or None)
+    """
+    if rawcache.get_mode() == 'replay':
+        return None
+    return urlcache.get_cache()
+
+
 class GetCharacterDetailUrl:
     MAIN_URL = "https://maplestory.nexon.com"
     HOME_URL = MAIN_URL + "/Home/Main"
     RANKING_URL = MAIN_URL + "/Ranking/World/Total"
 
-    def __init__(self, nickname: str):
+    def __init__(self, nickname: str, use_cache: bool = True):
         """
         해당 nickname 의 캐릭터 정보 page 의 url 을 get.
 
         각 캐릭터의 정보 page url 에 뚜렷한 규칙이 보이지 않고, 심지어 주기적으로 변경되는 듯 함.
         따라서 매번 랭킹 검색하여 알아냄.
 
-        너무 자주 실행하는 경우 서버에서 막아버리는 듯.
+        너무 자주 실행하는 경우 서버에서 막아버리는 듯. 따라서 모든 요청은 httpclient (ratelimit) 를 거쳐서 보냄.
+
+        한 번 찾은 url 은 urlcache 에 저장해두고 ttl 동안 재사용. (rawcache 의 replay 모드에서는 사용하지 않음)
+        랭킹 검색 결과에 함께 나온 다른 캐릭터들의 url 도 모두 저장.
 
         단독으로 사용되지는 않고, 아래 GetDetailEquipmentUrl 에서 내부적으로 선언하는 방식으로만 사용됨.
 
         :param nickname: want to search (str)
+        :param use_cache: whether to look up urlcache first or not (bool)
         """
         self.nickname = nickname
-        url = GetCharacterDetailUrl.RANKING_URL + "?c=" + nickname + "&w=0"
-        response = requests.get(url)
-        self._soup = BeautifulSoup(response.text, 'html.parser')
-        self._detail_url = self._find_detail_url()
-
-    def _find_detail_url(self) -> str:
-        result_set = self._soup.select("#container div.rank_table_wrap > table.rank_table "
-                                       "> tbody > tr > td.left > dl > dt > a")
-        url_suffix = ""
+        cache = url_cache()
+        cached_url = cache.get_detail_url(nickname) if (cache is not None) and use_cache else None
+        self._from_cache = cached_url is not None
+        if self._from_cache:
+            self._detail_url = cached_url
+            return
+        response = httpclient.get(self.ranking_search_url(nickname))
+        self._soup = htmlparser.parse(response.text)
+        ranking_urls = self._find_ranking_urls(self._soup)
+        if cache is not None:
+            cache.put_detail_urls(ranking_urls)
+        self._detail_url = self._find_detail_url(nickname, ranking_urls)
+
+    @staticmethod
+    def ranking_search_url(nickname: str) -> str:
+        return GetCharacterDetailUrl.RANKING_URL + "?c=" + nickname + "&w=0"
+
+    @staticmethod
+    def _find_ranking_urls(soup) -> dict[str, str]:
+        """
+        랭킹 검색 결과의 모든 row 에서 (nickname, 캐릭터 정보 page url) 추출
+        점검 중이면 MaintenanceError, 랭킹 table 자체가 없으면 (html 변경) LayoutChangedError 를 raise 하여
+        존재하지 않는 캐릭터 (CharacterNotFoundError) 와 구분.
+
+        :param soup: parsed ranking page (bs4.BeautifulSoup or htmlparser.SelectolaxNode)
+        :return: detail url of each nickname in the ranking table (dict[str, str])
+        """
+        parsetag.check_maintenance(soup)
+        rank_table = soup.select_one("#container div.rank_table_wrap > table.rank_table")
+        if rank_table is None:
+            raise errors.LayoutChangedError("Cannot find the ranking table. Changed html.")
+        # 찾아둔 table 안에서만 row 를 검색 (page 전체를 다시 탐색하지 않도록)
+        result_set = rank_table.select("tbody > tr > td.left > dl > dt > a")
+        ranking_urls = {}
         for tag in result_set:
-            if tag.get_text() == self.nickname:
-                url_suffix = tag['href']
-                break
-        if url_suffix == "":
-            raise RuntimeError("랭킹 검색 결과 존재하지 않음. 닉네임을 확인하세요.")
-        return GetCharacterDetailUrl.MAIN_URL + url_suffix
+            if tag.get('href', '') != '':
+                ranking_urls[tag.get_text()] = GetCharacterDetailUrl.MAIN_URL + tag['href']
+        return ranking_urls
+
+    @staticmethod
+    def _find_detail_url(nickname: str, ranking_urls: dict[str, str]) -> str:
+        if nickname not in ranking_urls:
+            raise errors.CharacterNotFoundError("랭킹 검색 결과 존재하지 않음. 닉네임을 확인하세요.")
+        return ranking_urls[nickname]
+
+    @property
+    def from_cache(self):
+        return self._from_cache
 
     @property
     def detail_url(self):
@@ -49,31 +101,135 @@ class GetDetailEquipmentUrl:
     HOME_URL = MAIN_URL + "/Home/Main"
     RANKING_URL = MAIN_URL + "/Ranking/World/Total"
 
-    def __init__(self, nickname: str):
+    def __init__(self, nickname: str, use_cache: bool = True):
         """
         해당 nickname 의 장비 정보 page 의 url 을 get.
 
+        urlcache 에 유효한 url 이 있으면 요청 없이 바로 사용.
+        cache 에서 가져온 캐릭터 정보 page url 이 에러를 돌려주면 cache 를 지우고 랭킹 검색부터 다시 수행.
+
         :param nickname: want to search (str)
+        :param use_cache: whether to look up urlcache first or not (bool)
         """
         self.nickname = nickname
-        detail_url = GetCharacterDetailUrl(nickname).detail_url
-        response = requests.get(detail_url)
-        self._soup = BeautifulSoup(response.text, 'html.parser')
-        self._equipment_url = self._find_equipment_url()
-
-    def _find_equipment_url(self) -> str:
-        target_tag = self._soup.find("a", string=re.compile(r"장비"))
-        url_suffix = target_tag['href']
+        cache = url_cache()
+        cached_url = cache.get_equipment_url(nickname) if (cache is not None) and use_cache else None
+        self._from_cache = cached_url is not None
+        if self._from_cache:
+            self._equipment_url = cached_url
+            return
+        character = GetCharacterDetailUrl(nickname, use_cache)
+        response = self._request(character.detail_url)
+        if character.from_cache and (response.status_code >= 400):
+            cache.invalidate(nickname)
+            character = GetCharacterDetailUrl(nickname, use_cache=False)
+            response = self._request(character.detail_url)
+        response.raise_for_status()
+        self._soup = htmlparser.parse(response.text)
+        self._equipment_url = self._find_equipment_url(self._soup)
+        if cache is not None:
+            cache.put_equipment_url(nickname, self._equipment_url)
+
+    @staticmethod
+    def _request(detail_url: str):
+        return httpclient.get(detail_url)
+
+    @staticmethod
+    def _find_equipment_url(soup) -> str:
+        """
+        캐릭터 정보 page 에서 장비 탭의 url 추출
+
+        :param soup: parsed character detail page (bs4.BeautifulSoup or htmlparser.SelectolaxNode)
+        :return: url of equipment detail page (str)
+        """
+        parsetag.check_maintenance(soup)
+        # soup.find("a", string=re.compile("장비")) 와 같이, 내용이 문자열 하나인 a tag 만 비교
+        # (메뉴의 '가이드 <em>장비 강화</em>' 같이 여러 조각으로 된 링크는 제외)
+        pattern = re.compile(r"장비")
+        target_tag = None
+        for tag in soup.select("a"):
+            if (tag.string is not None) and (pattern.search(tag.string) is not None):
+                target_tag = tag
+                break
+        if target_tag is None:
+            raise errors.LayoutChangedError("Cannot find the Equipment/.../Equipment url suffix. Changed html.")
+        url_suffix = target_tag.get('href', '')
         # url suffix 를 제대로 찾았는지 유효성 검사
         pattern = re.compile(r"/Common/Character/Detail/.+/Equipment\?p.+")
         if pattern.match(url_suffix) is None:
-            raise RuntimeError("Cannot find the Equipment/.../Equipment url suffix. Changed html.")
+            raise errors.LayoutChangedError("Cannot find the Equipment/.../Equipment url suffix. Changed html.")
         return GetDetailEquipmentUrl.MAIN_URL + url_suffix
 
     @property
     def equipment_url(self):
         return self._equipment_url
 
+    @property
+    def from_cache(self):
+        return self._from_cache
+
+
+async def resolve_detail_url(client: httpclient.AsyncHttpClient, nickname: str, use_cache: bool = True)\
+        -> tuple[str, bool]:
+    """
+    GetCharacterDetailUrl 의 asyncio 버전. (AsyncItemScouter 에서 사용)
+    urlcache (sqlite) 조회와 html 파싱은 event loop 를 막지 않도록 thread 에서 실행.
+
+    :param client: async http client (httpclient.AsyncHttpClient)
+    :param nickname: want to search (str)
+    :param use_cache: whether to look up urlcache first or not (bool)
+    :return: detail url and whether it is from urlcache or not (tuple[str, bool])
+    """
+    import asyncio
+    cache = url_cache()
+    if (cache is not None) and use_cache:
+        cached_url = await asyncio.to_thread(cache.get_detail_url, nickname)
+        if cached_url is not None:
+            return cached_url, True
+    response = await client.get(GetCharacterDetailUrl.ranking_search_url(nickname))
+    ranking_urls = await asyncio.to_thread(_parse_ranking_urls, response.text)
+    if cache is not None:
+        await asyncio.to_thread(cache.put_detail_urls, ranking_urls)
+    return GetCharacterDetailUrl._find_detail_url(nickname, ranking_urls), False
+
+
+async def resolve_equipment_url(client: httpclient.AsyncHttpClient, nickname: str, use_cache: bool = True)\
+        -> tuple[str, bool]:
+    """
+    GetDetailEquipmentUrl 의 asyncio 버전. (AsyncItemScouter 에서 사용)
+    resolve_detail_url() 과 같이 urlcache 조회와 html 파싱은 thread 에서 실행.
+
+    :param client: async http client (httpclient.AsyncHttpClient)
+    :param nickname: want to search (str)
+    :param use_cache: whether to look up urlcache first or not (bool)
+    :return: equipment url and whether it is from urlcache or not (tuple[str, bool])
+    """
+    import asyncio
+    cache = url_cache()
+    if (cache is not None) and use_cache:
+        cached_url = await asyncio.to_thread(cache.get_equipment_url, nickname)
+        if cached_url is not None:
+            return cached_url, True
+    detail_url, from_cache = await resolve_detail_url(client, nickname, use_cache)
+    response = await client.get(detail_url)
+    if from_cache and (response.status_code >= 400):
+        await asyncio.to_thread(cache.invalidate, nickname)
+        detail_url, _ = await resolve_detail_url(client, nickname, use_cache=False)
+        response = await client.get(detail_url)
+    response.raise_for_status()
+    equipment_url = await asyncio.to_thread(_parse_equipment_url, response.text)
+    if cache is not None:
+        await asyncio.to_thread(cache.put_equipment_url, nickname, equipment_url)
+    return equipment_url, False
+
+
+def _parse_ranking_urls(html: str) -> dict[str, str]:
+    return GetCharacterDetailUrl._find_ranking_urls(htmlparser.parse(html))
+
+
+def _parse_equipment_url(html: str) -> str:
+    return GetDetailEquipmentUrl._find_equipment_url(htmlparser.parse(html))
+
 
 if __name__ == "__main__":
     # print(GetCharacterDetailUrl("히슈와").detail_url)
@@ -0,0 +1,129 @@
+import threading
+
+
+# BeautifulSoup 으로 파싱하는 backend 와 그 features 인자
+BS4_BACKENDS = {'html.parser': 'html.parser', 'lxml': 'lxml', 'html5lib': 'html5lib'}
+# bs4 Tag 와 같은 interface 로 감싸서 사용하는 backend
+SELECTOLAX_BACKENDS = ('selectolax',)
+BACKENDS = tuple(BS4_BACKENDS) + SELECTOLAX_BACKENDS
+# 설치된 package 에 따라 파싱 결과가 달라지지 않도록, 다른 backend 는 configure 로 명시했을 때만 사용
+DEFAULT_BACKEND = 'html.parser'
+
+
+class SelectolaxNode:
+    """
+    selectolax (lexbor) 의 node 를 이 프로젝트에서 사용하는 bs4.element.Tag 의 interface 로 감쌈.
+
+    select_one, select, text, string, get_text(separator, strip), tag['attr'], tag.get('attr'), str(tag) 만 지원.
+    get_text 는 bs4 와 같이 script / style 내용과 주석은 제외하고, strip=True 이면 빈 문자열은 버림.
+    string 은 bs4 와 같이 자식이 text 하나이면 그 text, 자식이 tag 하나이면 그 tag 의 string, 아니면 None.
+
+    :param node: selectolax node or parser (selectolax.lexbor.LexborNode or LexborHTMLParser)
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select_one(self, selector: str):
+        node = self._node.css_first(selector)
+        return None if node is None else SelectolaxNode(node)
+
+    def select(self, selector: str) -> list:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def _strings(self):
+        root = self._node.root if hasattr(self._node, 'root') else self._node
+        if root is None:
+            return
+        for node in root.traverse(include_text=True):
+            if node.tag != '-text':
+                continue
+            if (node.parent is not None) and (node.parent.tag in ('script', 'style')):
+                continue
+            yield node.text_content
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        strings = self._strings()
+        if strip:
+            strings = (string.strip() for string in strings)
+            strings = (string for string in strings if string)
+        return separator.join(strings)
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    @property
+    def string(self):
+        node = self._node.root if hasattr(self._node, 'root') else self._node
+        while node is not None:
+            children = list(node.iter(include_text=True))
+            if len(children) != 1:
+                return None
+            node = children[0]
+            if node.tag == '-text':
+                return node.text_content
+        return None
+
+    def get(self, attr: str, default=None):
+        attributes = self._node.attributes
+        if attr not in attributes:
+            return default
+        # 값 없는 attribute (예: <a href>) 는 bs4 와 같이 빈 문자열로
+        return '' if attributes[attr] is None else attributes[attr]
+
+    def __getitem__(self, attr: str):
+        value = self._node.attributes[attr]
+        return '' if value is None else value
+
+    def __str__(self):
+        return self._node.html
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def configure(backend: str | None = None):
+    """
+    모든 html 파싱(geturl, parsetag, scouter) 에 사용할 backend 설정.
+
+    :param backend: one of BACKENDS, or None for DEFAULT_BACKEND (str or None)
+    :return: None
+    """
+    global _backend
+    if (backend is not None) and (backend not in BACKENDS):
+        raise ValueError(f"backend : should be one of {BACKENDS}, but it is {backend!r}.")
+    with _backend_lock:
+        _backend = backend
+
+
+def get_backend() -> str:
+    """
+    :return: name of the current backend (str)
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = DEFAULT_BACKEND
+        return _backend
+
+
+def parse(markup: str | bytes, backend: str | None = None):
+    """
+    html 을 파싱하여 bs4.element.Tag (또는 같은 interface 의 SelectolaxNode) 로 반환.
+
+    :param markup: html to parse (str or bytes)
+    :param backend: one of BACKENDS, or None for the configured backend (str or None)
+    :return: parsed document (bs4.BeautifulSoup or SelectolaxNode)
+    """
+    if backend is None:
+        backend = get_backend()
+    if backend in BS4_BACKENDS:
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(markup, BS4_BACKENDS[backend])
+    if backend in SELECTOLAX_BACKENDS:
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(markup))
+    raise ValueError(f"backend : should be one of {BACKENDS}, but it is {backend!r}.")
@@ -0,0 +1,278 @@
+from typing import TYPE_CHECKING
+import threading
+import time
+import ratelimit
+import rawcache
+import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+
+class HttpClient:
+    """
+    geturl, parsetag, scouter 의 모든 HTTP 요청이 공유하는 client.
+
+    하나의 requests.Session 으로 keep-alive connection 을 재사용하여
+    요청마다 TCP / TLS 연결을 새로 맺지 않도록 함.
+    모든 요청은 ratelimit 을 거치며, timeout 과 재시도 정책, 압축 전송(gzip) 이 기본으로 적용됨.
+    요청 수, 받은 bytes, 재시도 수, 요청 실패 수는 metrics 의 counter 에 기록.
+
+    재시도는 urllib3 가 아니라 이 client 가 하며, 시도할 때마다 ratelimit 의 token 과 자리를 새로 얻음.
+    (backoff 로 기다리는 동안에는 자리를 차지하지 않고, 503 등으로 줄어든 속도가 재시도에도 적용됨)
+    429, 403 등 차단 응답은 재시도하지 않고 ratelimit 이 속도를 줄이도록 넘김.
+    200 으로 응답하더라도 본문이 차단/에러 page (ratelimit.is_block_page) 이면 똑같이 속도를 줄임.
+
+    rawcache 가 record 모드이면 모든 응답을 저장하고, replay 모드이면 요청하지 않고 저장된 응답을 돌려줌.
+    requests 는 client 를 처음 만들 때 import.
+
+    :param pool_maxsize: maximum number of keep-alive connections per host (int)
+    :param timeout: (connect timeout, read timeout) in seconds (tuple[float, float])
+    :param retries: maximum number of retries on connection errors and 5xx responses (int)
+    :param backoff_factor: exponential backoff factor between retries (float)
+    """
+    DEFAULT_HEADERS = {'Accept-Encoding': 'gzip, deflate'}
+    RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+    def __init__(self, pool_maxsize: int = 16, timeout: tuple[float, float] = (5.0, 15.0), retries: int = 2,
+                 backoff_factor: float = 0.5):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        # urllib3 는 재시도하지 않음 (재시도가 limiter 를 거치도록 get() 에서 재시도)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self._session = requests.Session()
+        self._session.headers.update(HttpClient.DEFAULT_HEADERS)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        """
+        ratelimit 을 거쳐 GET 요청. requests.get 과 같은 keyword arguments 를 받음.
+
+        :param url: requested url (str)
+        :return: response (requests.Response)
+        """
+        import requests
+        mode = rawcache.get_mode()
+        if mode == 'replay':
+            return self._replayed_response(url)
+        kwargs.setdefault('timeout', self._timeout)
+        for attempt in range(self._retries + 1):
+            last_attempt = attempt == self._retries
+            try:
+                response = self._request(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or (response.status_code not in HttpClient.RETRY_STATUS_CODES):
+                    break
+            metrics.count('retries')
+            # limiter 의 자리를 반납한 후 기다림
+            time.sleep(self._backoff_factor * (2 ** attempt))
+        # 304 는 내용이 없으므로 저장하지 않음 (replay 시에는 항상 전체 page 를 돌려주도록)
+        if (mode == 'record') and (response.status_code != 304):
+            rawcache.get_cache().put(url, response.content, response.status_code, response.headers,
+                                     response.encoding)
+        return response
+
+    def _request(self, url: str, **kwargs) -> "requests.Response":
+        # 한 번의 시도. 시도마다 limiter 를 거침
+        import requests
+        with ratelimit.throttle(url) as slot:
+            try:
+                response = self._session.get(url, **kwargs)
+            except requests.RequestException:
+                metrics.count('request_errors')
+                raise
+            _observe_block_page(slot, response.content)
+            slot.observe(response)
+        _count_response(response)
+        return response
+
+    @staticmethod
+    def _replayed_response(url: str) -> "requests.Response":
+        """
+        rawcache 에 저장된 응답으로 requests.Response 를 만듦
+
+        :param url: requested url (str)
+        :return: recorded response (requests.Response)
+        """
+        record = rawcache.replay(url)
+        return _build_response(url, record['status'], record['headers'], record['content'], record['encoding'])
+
+    def close(self):
+        self._session.close()
+
+    @property
+    def session(self):
+        return self._session
+
+
+def _observe_block_page(slot, content: bytes):
+    if ratelimit.is_block_page(content):
+        metrics.count('block_pages')
+        slot.mark_congested()
+
+
+def _count_response(response: "requests.Response"):
+    metrics.count('requests')
+    metrics.count('bytes', len(response.content))
+
+
+def _build_response(url: str, status: int, headers, content: bytes, encoding: str | None) -> "requests.Response":
+    """
+    저장된 응답이나 aiohttp 응답을 requests.Response 로 만들어, 이후 단계가 응답의 출처와 무관하게 동작하도록 함.
+
+    :return: response (requests.Response)
+    """
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = encoding
+    response._content = content
+    return response
+
+
+class AsyncHttpClient:
+    """
+    HttpClient 의 asyncio 버전 (aiohttp 필요). AsyncItemScouter 의 모든 요청이 공유.
+
+    하나의 aiohttp.ClientSession 으로 connection 을 재사용하며, HttpClient 와 같은 ratelimit (athrottle),
+    timeout, 재시도 정책, rawcache record / replay 가 적용됨.
+    이후 단계(EquipmentPage 등)를 그대로 사용할 수 있도록 응답은 requests.Response 로,
+    연결 실패는 requests.RequestException 으로 바꾸어 돌려줌.
+
+    event loop 안에서 async with AsyncHttpClient() as client: 로 사용.
+
+    :param limit_per_host: maximum number of connections per host (int)
+    :param timeout: (connect timeout, read timeout) in seconds (tuple[float, float])
+    :param retries: maximum number of retries on connection errors and 5xx responses (int)
+    :param backoff_factor: exponential backoff factor between retries (float)
+    """
+    def __init__(self, limit_per_host: int = 16, timeout: tuple[float, float] = (5.0, 15.0), retries: int = 2,
+                 backoff_factor: float = 0.5):
+        self._limit_per_host = limit_per_host
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._session = None
+
+    def _get_session(self):
+        import aiohttp
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=HttpClient.DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(sock_connect=self._timeout[0], sock_read=self._timeout[1]),
+                connector=aiohttp.TCPConnector(limit_per_host=self._limit_per_host))
+        return self._session
+
+    async def _request(self, url: str, headers: dict | None) -> "requests.Response":
+        import asyncio
+        import aiohttp
+        import requests
+        from requests.utils import get_encoding_from_headers
+        async with ratelimit.athrottle(url) as slot:
+            try:
+                async with self._get_session().get(url, headers=headers) as async_response:
+                    slot.observe(async_response)
+                    content = await async_response.read()
+                    _observe_block_page(slot, content)
+                    response = _build_response(str(async_response.url), async_response.status,
+                                               async_response.headers, content,
+                                               get_encoding_from_headers(async_response.headers))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                metrics.count('request_errors')
+                raise requests.ConnectionError(f"{url} : {error!r}") from error
+        _count_response(response)
+        return response
+
+    async def get(self, url: str, headers: dict | None = None) -> "requests.Response":
+        """
+        ratelimit 을 거쳐 GET 요청.
+
+        :param url: requested url (str)
+        :param headers: additional request headers (dict or None)
+        :return: response (requests.Response)
+        """
+        import asyncio
+        import requests
+        mode = rawcache.get_mode()
+        if mode == 'replay':
+            return HttpClient._replayed_response(url)
+        for attempt in range(self._retries + 1):
+            last_attempt = attempt == self._retries
+            try:
+                response = await self._request(url, headers)
+            except requests.ConnectionError:
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or (response.status_code not in HttpClient.RETRY_STATUS_CODES):
+                    break
+            metrics.count('retries')
+            await asyncio.sleep(self._backoff_factor * (2 ** attempt))
+        # 304 는 내용이 없으므로 저장하지 않음 (replay 시에는 항상 전체 page 를 돌려주도록)
+        if (mode == 'record') and (response.status_code != 304):
+            rawcache.get_cache().put(url, response.content, response.status_code, response.headers,
+                                     response.encoding)
+        return response
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+_client_settings = {}
+
+
+def configure(**client_kwargs):
+    """
+    공용 client 설정 변경 (HttpClient 의 parameter 와 동일). 기존 client 는 닫고 다음 요청 시 새로 만듦.
+
+    :param client_kwargs: keyword arguments of HttpClient
+    :return: None
+    """
+    global _client
+    with _client_lock:
+        _client_settings.clear()
+        _client_settings.update(client_kwargs)
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def get_client() -> HttpClient:
+    """
+    :return: shared client (HttpClient)
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(**_client_settings)
+        return _client
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    """
+    공용 client 로 GET 요청.
+
+    :param url: requested url (str)
+    :return: response (requests.Response)
+    """
+    return get_client().get(url, **kwargs)
@@ -1,17 +1,189 @@
+"""
+여러 캐릭터를 scout 하여 장비 요약 정보를 캐릭터가 끝나는 대로 NDJSON / CSV / Parquet 으로 저장.
+
+nickname 은 인자, 파일(-i FILE, 한 줄에 하나, # 으로 시작하는 줄은 무시) 또는 stdin 으로 받음.
+실패한 캐릭터는 이유(비공개, 존재하지 않음, 점검 중, html 변경, 요청 실패) 별로 stderr 에 요약하고,
+--failures 로 지정한 파일에 실패하는 대로 NDJSON 으로 기록.
+중간에 멈추더라도 (Ctrl+C 등) 그때까지의 실패 기록과 요약, --metrics 는 남김.
+
+점검 중이거나 html 구조가 바뀐 것을 (--layout-threshold 번 연속 실패) 발견하면 --on-outage 에 따라
+abort : 남은 캐릭터는 요청하지 않고 skipped 로 기록 (기본값)
+pause : --probe-interval 초 마다 한 캐릭터로 확인하다가 회복되면 이어서 scout (--max-wait 초가 지나면 포기)
+off   : 캐릭터마다 각자 실패
+
+exit code : 0 모두 성공, 2 잘못된 인자, 3 요청 실패 등 기타, 4 비공개, 5 존재하지 않는 캐릭터,
+            6 html 변경, 7 점검 중 (여러 종류가 섞이면 가장 큰 값. skipped 는 그 원인의 값)
+
+usage : python main.py [nickname ...] [-i FILE] [-f ndjson|csv|parquet] [-o OUT] [--failures FILE]
+                       [--workers 4] [--parse-workers 0] [--rate R] [--max-rate R] [--concurrency N]
+                       [--extractor http|selenium] [--show-browser] [--no-url-cache] [--metrics FILE]
+                       [--on-outage abort|pause|off] [--layout-threshold 5] [--probe-interval 60] [--max-wait 3600]
+
+    cat nicknames.txt | python main.py -f csv -o summary.csv --workers 8 --rate 4
+"""
+from pathlib import Path
+import argparse
+import json
+import sys
+import errors
+import circuitbreaker
 import scouter
+import summarywriter
+
+# (예외 class, 실패 종류, exit code). 앞에서부터 isinstance 로 확인
+FAILURE_KINDS = ((errors.MaintenanceError, 'maintenance', 7),
+                 (errors.LayoutChangedError, 'layout_changed', 6),
+                 (errors.CharacterNotFoundError, 'not_found', 5),
+                 (errors.PrivateCharacterError, 'private', 4))
+OTHER_FAILURE = ('error', 3)
+
+
+def failure_kind(error: Exception) -> tuple[str, int]:
+    """
+    :param error: exception raised while scouting (Exception)
+    :return: kind of the failure and its exit code (tuple[str, int])
+    """
+    # breaker 가 열려 요청하지 않은 캐릭터는 breaker 를 연 원인의 exit code
+    if isinstance(error, errors.CircuitOpenError):
+        for error_class, kind, exit_code in FAILURE_KINDS:
+            if kind == error.reason:
+                return 'skipped', exit_code
+        return 'skipped', OTHER_FAILURE[1]
+    for error_class, kind, exit_code in FAILURE_KINDS:
+        if isinstance(error, error_class):
+            return kind, exit_code
+    return OTHER_FAILURE
+
+
+def read_nicknames(args) -> list[str]:
+    """
+    인자, 파일, stdin 순으로 nickname 을 모음. 빈 줄과 # 으로 시작하는 줄은 무시.
+
+    :param args: parsed arguments (argparse.Namespace)
+    :return: nicknames (list[str])
+    """
+    lines = list(args.nicknames)
+    if args.input is not None:
+        if args.input == '-':
+            lines += sys.stdin.read().splitlines()
+        else:
+            lines += Path(args.input).read_text(encoding="utf-8").splitlines()
+    elif (not lines) and (not sys.stdin.isatty()):
+        lines += sys.stdin.read().splitlines()
+    nicknames = [line.strip() for line in lines]
+    return [nickname for nickname in nicknames if nickname and not nickname.startswith('#')]
+
+
+def configure(args):
+    """
+    rate limit, url cache 설정
+
+    :param args: parsed arguments (argparse.Namespace)
+    :return: None
+    """
+    import ratelimit
+    import urlcache
+    limiter_kwargs = {name: getattr(args, name) for name in ('rate', 'max_rate', 'concurrency')
+                      if getattr(args, name) is not None}
+    if limiter_kwargs:
+        ratelimit.configure(**limiter_kwargs)
+    if args.no_url_cache:
+        urlcache.configure(None)
+
+
+def make_breaker(args):
+    """
+    :param args: parsed arguments (argparse.Namespace)
+    :return: breaker shared by the workers, None if --on-outage off (circuitbreaker.CircuitBreaker or None)
+    """
+    if args.on_outage == 'off':
+        return None
+    return circuitbreaker.CircuitBreaker(args.on_outage, args.layout_threshold, pause=args.probe_interval,
+                                         max_pause=max(args.probe_interval, 600.0), max_wait=args.max_wait)
+
+
+def write_metrics(path: Path):
+    import metrics
+    if path.suffix == '.prom':
+        metrics.get_registry().write_prometheus(path)
+    else:
+        metrics.get_registry().write_json(path)
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("nicknames", nargs="*")
+    arg_parser.add_argument("-i", "--input", help="file of nicknames, one per line ('-' for stdin)")
+    arg_parser.add_argument("-f", "--format", choices=summarywriter.FORMATS, default='ndjson')
+    arg_parser.add_argument("-o", "--output", help="output file (default stdout, required for parquet)")
+    arg_parser.add_argument("--failures", type=Path, help="write failed characters to this file as NDJSON")
+    arg_parser.add_argument("--workers", type=int, default=4, help="characters scouted concurrently (default 4)")
+    arg_parser.add_argument("--parse-workers", type=int, default=0,
+                            help="parse processes, 0 to parse in the worker threads (default 0)")
+    arg_parser.add_argument("--rate", type=float, help="initial requests per second per host")
+    arg_parser.add_argument("--max-rate", type=float, help="maximum requests per second per host")
+    arg_parser.add_argument("--concurrency", type=float, help="initial concurrent requests per host")
+    arg_parser.add_argument("--extractor", choices=scouter.ItemScouter.EXTRACTORS, default='http')
+    arg_parser.add_argument("--show-browser", action="store_true", help="run selenium browsers in foreground")
+    arg_parser.add_argument("--no-url-cache", action="store_true", help="do not use urlcache.sqlite3")
+    arg_parser.add_argument("--metrics", type=Path,
+                            help="write stage timings and counters (.prom for Prometheus textfile, else JSON)")
+    arg_parser.add_argument("--on-outage", choices=('abort', 'pause', 'off'), default='abort',
+                            help="on maintenance or html layout change, skip the rest (abort), wait and resume (pause)"
+                                 " or let every character fail on its own (off) (default abort)")
+    arg_parser.add_argument("--layout-threshold", type=int, default=5,
+                            help="consecutive html layout failures treated as a layout change (default 5)")
+    arg_parser.add_argument("--probe-interval", type=float, default=60.0,
+                            help="seconds between probes while paused, doubled on each failed probe (default 60)")
+    arg_parser.add_argument("--max-wait", type=float, default=3600.0,
+                            help="give up if the site does not recover in this many seconds while paused (default 3600)")
+    args = arg_parser.parse_args(argv)
 
+    if (args.format == 'parquet') and (args.output in (None, '-')):
+        arg_parser.error("--format parquet requires --output FILE.")
+    nicknames = read_nicknames(args)
+    if not nicknames:
+        arg_parser.error("no nicknames : give them as arguments, with -i FILE or through stdin.")
+    if args.layout_threshold < 1:
+        arg_parser.error("--layout-threshold should be positive.")
+    configure(args)
+    breaker = make_breaker(args)
 
-# 정보공개 되어있는 경우
-NICKNAME = "히슈와"
-pandas_scouter = scouter.PandasScouter(nickname=NICKNAME, background=True, progress_notification=True)
-pandas_scouter.tabulate_information()
+    failures = {}
+    exit_code = 0
+    done = 0
+    # 실패는 일어나는 대로 기록하여, 중간에 멈추더라도 (Ctrl+C, 예외) 그때까지의 실패가 남도록 함
+    failures_file = None if args.failures is None else args.failures.open("w", encoding="utf-8")
+    try:
+        with summarywriter.open_writer(args.format, args.output) as writer:
+            results = scouter.iter_scout_many(nicknames, max_workers=args.workers, parse_workers=args.parse_workers,
+                                              breaker=breaker, background=not args.show_browser,
+                                              extractor=args.extractor)
+            for nickname, item_scouter, error in results:
+                done += 1
+                if error is None:
+                    rows = summarywriter.summary_rows(item_scouter)
+                    writer.write(rows)
+                    print(f"[{done}/{len(nicknames)}] {nickname} : {len(rows)} items", file=sys.stderr)
+                    continue
+                kind, code = failure_kind(error)
+                exit_code = max(exit_code, code)
+                failures[kind] = failures.get(kind, 0) + 1
+                if failures_file is not None:
+                    failure = {'nickname': nickname, 'kind': kind, 'error': str(error)}
+                    failures_file.write(json.dumps(failure, ensure_ascii=False) + "\n")
+                    failures_file.flush()
+                print(f"[{done}/{len(nicknames)}] {nickname} : {kind} - {error}", file=sys.stderr)
+    finally:
+        if failures_file is not None:
+            failures_file.close()
+        failed = sum(failures.values())
+        print(f"\nscouted {done - failed}, failed {failed}"
+              + "".join(f", {kind} {number}" for kind, number in failures.items()), file=sys.stderr)
+        if args.metrics is not None:
+            write_metrics(args.metrics)
+    return exit_code
 
-# 정보공개 되어있지 않은 경우
-# NICKNAME = "오지환"
-# pandas_scouter = scouter.PandasScouter(nickname=NICKNAME, background=True, progress_notification=True)
-# pandas_scouter.tabulate_information()
 
-# 존재하지 않거나 랭킹에 노출되지 않는 캐릭터인 경우
-# NICKNAME = "!@#$%^&*()"
-# pandas_scouter = scouter.PandasScouter(nickname=NICKNAME, background=True, progress_notification=True)
-# pandas_scouter.tabulate_information()
+if __name__ == "__main__":
+    sys.exit(main())
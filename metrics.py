@@ -0,0 +1,332 @@
+from contextlib import contextmanager
+from pathlib import Path
+from bisect import bisect_left
+import threading
+import json
+import time
+import re
+
+
+# 단계 별 소요 시간 histogram 의 bucket 경계 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Prometheus 로 내보낼 때 metric 이름 앞에 붙이는 prefix
+PROMETHEUS_PREFIX = "scouter"
+# Prometheus metric 이름에 쓸 수 없는 문자
+INVALID_METRIC_CHARACTERS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+class Histogram:
+    """
+    소요 시간의 분포. 각 bucket 경계 이하인 관측 수와 합계, 개수를 저장.
+
+    :param buckets: upper bounds of buckets in seconds, ascending (tuple[float, ...])
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        # 마지막 칸은 +Inf
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, seconds: float):
+        self._counts[bisect_left(self._buckets, seconds)] += 1
+        self._sum += seconds
+        self._count += 1
+
+    def snapshot(self) -> dict:
+        """
+        :return: {'buckets': {upper bound: cumulative count}, 'sum', 'count'} (dict)
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self._buckets + (float('inf'),), self._counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else repr(bound)] = cumulative
+        return {'buckets': buckets, 'sum': self._sum, 'count': self._count}
+
+
+class MetricsRegistry:
+    """
+    scout 의 단계 별 소요 시간 histogram 과 counter 를 모으고, 등록된 hook 에 event 를 전달.
+
+    - 단계 (timer) : url_resolution, equipment_page, availability_check, slot_detection, browser_startup,
+                     slot_extract, parsing, summarization
+    - counter (count) : requests, bytes, retries, request_errors, parse_errors, http_fallbacks, memo_hits
+    - event : not_modified, slot_reused, http_fallback, slot_parsed, slots_parsed, slot_summarized, summarized
+
+    hook 은 event 하나를 dict 로 받는 callable. 모든 event 는 'kind' ('stage', 'count', 'event') 와 'name',
+    stage 는 'seconds', 'ok', count 는 'amount' 를 가지며, 그 외에 nickname, slot 등 context 를 가짐.
+    (JsonLinesExporter, TextfileExporter, ProgressPrinter 참고)
+
+    :param buckets: upper bounds of latency buckets in seconds (tuple[float, ...])
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def _emit(self, event: dict):
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            hook(event)
+
+    def observe(self, stage: str, seconds: float, ok: bool = True, **context):
+        """
+        :param stage: name of the stage (str)
+        :param seconds: elapsed seconds (float)
+        :param ok: whether the stage finished without exception (bool)
+        :param context: nickname, slot, ... of the event
+        :return: None
+        """
+        with self._lock:
+            if stage not in self._histograms:
+                self._histograms[stage] = Histogram(self._buckets)
+            self._histograms[stage].observe(seconds)
+        self._emit(dict(context, kind='stage', name=stage, seconds=seconds, ok=ok))
+
+    @contextmanager
+    def timer(self, stage: str, **context):
+        """
+        with registry.timer('parsing', nickname=nickname): 블록의 소요 시간을 stage 에 기록.
+        블록에서 예외가 발생해도 기록하며, 이때 event 의 ok 는 False.
+
+        :param stage: name of the stage (str)
+        :param context: nickname, slot, ... of the event
+        :return: None
+        """
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.observe(stage, time.perf_counter() - start, ok, **context)
+
+    def count(self, name: str, amount: int = 1, **context):
+        """
+        :param name: name of the counter (str)
+        :param amount: increment (int)
+        :param context: nickname, slot, ... of the event
+        :return: None
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+        self._emit(dict(context, kind='count', name=name, amount=amount))
+
+    def event(self, name: str, **context):
+        """
+        기록할 수치는 없이 hook 에만 전달하는 event. (이전 정보 재사용, selenium 으로 대체 등)
+
+        :param name: name of the event (str)
+        :param context: nickname, slot, ... of the event
+        :return: None
+        """
+        self._emit(dict(context, kind='event', name=name))
+
+    def record(self, event: dict):
+        """
+        hook 이 받은 event 를 이 registry 에 다시 기록. (다른 process 에서 수집한 event 를 합칠 때)
+
+        :param event: event passed to hooks (dict)
+        :return: None
+        """
+        context = {key: value for key, value in event.items() if key not in ('kind', 'name', 'seconds', 'ok', 'amount')}
+        if event['kind'] == 'stage':
+            self.observe(event['name'], event['seconds'], event['ok'], **context)
+        elif event['kind'] == 'count':
+            self.count(event['name'], event['amount'], **context)
+        else:
+            self.event(event['name'], **context)
+
+    def add_hook(self, hook):
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def clear_hooks(self):
+        with self._lock:
+            self._hooks.clear()
+
+    def snapshot(self) -> dict:
+        """
+        :return: {'stages': {stage: histogram snapshot}, 'counters': {name: value}} (dict)
+        """
+        with self._lock:
+            return {'stages': {stage: histogram.snapshot() for stage, histogram in self._histograms.items()},
+                    'counters': dict(self._counters)}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition format.
+        단계는 {prefix}_stage_seconds histogram 의 stage label 로, counter 는 {prefix}_{name}_total 로.
+        label 값은 escape 하고, counter 이름의 쓸 수 없는 문자는 '_' 로 바꿈.
+
+        :return: metrics text (str)
+        """
+        snapshot = self.snapshot()
+        name = f"{PROMETHEUS_PREFIX}_stage_seconds"
+        lines = [f"# HELP {name} Elapsed seconds of each scouting stage.", f"# TYPE {name} histogram"]
+        for stage, histogram in sorted(snapshot['stages'].items()):
+            stage = _escape_label(stage)
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram["count"]}')
+        for counter, value in sorted(snapshot['counters'].items()):
+            name = f"{PROMETHEUS_PREFIX}_{INVALID_METRIC_CHARACTERS.sub('_', counter)}_total"
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomic(Path(path), self.to_json())
+
+    def write_prometheus(self, path):
+        """
+        node_exporter textfile collector 가 읽을 수 있도록 .prom 파일로 저장 (원자적으로 교체).
+
+        :param path: output file, e.g. /var/lib/node_exporter/textfile/scouter.prom (str or Path)
+        :return: None
+        """
+        _write_atomic(Path(path), self.to_prometheus())
+
+
+def _escape_label(value: str) -> str:
+    # text exposition format 의 label 값에서는 backslash, 큰따옴표, 줄바꿈을 escape
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: Path, text: str):
+    # 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 후 교체
+    temporary = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    temporary.replace(path)
+
+
+class JsonLinesExporter:
+    """
+    모든 event 를 한 줄의 JSON 으로 파일에 이어 씀. registry.add_hook(JsonLinesExporter(path)) 로 사용.
+
+    :param path: output file (str or Path)
+    """
+    def __init__(self, path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        line = json.dumps(dict(event, time=time.time()), ensure_ascii=False, default=str)
+        with self._lock, self._path.open("a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class TextfileExporter:
+    """
+    event 가 발생할 때 마지막 저장 후 interval 초가 지났으면 registry 전체를 Prometheus textfile 로 저장.
+    registry.add_hook(TextfileExporter(registry, path)) 로 사용하며, 마지막에 flush() 를 호출.
+
+    :param registry: registry to export (MetricsRegistry)
+    :param path: output .prom file (str or Path)
+    :param interval: minimum seconds between two writes (float)
+    """
+    def __init__(self, registry: MetricsRegistry, path, interval: float = 10.0):
+        self._registry = registry
+        self._path = Path(path)
+        self._interval = interval
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._written < self._interval:
+                return
+            self._written = now
+        self.flush()
+
+    def flush(self):
+        self._registry.write_prometheus(self._path)
+
+
+class ProgressPrinter:
+    """
+    한 캐릭터의 event 를 진행 상황 문장으로 출력하는 hook. (ItemScouter 의 progress_notification 옵션)
+
+    :param nickname: character to print the progress of (str)
+    """
+    # event 이름 -> (출력 문장, 뒤에 빈 줄 출력 여부). stage 는 성공한 경우만 출력
+    MESSAGES = {'url_resolution': ("Get equipment detail url : Done", True),
+                'not_modified': ("Equipment page not modified : Reuse the previous information", True),
+                'availability_check': ("Check maintenance : Done", True),
+                'slot_detection': ("Specify equipments to extract the information : Done", True),
+                'slot_reused': ("Reuse the information of {slot} : Unchanged", False),
+                'http_fallback': ("HTTP extraction of {slot} failed : Fall back to selenium", False),
+                'slot_parsed': ("Save the information of {slot} : Done", False),
+                'slots_parsed': (None, True),
+                'slot_summarized': ("Summary the information of {slot} : Done", False),
+                'summarized': (None, True)}
+
+    def __init__(self, nickname: str):
+        self._nickname = nickname
+
+    def __call__(self, event: dict):
+        if (event.get('nickname') != self._nickname) or (event['name'] not in ProgressPrinter.MESSAGES):
+            return
+        if (event['kind'] == 'stage') and not event['ok']:
+            return
+        message, blank_line = ProgressPrinter.MESSAGES[event['name']]
+        if message is not None:
+            print(f"<<< {message.format(**event)} >>>")
+        if blank_line:
+            print()
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    :return: registry shared by every module (MetricsRegistry)
+    """
+    return _registry
+
+
+def timer(stage: str, **context):
+    return _registry.timer(stage, **context)
+
+
+def observe(stage: str, seconds: float, ok: bool = True, **context):
+    _registry.observe(stage, seconds, ok, **context)
+
+
+def count(name: str, amount: int = 1, **context):
+    _registry.count(name, amount, **context)
+
+
+def event(name: str, **context):
+    _registry.event(name, **context)
+
+
+def record(event: dict):
+    _registry.record(event)
+
+
+def add_hook(hook):
+    _registry.add_hook(hook)
+
+
+def remove_hook(hook):
+    _registry.remove_hook(hook)
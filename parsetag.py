@@ -1,8 +1,13 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-import requests
+from urllib.parse import urljoin
+from typing import TYPE_CHECKING
+import htmlparser
+import errors
+import httpclient
+import ratelimit
+import rawcache
+
+if TYPE_CHECKING:
+    from bs4.element import Tag
 
 
 EQUIPMENT_INDEX = {'반지1': 1, '모자': 3, '엠블렘': 5,
@@ -13,22 +18,151 @@ EQUIPMENT_INDEX = {'반지1': 1, '모자': 3, '엠블렘': 5,
                    '신발': 28, '안드로이드': 29, '기계심장': 30}
 
 
-def is_available(url):
+class EquipmentPage:
     """
-    홈페이지가 점검 중인지, 그래서 크롤링이 가능한지, 불가능하다면 raise RuntimeError
-    해당 캐릭터 정보가 공개되었는지, 그래서 크롤링이 가능한지, 불가능하다면 raise RuntimeError
+    equipment detail page 를 한 번만 요청하여 응답과 파싱 결과(soup)를 snapshot 으로 보관.
+
+    점검/비공개 확인(is_available), 착용 장비 확인(ItemScouter._equip_or_not_dict),
+    장비 정보 추출(HttpEquipmentTag) 이 모두 이 snapshot 하나를 공유하여 같은 page 를 다시 요청하지 않도록 함.
+
+    validators (이전 응답의 ETag, Last-Modified) 가 주어지면 조건부 요청을 보내고,
+    서버가 304 Not Modified 로 응답하면 파싱하지 않음 (not_modified).
 
     :param url: url of equipment detail page (str)
+    :param validators: ETag / Last-Modified of the previous response (dict[str, str] or None)
+    """
+    CONDITIONAL_HEADERS = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}
+
+    def __init__(self, url: str, validators: dict[str, str] | None = None):
+        self._load(url, httpclient.get(url, headers=self.conditional_headers(validators)))
+
+    def _load(self, url: str, response):
+        self._url = url
+        self._response = response
+        self._not_modified = self._response.status_code == 304
+        self._soup = None if self._not_modified else htmlparser.parse(self._response.content)
+
+    @staticmethod
+    def conditional_headers(validators: dict[str, str] | None) -> dict[str, str]:
+        """
+        :param validators: ETag / Last-Modified of the previous response (dict[str, str] or None)
+        :return: If-None-Match / If-Modified-Since headers of the conditional request (dict[str, str])
+        """
+        headers = {}
+        for validator, header in EquipmentPage.CONDITIONAL_HEADERS.items():
+            if (validators is not None) and (validator in validators):
+                headers[header] = validators[validator]
+        return headers
+
+    @classmethod
+    def from_response(cls, url: str, response):
+        """
+        따로 요청하여 받은 응답으로 snapshot 생성 (AsyncItemScouter 등)
+
+        :param url: url of equipment detail page (str)
+        :param response: response of the (conditional) request (requests.Response)
+        :return: snapshot (EquipmentPage)
+        """
+        page = cls.__new__(cls)
+        page._load(url, response)
+        return page
+
+    @classmethod
+    def from_html(cls, url: str, html: str | bytes):
+        """
+        요청 없이 이미 가지고 있는 html 로 snapshot 생성 (저장해둔 page, benchmark 등)
+
+        :param url: url of equipment detail page (str)
+        :param html: html of equipment detail page (str or bytes)
+        :return: snapshot (EquipmentPage)
+        """
+        page = cls.__new__(cls)
+        page._url = url
+        page._response = None
+        page._not_modified = False
+        page._soup = htmlparser.parse(html)
+        return page
+
+    def slot_fingerprints(self) -> dict[str, str]:
+        """
+        EQUIPMENT_INDEX 의 각 item pot 의 링크, 아이콘, 이름을 이어 붙인 문자열.
+        이전 snapshot 과 비교하여 장비가 바뀐 부위만 찾는 데 사용 (ItemScouter 의 incremental 모드).
+
+        :return: fingerprint of each slot (dict[str, str])
+        """
+        fingerprints = {}
+        for key, value in EQUIPMENT_INDEX.items():
+            item_pot = self._soup.select_one(f"#container ul.item_pot > li:nth-child({value})")
+            if item_pot is None:
+                fingerprints[key] = ""
+                continue
+            link = item_pot.select_one("a")
+            icon = item_pot.select_one("img")
+            parts = (link.get("href", "") if link is not None else "",
+                     icon.get("src", "") if icon is not None else "",
+                     icon.get("alt", "") if icon is not None else "",
+                     item_pot.get_text(strip=True))
+            fingerprints[key] = "\x1f".join(parts)
+        return fingerprints
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def ok(self):
+        return (self._response is None) or (self._response.status_code < 400)
+
+    @property
+    def not_modified(self):
+        return self._not_modified
+
+    @property
+    def validators(self):
+        """
+        :return: ETag / Last-Modified of the response, for the next conditional request (dict[str, str])
+        """
+        if self._response is None:
+            return {}
+        return {validator: self._response.headers[validator]
+                for validator in EquipmentPage.CONDITIONAL_HEADERS if validator in self._response.headers}
+
+    @property
+    def response(self):
+        return self._response
+
+    @property
+    def soup(self):
+        return self._soup
+
+
+def check_maintenance(soup):
+    """
+    홈페이지가 점검 중이면 raise errors.MaintenanceError
+    점검 중에는 랭킹, 캐릭터 정보 page 도 점검 안내 page 로 바뀌므로 모든 page 에서 확인.
+
+    :param soup: parsed page (bs4.BeautifulSoup or htmlparser.SelectolaxNode)
+    :return: None
+    """
+    if soup.select_one("#container [alt='메이플스토리 게임 점검 중에는 이용하실 수 없습니다.']") is not None:
+        raise errors.MaintenanceError("메이플스토리 게임 점검 중")
+
+
+def is_available(page: str | EquipmentPage):
+    """
+    홈페이지가 점검 중인지, 그래서 크롤링이 가능한지, 불가능하다면 raise errors.MaintenanceError
+    해당 캐릭터 정보가 공개되었는지, 그래서 크롤링이 가능한지, 불가능하다면 raise errors.PrivateCharacterError
+
+    :param page: url or snapshot of equipment detail page (str or EquipmentPage)
     :return: None
     """
-    html = requests.get(url)
-    soup = BeautifulSoup(html.content, 'html.parser')
-    maintenance = soup.select_one("#container [alt='메이플스토리 게임 점검 중에는 이용하실 수 없습니다.']") is not None
-    if maintenance:
-        raise RuntimeError("메이플스토리 게임 점검 중")
+    if type(page) == str:
+        page = EquipmentPage(page)
+    soup = page.soup
+    check_maintenance(soup)
     closed = soup.select_one("#container [alt='공개하지 않은 정보입니다.']") is not None
     if closed:
-        raise RuntimeError("공개하지 않은 정보입니다.")
+        raise errors.PrivateCharacterError("공개하지 않은 정보입니다.")
 
 
 class BrowserForEquipmentTag:
@@ -37,18 +171,43 @@ class BrowserForEquipmentTag:
     target equipment 의 정보를 bs4.element.Tag 로 크롤링할 수 있도록 함. (get_equipment_info_tag())
 
     이후 이 Tag 를 ParseInfoTag 로 넘겨서 파싱하도록 함.
+    selenium 은 이 클래스를 처음 사용할 때 import.
+
+    pool 이 주어지면 브라우저를 새로 띄우지 않고 pool 에서 빌려 쓰며, quit_browser() 시 pool 에 반납.
 
     :param url: url of equipment detail page (str)
     :param background: webdriver.ChromeOptions --headless (bool)
+    :param pool: pool to borrow a warm browser from (browserpool.BrowserPool or None)
     """
-    def __init__(self, url: str, background: bool = True):
-        # chrome browser 를 열지 않고 background 에서 실행
-        options = webdriver.ChromeOptions()
-        if background:
-            options.add_argument("--headless")
+    def __init__(self, url: str, background: bool = True, pool=None):
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+        self._pool = pool
+        self._pages = 0
+        self._broken = False
+        if pool is None:
+            # chrome browser 를 열지 않고 background 에서 실행
+            options = webdriver.ChromeOptions()
+            if background:
+                options.add_argument("--headless")
+            self._browser = webdriver.Chrome('./chromedriver', chrome_options=options)
+        else:
+            self._browser = pool.acquire()
         # 캐릭터정보/장비탭 url 을 입력받아 브라우저 실행
-        self._browser = webdriver.Chrome('./chromedriver', chrome_options=options)
-        self._browser.get(url)
+        self._url = url
+        loaded = False
+        try:
+            with ratelimit.throttle(url):
+                self._browser.get(url)
+            loaded = True
+        except WebDriverException:
+            self._broken = True
+            raise
+        finally:
+            # 어떤 예외든 (requests 예외, KeyboardInterrupt 등) 브라우저와 pool 의 자리를 반납 또는 폐기
+            if not loaded:
+                self.quit_browser()
+        self._pages += 1
 
     def _get_equipment_webelement(self, item: str | int):
         """
@@ -59,6 +218,7 @@ class BrowserForEquipmentTag:
         :param item: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
         :return: Webelement of the target item pot(selenium.webdriver.remote.webelement.WebElement)
         """
+        from selenium.webdriver.common.by import By
         if type(item) == int:
             element = self._browser.find_element(by=By.CSS_SELECTOR,
                                                  value=f"#container ul.item_pot > li:nth-child({item})")
@@ -77,35 +237,146 @@ class BrowserForEquipmentTag:
         :param equip: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
         :return: Tag of information about the target(clicked) equipment (bs4.element.Tag)
         """
+        from selenium.common.exceptions import WebDriverException
         # 찾고자 하는 장비를 클릭
-        item_element = self._get_equipment_webelement(equip)
-        item_element.click()
-        # 클릭 이후 바뀐 html get
-        html = self._browser.page_source
-        # BSoup 으로 전체 html 파싱
-        soup = BeautifulSoup(html, 'html.parser')
+        try:
+            item_element = self._get_equipment_webelement(equip)
+            # 클릭 시 브라우저가 장비 정보를 요청하므로 클릭도 limiter 를 거침
+            with ratelimit.throttle(self._url):
+                item_element.click()
+            # 클릭 이후 바뀐 html get
+            html = self._browser.page_source
+        except WebDriverException:
+            self._broken = True
+            raise
+        self._pages += 1
+        # 설정된 parser backend 로 전체 html 파싱
+        soup = htmlparser.parse(html)
         # 해당 장비 정보 탭 부분만 파싱
         item_info = soup.select_one("#container div.tab01_con_wrap > div.item_info > div")
+        if item_info is None:
+            raise errors.LayoutChangedError(f"{equip} : Cannot find the equipment information. Changed html.")
         return item_info
 
     def quit_browser(self):
         """
         브라우저 종료. background=True 옵션일 경우, 반드시 명시적으로 호출하여야 함.
+        pool 에서 빌린 브라우저라면 종료하지 않고 pool 에 반납.
 
         :return: None
         """
+        if self._pool is not None:
+            self._pool.release(self._browser, pages=self._pages, broken=self._broken)
+            return
         self._browser.quit()
         print("Browser quit!")
         print()
 
 
+class HttpEquipmentTag:
+    """
+    BrowserForEquipmentTag 와 같은 get_equipment_info_tag() 를 제공하되, 브라우저 없이 HTTP 요청만으로 동작.
+
+    item pot 클릭 시 브라우저가 보내는 요청(item pot 링크에 대한 XMLHttpRequest)을 직접 보내고,
+    응답으로 받은 장비 정보 html 에서 div.item_info 부분을 Tag 로 파싱.
+
+    :param page: url or snapshot of equipment detail page (str or EquipmentPage)
+    """
+    ITEM_INFO_HEADERS = {'X-Requested-With': 'XMLHttpRequest'}
+
+    def __init__(self, page: str | EquipmentPage):
+        if type(page) == str:
+            page = EquipmentPage(page)
+        self._url = page.url
+        self._soup = page.soup
+
+    def _get_equipment_link(self, item: str | int) -> str:
+        """
+        장비 부위 이름 str 또는 li:(n)th-child int n을 받아서 해당 장비 item pot 의 링크(절대 url) 반환.
+
+        get_equipment_info_tag 함수의 도구로서, 단독으로 사용되지 않음.
+
+        :param item: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
+        :return: url of the item detail request (str)
+        """
+        if type(item) == str:
+            item = EQUIPMENT_INDEX[item]
+        elif type(item) != int:
+            raise TypeError("parameter : str or int")
+        item_pot = self._soup.select_one(f"#container ul.item_pot > li:nth-child({item}) a")
+        if (item_pot is None) or (item_pot.get("href", "") == ""):
+            raise errors.LayoutChangedError(f"item pot {item} : 착용하지 않은 장비이거나 html 이 변경됨.")
+        return urljoin(self._url, item_pot["href"])
+
+    def get_equipment_info_tag(self, equip: str | int):
+        """
+        target equipment 의 item pot 링크를 직접 요청하여 응답 html 에서 해당 장비 정보 부분만 Tag 로 파싱
+
+        응답이 json 이면 'view' 항목의 html 을, 아니면 응답 본문 그대로를 파싱.
+        장비 정보 조각이 아니거나 장비 정보를 찾지 못하면 raise errors.LayoutChangedError
+        (ItemScouter 는 이 경우 selenium 으로 대체)
+
+        :param equip: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
+        :return: Tag of information about the target equipment (bs4.element.Tag)
+        """
+        link = self._get_equipment_link(equip)
+        response = httpclient.get(link, headers=self._request_headers())
+        return self._find_equipment_info_tag(response, equip)
+
+    def _request_headers(self) -> dict[str, str]:
+        return dict(HttpEquipmentTag.ITEM_INFO_HEADERS, Referer=self._url)
+
+    @staticmethod
+    def _find_equipment_info_tag(response, equip: str | int):
+        """
+        item pot 링크의 응답에서 장비 정보 부분만 Tag 로 파싱. (get_equipment_info_tag 와 AsyncItemScouter 가 공유)
+
+        :param response: response of the item detail request (requests.Response)
+        :param equip: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
+        :return: Tag of information about the target equipment (bs4.element.Tag)
+        """
+        response.raise_for_status()
+        try:
+            html = response.json()["view"]
+        except (ValueError, KeyError, TypeError):
+            html = response.text
+        soup = htmlparser.parse(html)
+        # 조각 대신 전체 page 가 돌아오면 그 안의 장비 정보는 요청한 장비가 아닐 수 있으므로 사용하지 않음
+        if soup.select_one("#container ul.item_pot") is not None:
+            raise errors.LayoutChangedError(f"{equip} : 장비 정보 대신 전체 page 를 받음. Changed html.")
+        item_info = soup.select_one("div.item_info > div")
+        if (item_info is None) or (item_info.select_one(".item_title h1") is None):
+            raise errors.LayoutChangedError(f"{equip} : 장비 정보를 찾을 수 없음. Changed html.")
+        return item_info
+
+
+class ReplayEquipmentTag:
+    """
+    rawcache 의 replay 모드에서 사용. 저장해둔 장비 정보 Tag html 로 get_equipment_info_tag() 를 제공하여
+    네트워크와 브라우저 없이 장비 정보를 얻음.
+
+    :param page: url or snapshot of equipment detail page (str or EquipmentPage)
+    """
+    def __init__(self, page: str | EquipmentPage):
+        self._url = page if type(page) == str else page.url
+
+    def get_equipment_info_tag(self, equip: str | int):
+        """
+        :param equip: category or number of target item pot (EQUIPMENT_INDEX) (str or int)
+        :return: Tag of information about the target equipment (bs4.element.Tag)
+        """
+        record = rawcache.replay(rawcache.RawHtmlCache.item_key(self._url, equip))
+        return htmlparser.parse(record['content'])
+
+
 class ParseInfoTag:
     """
-    BrowserForEquipmentTag 로 얻은 target equipment 의 정보가 담긴 Tag 를 일차적으로 Parsing.
+    BrowserForEquipmentTag 또는 HttpEquipmentTag 로 얻은 target equipment 의 정보가 담긴 Tag 를 일차적으로 Parsing.
+    찾아야 하는 부분이 없으면 raise errors.LayoutChangedError
 
     :param equipment_info_tag: bs4 Tag about information of target equipments (bs4.element.Tag)
     """
-    def __init__(self, equipment_info_tag: Tag):
+    def __init__(self, equipment_info_tag: "Tag"):
         self._equip_tag = equipment_info_tag
         self._title = self._equip_title()
         self._category = self._equip_category()
@@ -118,7 +389,7 @@ class ParseInfoTag:
 
         :return: parsed text (str)
         """
-        title_tag = self._equip_tag.select_one(".item_title h1")
+        title_tag = self._select_one(self._equip_tag, ".item_title h1")
         title_text = title_tag.text
         title_text = title_text.replace("\n", "")
         title_text = title_text.replace(u"\xa0", "")
@@ -134,7 +405,7 @@ class ParseInfoTag:
 
         :return: parsed text (str)
         """
-        category_tag = self._equip_tag.select_one(".item_ability > div:nth-child(3) > span > em")
+        category_tag = self._select_one(self._equip_tag, ".item_ability > div:nth-child(3) > span > em")
         category_text = category_tag.text
         return category_text
 
@@ -151,13 +422,20 @@ class ParseInfoTag:
         stet_tag_set = self._equip_tag.select(".stet_info > ul > li")
         stats_dict = {}
         for li_tag in stet_tag_set:
-            attr = li_tag.select_one(".stet_th span").text
+            attr = self._select_one(li_tag, ".stet_th span").text
             attr = attr.replace("\n", "")
             attr = attr.strip()
-            value_tag = li_tag.select_one(".point_td")
+            value_tag = self._select_one(li_tag, ".point_td")
             stats_dict[attr] = value_tag
         return stats_dict
 
+    @staticmethod
+    def _select_one(tag: "Tag", selector: str) -> "Tag":
+        found = tag.select_one(selector)
+        if found is None:
+            raise errors.LayoutChangedError(f"{selector} : 장비 정보에서 찾을 수 없음. Changed html.")
+        return found
+
     @property
     def title(self):
         return self._title
@@ -0,0 +1,276 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import closing
+import threading
+import queue
+import errors
+import htmlparser
+import equipment
+import scouter
+import metrics
+
+
+# fetch thread 가 queue 에 넣는 message 의 종류 (item 자리에 넣음)
+_FETCHED = object()
+_FAILED = object()
+
+
+def _init_parse_worker(backend: str):
+    """
+    parse process 의 initializer.
+    fork 로 복사된 main process 의 metrics hook (exporter, ProgressPrinter 등) 과 기록을 지워,
+    parse process 의 event 가 main process 의 파일이나 화면에 직접 쓰이지 않고 _parse_item_html 로만 전달되도록 함.
+    html parser backend 는 main process 와 같게 설정.
+
+    :param backend: html parser backend of the main process (str)
+    :return: None
+    """
+    registry = metrics.get_registry()
+    registry.clear_hooks()
+    registry.reset()
+    htmlparser.configure(backend)
+
+
+def _parse_item_html(html: str) -> tuple[tuple[equipment.TrimmedInformation, equipment.SummaryInformation], list]:
+    """
+    parse process 에서 실행. 장비 정보 Tag 의 html 을 파싱 (process 마다 각자의 memo 를 사용).
+    parse process 의 metrics 는 main process 에서 볼 수 없으므로, 파싱 중 발생한 event 를 함께 돌려줌.
+
+    :param html: html of the equipment information Tag (str)
+    :return: trimmed and summarized information, metrics events (tuple[tuple, list[dict]])
+    """
+    events = []
+    metrics.add_hook(events.append)
+    try:
+        return equipment.get_item_memo().parse(htmlparser.parse(html)), events
+    finally:
+        metrics.remove_hook(events.append)
+
+
+def _parse_result(future) -> tuple[equipment.TrimmedInformation, equipment.SummaryInformation]:
+    """
+    parse future 의 결과를 꺼내고, parse process 에서 발생한 event 를 main process 의 metrics 에 기록.
+
+    :param future: future of _parse_item_html (concurrent.futures.Future)
+    :return: trimmed and summarized information (tuple[TrimmedInformation, SummaryInformation])
+    """
+    try:
+        parsed, events = future.result()
+    except Exception:
+        metrics.count('parse_errors')
+        raise
+    for event in events:
+        metrics.record(event)
+    return parsed
+
+
+class ScoutPipeline:
+    """
+    장비 정보 추출(네트워크, 브라우저) 과 파싱(CPU) 을 분리하여 여러 캐릭터를 scout.
+
+    - fetch : fetch_workers 개의 thread 가 캐릭터 단위로 장비 정보 Tag 를 추출하여
+              그 html 을 크기 queue_size 의 queue 에 넣음
+    - parse : queue 에서 꺼낸 html 을 parse_workers 개의 process 가 TrimmedInformation, SummaryInformation 으로 파싱
+
+    queue 가 가득 차거나 파싱 중인 html 이 queue_size 개에 이르면 fetch thread 가 기다리므로 (backpressure),
+    캐릭터 수가 많아도 메모리에 쌓이는 html 은 최대 2 * queue_size 개.
+    한 캐릭터의 파싱이 모두 끝나면 scouter_class 객체로 완성하여 BatchScoutResult 에 저장.
+
+    :param fetch_workers: maximum number of characters fetched concurrently (int)
+    :param parse_workers: number of parse processes, os.cpu_count() if None (int or None)
+    :param queue_size: maximum number of html waiting for / being parsed (int)
+    :param scouter_class: ItemScouter or its subclass such as PandasScouter (type)
+    :param breaker: shared by the fetch threads to pause or abort during maintenance
+                    (circuitbreaker.CircuitBreaker or None)
+    :param scouter_kwargs: keyword arguments passed to scouter_class (background, extractor, ...)
+    """
+    def __init__(self, fetch_workers: int = 4, parse_workers: int | None = None, queue_size: int = 64,
+                 scouter_class: type = scouter.ItemScouter, breaker=None, **scouter_kwargs):
+        if fetch_workers < 1:
+            raise ValueError(f"fetch_workers : should be positive, but it is {fetch_workers}.")
+        if (parse_workers is not None) and (parse_workers < 1):
+            raise ValueError(f"parse_workers : should be positive, but it is {parse_workers}.")
+        if queue_size < 1:
+            raise ValueError(f"queue_size : should be positive, but it is {queue_size}.")
+        self._fetch_workers = fetch_workers
+        self._parse_workers = parse_workers
+        self._queue_size = queue_size
+        self._scouter_class = scouter_class
+        self._breaker = breaker
+        # 진행 상황 출력은 여러 캐릭터가 섞이므로 사용하지 않음
+        scouter_kwargs.pop('progress_notification', None)
+        self._scouter_kwargs = scouter_kwargs
+
+    def _fetch(self, nickname: str, raw_queue: queue.Queue, stopped: threading.Event):
+        """
+        fetch thread 에서 실행. 한 캐릭터의 장비 정보 Tag 를 추출하여 html 을 queue 에 넣고,
+        마지막으로 완료(_FETCHED, scouter) 또는 실패(_FAILED, 예외) 를 넣음.
+
+        :param nickname: want to search (str)
+        :param raw_queue: bounded queue of (nickname, item, html or None) (queue.Queue)
+        :param stopped: set when the pipeline is aborted (threading.Event)
+        :return: None
+        """
+        # 이미 중단된 pipeline 이면 요청하지 않음
+        if stopped.is_set():
+            return
+        try:
+            if self._breaker is None:
+                item_scouter = self._fetch_tags(nickname, raw_queue, stopped)
+            else:
+                item_scouter = self._guarded_fetch_tags(nickname, raw_queue, stopped)
+            if item_scouter is not None:
+                self._put(raw_queue, (nickname, _FETCHED, item_scouter), stopped)
+        except Exception as error:
+            self._put(raw_queue, (nickname, _FAILED, error), stopped)
+
+    def _fetch_tags(self, nickname: str, raw_queue: queue.Queue, stopped: threading.Event, started: list = None):
+        """
+        한 캐릭터의 장비 정보 html 을 queue 에 넣음.
+
+        :param started: becomes non-empty once an item is put (list or None)
+        :return: scouter created by _deferred(), None if the pipeline is aborted (scouter.ItemScouter or None)
+        """
+        item_scouter = self._scouter_class._deferred(nickname, **self._scouter_kwargs)
+        with closing(item_scouter._iter_item_tags()) as item_tags:
+            for item, item_info_tag in item_tags:
+                html = None if item_info_tag is None else str(item_info_tag)
+                if not self._put(raw_queue, (nickname, item, html), stopped):
+                    return None
+                if started is not None:
+                    started.append(item)
+        return item_scouter
+
+    def _guarded_fetch_tags(self, nickname: str, raw_queue: queue.Queue, stopped: threading.Event):
+        """
+        breaker 안에서 _fetch_tags(). 'pause' mode 에서 점검 중이라 실패하면 breaker 가 닫힌 후 다시 시도하되,
+        이미 queue 에 넣은 장비가 있으면 중복되지 않도록 다시 시도하지 않음.
+
+        :return: same as _fetch_tags() (scouter.ItemScouter or None)
+        """
+        while True:
+            started = []
+            try:
+                with self._breaker.guard():
+                    return self._fetch_tags(nickname, raw_queue, stopped, started)
+            except errors.MaintenanceError:
+                if started or (self._breaker.mode != 'pause') or stopped.is_set():
+                    raise
+
+    @staticmethod
+    def _put(raw_queue: queue.Queue, message: tuple, stopped: threading.Event) -> bool:
+        """
+        queue 에 자리가 날 때까지 기다렸다가 넣음. pipeline 이 중단되면 포기.
+
+        :return: whether the message is put or not (bool)
+        """
+        while not stopped.is_set():
+            try:
+                raw_queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _complete(item_scouter: scouter.ItemScouter, items: dict) -> tuple:
+        """
+        한 캐릭터의 파싱 결과를 모아 scouter 를 완성.
+
+        :param item_scouter: scouter created by _deferred() (scouter.ItemScouter)
+        :param items: parse future of each item, or None to reuse the previous one (dict[str, Future or None])
+        :return: (nickname, scouter or None, exception or None) (tuple)
+        """
+        try:
+            parsed = {item: None if future is None else _parse_result(future) for item, future in items.items()}
+            item_scouter._finish(parsed)
+        except Exception as error:
+            return item_scouter.nickname, None, error
+        return item_scouter.nickname, item_scouter, None
+
+    def run(self, nicknames) -> scouter.BatchScoutResult:
+        """
+        :param nicknames: want to search (Iterable[str])
+        :return: scouters and failures keyed by nickname (scouter.BatchScoutResult)
+        """
+        result = scouter.BatchScoutResult()
+        for nickname, item_scouter, error in self.iter_results(nicknames):
+            if error is None:
+                result._add_scouter(nickname, item_scouter)
+            else:
+                result._add_failure(nickname, error)
+        return result
+
+    def iter_results(self, nicknames):
+        """
+        run() 과 같이 scout 하되, 캐릭터가 완성되는 대로 하나씩 돌려줌.
+
+        :param nicknames: want to search (Iterable[str])
+        :return: (nickname, scouter or None, exception or None) in completion order (Iterator[tuple])
+        """
+        # 중복 nickname 은 한 번만 scout (순서 유지)
+        nicknames = list(dict.fromkeys(nicknames))
+        raw_queue = queue.Queue(maxsize=self._queue_size)
+        in_flight = threading.BoundedSemaphore(self._queue_size)
+        stopped = threading.Event()
+        jobs = {}
+        fetched = {}
+        fetchers = ThreadPoolExecutor(max_workers=self._fetch_workers)
+        parsers = ProcessPoolExecutor(max_workers=self._parse_workers, initializer=_init_parse_worker,
+                                      initargs=(htmlparser.get_backend(),))
+        try:
+            fetches = [fetchers.submit(self._fetch, nickname, raw_queue, stopped) for nickname in nicknames]
+            remaining = len(nicknames)
+            while remaining:
+                try:
+                    nickname, item, payload = raw_queue.get(timeout=0.1)
+                except queue.Empty:
+                    self._check_fetchers(fetches, raw_queue)
+                    item = None
+                if item is None:
+                    # queue 가 빈 동안에도 파싱이 끝난 캐릭터는 아래에서 완성
+                    pass
+                elif item is _FETCHED:
+                    fetched[nickname] = payload
+                    remaining -= 1
+                elif item is _FAILED:
+                    jobs.pop(nickname, None)
+                    remaining -= 1
+                    yield nickname, None, payload
+                elif payload is None:
+                    jobs.setdefault(nickname, {})[item] = None
+                else:
+                    in_flight.acquire()
+                    future = parsers.submit(_parse_item_html, payload)
+                    future.add_done_callback(lambda _: in_flight.release())
+                    jobs.setdefault(nickname, {})[item] = future
+                # 파싱이 모두 끝난 캐릭터부터 완성
+                for ready in [nickname for nickname in fetched
+                              if all((future is None) or future.done() for future in jobs.get(nickname, {}).values())]:
+                    yield self._complete(fetched.pop(ready), jobs.pop(ready, {}))
+            for nickname, item_scouter in fetched.items():
+                yield self._complete(item_scouter, jobs.pop(nickname, {}))
+        finally:
+            stopped.set()
+            fetchers.shutdown(wait=True, cancel_futures=True)
+            parsers.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _check_fetchers(fetches: list, raw_queue: queue.Queue):
+        """
+        queue 가 비어 있는 동안 호출. 모든 fetch thread 가 끝났는데 결과를 받지 못한 캐릭터가 남아 있다면
+        (완료나 실패를 알리지 못하고 끝난 경우) 더 기다리지 않고 raise.
+
+        :param fetches: futures of _fetch (list[concurrent.futures.Future])
+        :param raw_queue: bounded queue of (nickname, item, html or None) (queue.Queue)
+        :return: None
+        """
+        if not all(fetch.done() for fetch in fetches) or not raw_queue.empty():
+            return
+        for fetch in fetches:
+            # _fetch 가 잡지 못한 예외 (BaseException) 를 그대로 전달
+            fetch.result()
+        raise RuntimeError("fetch threads finished without reporting every character.")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,207 @@
+from geturl import GetCharacterDetailUrl, url_cache
+import htmlparser
+import parsetag
+import httpclient
+import errors
+import re
+
+
+INTEGER_PATTERN = re.compile(r"\d+")
+
+
+def _to_int(text: str) -> int | None:
+    """
+    '1,234', 'Lv.280' 처럼 숫자 사이에 다른 문자가 섞인 문자열의 숫자만 이어 붙여 int 로 변환
+
+    :param text: text containing digits (str)
+    :return: integer, or None if there is no digit (int or None)
+    """
+    digits = "".join(INTEGER_PATTERN.findall(text))
+    return int(digits) if digits else None
+
+
+class RankingRow:
+    """
+    랭킹 page 의 rank_table 한 row 의 정보.
+
+    rank, nickname, detail_url, job, level, exp, popularity, guild
+
+    :param rank: ranking (int or None)
+    :param nickname: nickname of the character (str)
+    :param detail_url: url of character detail page (str)
+    :param job: job of the character (str)
+    :param level: level of the character (int or None)
+    :param exp: experience of the character (int or None)
+    :param popularity: popularity of the character (int or None)
+    :param guild: guild name, empty if none (str)
+    """
+    __slots__ = ('_rank', '_nickname', '_detail_url', '_job', '_level', '_exp', '_popularity', '_guild')
+
+    def __init__(self, rank: int | None, nickname: str, detail_url: str, job: str, level: int | None,
+                 exp: int | None, popularity: int | None, guild: str):
+        self._rank = rank
+        self._nickname = nickname
+        self._detail_url = detail_url
+        self._job = job
+        self._level = level
+        self._exp = exp
+        self._popularity = popularity
+        self._guild = guild
+
+    def to_dict(self) -> dict:
+        return {attr[1:]: getattr(self, attr) for attr in RankingRow.__slots__}
+
+    def __repr__(self):
+        return f"RankingRow({self._rank}, {self._nickname!r}, Lv.{self._level})"
+
+    @property
+    def rank(self):
+        return self._rank
+
+    @property
+    def nickname(self):
+        return self._nickname
+
+    @property
+    def detail_url(self):
+        return self._detail_url
+
+    @property
+    def job(self):
+        return self._job
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def exp(self):
+        return self._exp
+
+    @property
+    def popularity(self):
+        return self._popularity
+
+    @property
+    def guild(self):
+        return self._guild
+
+
+def parse_ranking_rows(soup) -> list[RankingRow]:
+    """
+    랭킹 page 의 rank_table 에서 모든 row 의 정보를 추출.
+
+    순위, 캐릭터 정보(이름, 직업), 레벨, 경험치, 인기도, 길드 순서의 column 을 가정.
+    캐릭터 정보 page 링크가 없는 row 는 건너뜀.
+    마지막 page 다음의 page 는 row 가 없는 rank_table 이고, rank_table 자체가 없으면 html 변경으로 판단.
+
+    :param soup: parsed ranking page (bs4.BeautifulSoup or htmlparser.SelectolaxNode)
+    :return: rows of the ranking table, empty if the page is past the end (list[RankingRow])
+    """
+    # 점검 안내 page 나 바뀐 html 을 마지막 page 다음의 빈 page 로 오해하지 않도록 확인
+    parsetag.check_maintenance(soup)
+    if soup.select_one("#container div.rank_table_wrap > table.rank_table") is None:
+        raise errors.LayoutChangedError("Cannot find the ranking table. Changed html.")
+    rows = []
+    for tr in soup.select("#container div.rank_table_wrap > table.rank_table > tbody > tr"):
+        link = tr.select_one("td.left > dl > dt > a")
+        if (link is None) or (link.get('href', '') == ''):
+            continue
+        cells = [td.get_text(strip=True) for td in tr.select("td")]
+        cells += [""] * (6 - len(cells))
+        # 1 ~ 3위는 순위가 숫자 대신 이미지로 표시됨
+        rank = _to_int(cells[0])
+        if rank is None:
+            rank_image = tr.select_one("td img")
+            rank = _to_int(rank_image.get('alt', '')) if rank_image is not None else None
+        job = tr.select_one("td.left > dl > dd")
+        rows.append(RankingRow(rank=rank,
+                               nickname=link.get_text(strip=True),
+                               detail_url=GetCharacterDetailUrl.MAIN_URL + link['href'],
+                               job=job.get_text(strip=True) if job is not None else "",
+                               level=_to_int(cells[2]),
+                               exp=_to_int(cells[3]),
+                               popularity=_to_int(cells[4]),
+                               guild=cells[5]))
+    return rows
+
+
+class RankingCrawler:
+    """
+    종합 랭킹 page (/Ranking/World/Total) 를 page 단위로 차례로 요청하여 모든 row 의 정보를 수집.
+
+    수집한 (nickname, 캐릭터 정보 page url) 은 urlcache 에 저장하므로,
+    이후 scout_many(crawler.nicknames(...)) 는 캐릭터마다 랭킹 검색을 하지 않음.
+    (N 명의 url 을 얻는 데 N 번이 아니라 약 N / page 당 row 수 번의 요청)
+
+    :param world: world code of the ranking (w parameter), 0 for every world (int)
+    """
+    RANKING_URL = GetCharacterDetailUrl.RANKING_URL
+
+    def __init__(self, world: int = 0):
+        self._world = world
+
+    def page_url(self, page: int) -> str:
+        """
+        :param page: page number, starting from 1 (int)
+        :return: url of the ranking page (str)
+        """
+        return f"{RankingCrawler.RANKING_URL}?page={page}&w={self._world}"
+
+    def fetch_page(self, page: int) -> list[RankingRow]:
+        """
+        랭킹 page 하나를 요청하여 row 를 추출하고, 캐릭터 정보 page url 을 urlcache 에 저장.
+
+        :param page: page number, starting from 1 (int)
+        :return: rows of the page, empty if the page is past the end (list[RankingRow])
+        """
+        response = httpclient.get(self.page_url(page))
+        response.raise_for_status()
+        rows = parse_ranking_rows(htmlparser.parse(response.text))
+        cache = url_cache()
+        if (cache is not None) and rows:
+            cache.put_detail_urls({row.nickname: row.detail_url for row in rows})
+        return rows
+
+    def crawl(self, start_page: int = 1, pages: int | None = None, max_rows: int | None = None):
+        """
+        start_page 부터 차례로 요청하며 row 를 하나씩 돌려주는 generator.
+        row 가 없는 page 에 이르거나, pages 개의 page 또는 max_rows 개의 row 를 돌려주면 멈춤.
+
+        :param start_page: first page number (int)
+        :param pages: maximum number of pages, unlimited if None (int or None)
+        :param max_rows: maximum number of rows, unlimited if None (int or None)
+        :return: rows of the ranking table (Iterator[RankingRow])
+        """
+        if start_page < 1:
+            raise ValueError(f"start_page : should be positive, but it is {start_page}.")
+        count = 0
+        page = start_page
+        # max_rows 개를 채우면 다음 page 는 요청하지 않음
+        while ((pages is None) or (page < start_page + pages)) and ((max_rows is None) or (count < max_rows)):
+            rows = self.fetch_page(page)
+            if not rows:
+                return
+            for row in rows:
+                yield row
+                count += 1
+                if (max_rows is not None) and (count >= max_rows):
+                    return
+            page += 1
+
+    def nicknames(self, start_page: int = 1, pages: int | None = None, max_rows: int | None = None) -> list[str]:
+        """
+        crawl() 한 캐릭터들의 nickname 목록. scouter.scout_many() 에 그대로 넘김.
+
+        :return: nicknames in ranking order (list[str])
+        """
+        return [row.nickname for row in self.crawl(start_page, pages, max_rows)]
+
+    @property
+    def world(self):
+        return self._world
+
+
+if __name__ == "__main__":
+    for ranking_row in RankingCrawler().crawl(pages=1):
+        print(ranking_row.to_dict())
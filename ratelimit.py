@@ -0,0 +1,353 @@
+from contextlib import contextmanager, asynccontextmanager
+from collections import deque
+from urllib.parse import urlsplit
+from typing import TYPE_CHECKING
+import threading
+import time
+import re
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+# 서버가 요청을 막았다고 판단하는 HTTP status code
+BLOCKED_STATUS_CODES = (403, 429, 503)
+# 200 으로 응답하더라도 본문에 이 문구가 있으면 차단/에러 page 로 판단
+BLOCK_PAGE_MARKERS = tuple(marker.encode() for marker in ("비정상적인 접근", "요청이 너무 많", "잠시 후 다시 이용",
+                                                          "Too Many Requests", "Access Denied", "Request Rejected"))
+# 정상 page 의 본문 영역. 이 영역이 있는 충분히 큰 page 는 (게시글 등에 문구가 있더라도) 차단 page 로 보지 않음
+CONTAINER_PATTERN = re.compile(rb"""id\s*=\s*["']?container\b""")
+# 이보다 작은 본문은 #container 가 있더라도 문구를 확인
+BLOCK_PAGE_MAX_BYTES = 4096
+
+
+class TokenBucket:
+    """
+    초당 rate 개씩 token 이 채워지고, 최대 capacity 개까지 쌓이는 token bucket.
+    요청 한 번에 token 하나를 사용하며, token 이 없으면 채워질 때까지 대기.
+
+    :param rate: tokens refilled per second (float)
+    :param capacity: maximum number of tokens (burst size) (float)
+    """
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _try_take(self) -> float:
+        """
+        :return: 0 if a token is taken, otherwise seconds to wait for the next token (float)
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._rate
+
+    def take(self):
+        """
+        token 하나를 사용. token 이 없으면 하나가 채워질 때까지 sleep.
+
+        :return: None
+        """
+        while (wait := self._try_take()) > 0:
+            time.sleep(wait)
+
+    async def take_async(self):
+        """
+        take() 의 asyncio 버전. token 이 없으면 event loop 를 막지 않고 기다림.
+
+        :return: None
+        """
+        import asyncio
+        while (wait := self._try_take()) > 0:
+            await asyncio.sleep(wait)
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self._rate = rate
+
+
+class AdaptiveLimiter:
+    """
+    한 host 로 보내는 모든 요청(requests.get, 브라우저 page 이동 및 클릭)이 거쳐가는 limiter.
+
+    token bucket 으로 초당 요청 수를, AIMD 방식의 window 로 동시 요청 수를 제한.
+    - 요청이 정상적으로 끝나면 window 와 rate 를 조금씩 늘려 한도를 탐색 (additive increase)
+    - 응답 시간이 평소(EWMA)의 latency_tolerance 배를 넘거나, 차단/에러 응답을 받으면
+      window 와 rate 를 decrease_factor 배로 줄임 (multiplicative decrease)
+
+    줄이는 것은 cooldown 초에 한 번만 하여, 동시에 실패한 요청들 때문에 한꺼번에 너무 많이 줄지 않도록 함.
+
+    thread 에서는 acquire(), asyncio 에서는 acquire_async() 를 사용하며 둘은 같은 window 와 rate 를 공유.
+
+    :param rate: initial requests per second (float)
+    :param concurrency: initial number of concurrent requests (float)
+    :param min_rate: lower bound of rate (float)
+    :param max_rate: upper bound of rate (float)
+    :param max_concurrency: upper bound of concurrent requests (int)
+    :param decrease_factor: multiplier applied on congestion (float)
+    :param rate_step: rate added per successful request window (float)
+    :param latency_tolerance: congestion if latency > baseline * latency_tolerance (float)
+    :param cooldown: minimum seconds between two decreases (float)
+    """
+    def __init__(self, rate: float = 2.0, concurrency: float = 2.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 max_concurrency: int = 16, decrease_factor: float = 0.5, rate_step: float = 0.1,
+                 latency_tolerance: float = 2.0, cooldown: float = 5.0):
+        self._bucket = TokenBucket(rate, capacity=max(1.0, rate))
+        self._window = concurrency
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._max_concurrency = max_concurrency
+        self._decrease_factor = decrease_factor
+        self._rate_step = rate_step
+        self._latency_tolerance = latency_tolerance
+        self._cooldown = cooldown
+        self._baseline_latency = None
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        # acquire_async() 로 window 에 자리가 나기를 기다리는 (event loop, future)
+        self._async_waiters = deque()
+
+    def acquire(self):
+        """
+        동시 요청 window 에 자리가 날 때까지, 그리고 token 을 얻을 때까지 대기.
+
+        :return: None
+        """
+        with self._condition:
+            while self._in_flight >= max(1, int(self._window)):
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            self._bucket.take()
+        except BaseException:
+            self._abandon()
+            raise
+
+    async def acquire_async(self):
+        """
+        acquire() 의 asyncio 버전. 동시 요청 window 에 자리가 날 때까지, 그리고 token 을 얻을 때까지 대기.
+
+        :return: None
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._in_flight < max(1, int(self._window)):
+                    self._in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        # 이미 깨워진 뒤에 취소되었다면 다른 waiter 에게 자리를 넘김
+                        self._wake_async_waiters()
+                raise
+        try:
+            await self._bucket.take_async()
+        except BaseException:
+            self._abandon()
+            raise
+
+    def _abandon(self):
+        # window 의 자리를 얻었지만 token 을 기다리다 중단(KeyboardInterrupt, 취소) 된 경우 자리만 돌려줌
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+    def _wake_async_waiters(self):
+        # self._condition 을 잡은 상태에서 호출. window 의 빈 자리 수만큼 async waiter 를 깨움
+        available = max(1, int(self._window)) - self._in_flight
+        while (available > 0) and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, waiter)
+            except RuntimeError:
+                # 이미 닫힌 event loop
+                continue
+            available -= 1
+
+    def release(self, latency: float, congested: bool = False):
+        """
+        요청 완료를 알리고 그 결과에 따라 window 와 rate 를 조정.
+
+        :param latency: elapsed seconds of the request (float)
+        :param congested: whether blocked, error or failed response (bool)
+        :return: None
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if self._baseline_latency is None:
+                self._baseline_latency = latency
+            slow = latency > self._baseline_latency * self._latency_tolerance
+            if congested or slow:
+                self._decrease()
+            else:
+                self._increase()
+                # 정상 응답만 baseline 에 반영 (EWMA)
+                self._baseline_latency = 0.9 * self._baseline_latency + 0.1 * latency
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self._cooldown:
+            return
+        self._last_decrease = now
+        self._window = max(1.0, self._window * self._decrease_factor)
+        self._bucket.rate = max(self._min_rate, self._bucket.rate * self._decrease_factor)
+
+    def _increase(self):
+        # window 하나 분량의 요청이 성공할 때마다 window 는 1, rate 는 rate_step 만큼 증가
+        self._window = min(float(self._max_concurrency), self._window + 1 / self._window)
+        self._bucket.rate = min(self._max_rate, self._bucket.rate + self._rate_step / self._window)
+
+    @property
+    def rate(self):
+        return self._bucket.rate
+
+    @property
+    def concurrency(self):
+        return int(self._window)
+
+
+def _resolve_waiter(waiter: "asyncio.Future"):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Slot:
+    """
+    throttle() 로 얻은 요청 한 건. observe() 로 응답을 넘기면 차단 여부를 판단하여 limiter 에 반영.
+    """
+    def __init__(self):
+        self.congested = False
+
+    def observe(self, response):
+        """
+        :param response: response of the request (requests.Response or aiohttp.ClientResponse)
+        :return: the same response (requests.Response or aiohttp.ClientResponse)
+        """
+        status_code = response.status_code if hasattr(response, 'status_code') else response.status
+        if status_code in BLOCKED_STATUS_CODES or status_code >= 500:
+            self.congested = True
+        return response
+
+    def mark_congested(self):
+        self.congested = True
+
+
+def is_block_page(content: bytes) -> bool:
+    """
+    200 으로 응답한 차단/에러 page 인지 확인 (status code 만으로는 알 수 없는 경우).
+
+    #container 가 없거나 BLOCK_PAGE_MAX_BYTES 보다 작은 본문에서만 BLOCK_PAGE_MARKERS 를 찾음.
+    (정상 page 의 본문에 우연히 같은 문구가 있어도 속도를 줄이지 않도록)
+
+    :param content: response body (bytes)
+    :return: whether the body is a block page containing one of BLOCK_PAGE_MARKERS (bool)
+    """
+    if (len(content) >= BLOCK_PAGE_MAX_BYTES) and (CONTAINER_PATTERN.search(content) is not None):
+        return False
+    return any(marker in content for marker in BLOCK_PAGE_MARKERS)
+
+
+_defaults = {}
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def configure(**limiter_kwargs):
+    """
+    이후 새로 만들어지는 host 별 limiter 의 설정을 변경 (AdaptiveLimiter 의 parameter 와 동일).
+    이미 만들어진 limiter 는 초기화하여 새 설정으로 다시 만들어지도록 함.
+
+    :param limiter_kwargs: keyword arguments of AdaptiveLimiter
+    :return: None
+    """
+    with _limiters_lock:
+        _defaults.clear()
+        _defaults.update(limiter_kwargs)
+        _limiters.clear()
+
+
+def get_limiter(url: str) -> AdaptiveLimiter:
+    """
+    url 의 host 에 해당하는 공용 limiter. 같은 host 로의 요청은 모듈 전체에서 하나의 limiter 를 공유.
+
+    :param url: requested url (str)
+    :return: limiter of the host (AdaptiveLimiter)
+    """
+    host = urlsplit(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveLimiter(**_defaults)
+        return _limiters[host]
+
+
+@contextmanager
+def throttle(url: str):
+    """
+    with throttle(url) as slot: 블록 안에서 요청을 보내도록 하여, host 별 limiter 를 거치게 함.
+
+    블록 안에서 예외가 발생하거나 slot.observe(response) 가 차단/에러 응답을 확인하면 속도를 줄임.
+    200 으로 응답한 차단 page 는 is_block_page() 로 확인하여 slot.mark_congested() 를 호출.
+
+    :param url: requested url (str)
+    :return: slot of the request (_Slot)
+    """
+    limiter = get_limiter(url)
+    limiter.acquire()
+    slot = _Slot()
+    start = time.monotonic()
+    try:
+        yield slot
+    except BaseException:
+        slot.mark_congested()
+        raise
+    finally:
+        limiter.release(time.monotonic() - start, slot.congested)
+
+
+@asynccontextmanager
+async def athrottle(url: str):
+    """
+    throttle() 의 asyncio 버전. async with athrottle(url) as slot: 블록 안에서 요청을 보냄.
+
+    :param url: requested url (str)
+    :return: slot of the request (_Slot)
+    """
+    limiter = get_limiter(url)
+    await limiter.acquire_async()
+    slot = _Slot()
+    start = time.monotonic()
+    try:
+        yield slot
+    except BaseException:
+        slot.mark_congested()
+        raise
+    finally:
+        limiter.release(time.monotonic() - start, slot.congested)
@@ -0,0 +1,146 @@
+from contextlib import closing
+from pathlib import Path
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+import gzip
+
+
+MODES = ('off', 'record', 'replay')
+
+
+class RawHtmlCache:
+    """
+    요청한 page 와 장비 정보 Tag 의 원본 html 을 압축하여 저장하는 content-addressed cache.
+
+    - 내용은 root/objects/ab/abcdef....gz 에 sha256 으로 저장되므로 같은 내용은 한 번만 저장됨
+    - root/index.sqlite3 에 (key, timestamp) -> sha256, status, headers 를 기록
+      key 는 요청한 url, 장비 정보 Tag 는 '장비 정보 page url#부위' (item_key())
+
+    record 모드에서 저장한 내용으로, replay 모드에서 네트워크와 브라우저 없이
+    ItemScouter -> TrimmedInformation -> SummaryInformation 전 과정을 다시 실행할 수 있음.
+
+    :param root: root directory of the cache (str or Path)
+    """
+    def __init__(self, root):
+        self._root = Path(root)
+        (self._root / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS entry ("
+                         "key TEXT, timestamp REAL, digest TEXT, status INTEGER, headers TEXT, encoding TEXT)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entry_key ON entry (key, timestamp)")
+
+    def _connect(self):
+        return closing(sqlite3.connect(self._root / "index.sqlite3", timeout=30))
+
+    def _object_path(self, digest: str) -> Path:
+        return self._root / "objects" / digest[:2] / f"{digest}.gz"
+
+    @staticmethod
+    def item_key(equipment_url: str, slot: str | int) -> str:
+        """
+        :param equipment_url: url of equipment detail page (str)
+        :param slot: category or number of the item pot (str or int)
+        :return: key of the equipment information Tag (str)
+        """
+        return f"{equipment_url}#{slot}"
+
+    def put(self, key: str, content: bytes, status: int = 200, headers: dict | None = None,
+            encoding: str | None = None, timestamp: float | None = None) -> str:
+        """
+        :param key: url or item_key() (str)
+        :param content: raw content (bytes)
+        :param status: HTTP status code (int)
+        :param headers: response headers (dict or None)
+        :param encoding: text encoding of the content (str or None)
+        :param timestamp: fetched time, now if None (float or None)
+        :return: sha256 of the content (str)
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+            temporary.write_bytes(gzip.compress(content))
+            temporary.replace(path)
+        with self._lock, self._connect() as conn, conn:
+            conn.execute("INSERT INTO entry VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, time.time() if timestamp is None else timestamp, digest, status,
+                          json.dumps(dict(headers or {})), encoding))
+        return digest
+
+    def get(self, key: str, at: float | None = None) -> dict | None:
+        """
+        key 의 가장 최근 (at 이 주어지면 at 이전의 가장 최근) 기록
+
+        :param key: url or item_key() (str)
+        :param at: latest timestamp to replay, newest if None (float or None)
+        :return: {'content', 'status', 'headers', 'encoding', 'timestamp'} or None if missing (dict or None)
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT digest, status, headers, encoding, timestamp FROM entry "
+                               "WHERE key = ? AND timestamp <= ? ORDER BY timestamp DESC LIMIT 1",
+                               (key, float('inf') if at is None else at)).fetchone()
+        if row is None:
+            return None
+        content = gzip.decompress(self._object_path(row[0]).read_bytes())
+        return {'content': content, 'status': row[1], 'headers': json.loads(row[2]), 'encoding': row[3],
+                'timestamp': row[4]}
+
+    @property
+    def root(self):
+        return self._root
+
+
+_cache = None
+_mode = 'off'
+_at = None
+_cache_lock = threading.Lock()
+
+
+def configure(root=None, mode: str = 'off', at: float | None = None):
+    """
+    httpclient 와 ItemScouter 가 사용하는 공용 cache 설정.
+
+    - 'off' : 사용하지 않음
+    - 'record' : 실제로 요청하면서 모든 응답과 장비 정보 Tag 를 저장
+    - 'replay' : 요청하지 않고 저장된 내용만 사용 (없으면 raise RuntimeError)
+
+    :param root: root directory of the cache (str or Path or None)
+    :param mode: one of MODES (str)
+    :param at: replay the newest records before this timestamp, newest if None (float or None)
+    :return: None
+    """
+    global _cache, _mode, _at
+    if mode not in MODES:
+        raise ValueError(f"mode : should be one of {MODES}, but it is {mode!r}.")
+    if (mode != 'off') and (root is None):
+        raise ValueError(f"root : required for {mode!r} mode.")
+    with _cache_lock:
+        _cache = RawHtmlCache(root) if mode != 'off' else None
+        _mode = mode
+        _at = at
+
+
+def get_mode() -> str:
+    return _mode
+
+
+def get_cache() -> RawHtmlCache | None:
+    return _cache
+
+
+def replay(key: str) -> dict:
+    """
+    replay 모드에서 key 의 기록을 가져옴.
+
+    :param key: url or item_key() (str)
+    :return: record of RawHtmlCache.get() (dict)
+    """
+    record = _cache.get(key, _at)
+    if record is None:
+        raise RuntimeError(f"replay : {key} 의 기록이 없음.")
+    return record
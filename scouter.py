@@ -1,103 +1,297 @@
 import geturl
 import parsetag
+import errors
 import equipment
+import browserpool
+import urlcache
+import rawcache
+import metrics
 from parsetag import EQUIPMENT_INDEX
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from typing import TYPE_CHECKING
+from array import array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# PandasScouter 의 stat column 이름. equipment.StatVector 의 배치 순서와 같음.
+STAT_COLUMNS = [column for name in equipment.STAT_NAMES for column in (name.upper(), name.upper() + '(%)')]
 
 
 class ItemScouter:
-    def __init__(self, nickname: str, background: bool = False, progress_notification: bool = False):
+    EXTRACTORS = ('http', 'selenium')
+
+    def __init__(self, nickname: str, background: bool = False, progress_notification: bool = False,
+                 extractor: str = 'http', browser_pool: browserpool.BrowserPool = None,
+                 previous: "ItemScouter" = None):
         """
         검색하고자 하는 캐릭터 이름을 검색하여
         해당 캐릭터가 장착하고 있는 장비 아이템의 정보를 두가지 버전으로 저장.
 
+        extractor='http' 인 경우 브라우저 없이 HTTP 요청만으로 장비 정보를 추출하고,
+        실패한 장비에 한해서만 selenium 브라우저를 띄워 추출.
+
+        selenium 브라우저는 직접 띄우지 않고 browser_pool 에서 빌려 씀.
+        browser_pool 을 지정하지 않으면 background 옵션 별 공용 pool (browserpool.shared_pool) 을 사용.
+
+        previous (같은 캐릭터를 이전에 scout 한 결과) 가 주어지면 incremental 모드로 동작.
+        장비 정보 page 를 조건부 요청하여 바뀌지 않았다면 이전 결과를 그대로 사용하고,
+        바뀌었다면 item pot 의 fingerprint 가 달라진 부위만 다시 추출.
+
+        각 단계의 소요 시간과 요청 수 등은 metrics 에 기록되며,
+        progress_notification 옵션은 이 캐릭터의 event 를 출력하는 hook (metrics.ProgressPrinter) 을 등록.
+
         :param nickname: want to search (str)
         :param background: selenium browser background run or not option (bool)
         :param progress_notification: print progress option (bool)
+        :param extractor: equipment information extractor, 'http' or 'selenium' (str)
+        :param browser_pool: pool to borrow selenium browsers from (browserpool.BrowserPool or None)
+        :param previous: last scouted result of the same character (ItemScouter or None)
+        """
+        self._configure(nickname, background, extractor, browser_pool, previous)
+        progress_printer = metrics.ProgressPrinter(nickname) if progress_notification else None
+        if progress_printer is not None:
+            metrics.add_hook(progress_printer)
+        try:
+            self._finish(self._scout())
+        finally:
+            if progress_printer is not None:
+                metrics.remove_hook(progress_printer)
+
+    def _configure(self, nickname: str, background: bool, extractor: str, browser_pool: browserpool.BrowserPool,
+                   previous: "ItemScouter"):
         """
-        self._equipments_info_dict = self._scout(nickname, background, progress_notification)
-        self._summary_info_dict = self._summarize(progress_notification)
+        scout 하기 전의 설정. (parameter 는 __init__ 과 동일)
+        """
+        if extractor not in ItemScouter.EXTRACTORS:
+            raise ValueError(f"extractor : should be one of {ItemScouter.EXTRACTORS}, but it is {extractor!r}.")
+        if (previous is not None) and (previous.nickname != nickname):
+            raise ValueError(f"previous : should be a result of {nickname}, but it is of {previous.nickname}.")
+        self._nickname = nickname
+        self._background = background
+        self._extractor = extractor
+        if browser_pool is None:
+            browser_pool = browserpool.shared_pool(background)
+        self._browser_pool = browser_pool
+        self._previous = previous
+        self._validators = {}
+        self._fingerprints = {}
+        self._parsed_summaries = {}
+
+    @classmethod
+    def _deferred(cls, nickname: str, background: bool = False, progress_notification: bool = False,
+                  extractor: str = 'http', browser_pool: browserpool.BrowserPool = None,
+                  previous: "ItemScouter" = None) -> "ItemScouter":
+        """
+        설정만 하고 scout 은 하지 않은 객체. (parameter 는 __init__ 과 동일)
+        _iter_item_tags() 로 장비 정보 Tag 를 얻고, 파싱은 따로 한 뒤 _finish() 로 완성.
+        (pipeline.ScoutPipeline 에서 사용)
+
+        :return: configured but not scouted object (same class as cls)
+        """
+        item_scouter = cls.__new__(cls)
+        item_scouter._configure(nickname, background, extractor, browser_pool, previous)
+        return item_scouter
+
+    def _finish(self, parsed: dict):
+        """
+        파싱 결과로 장비 정보와 요약 정보를 저장.
+
+        :param parsed: (TrimmedInformation, SummaryInformation) of each item, or None to reuse the previous one
+                       (dict[str, tuple or None])
+        :return: None
+        """
+        previous = self._previous
+        self._equipments_info_dict = {}
+        for item, records in parsed.items():
+            if records is None:
+                self._equipments_info_dict[item] = previous.equipments_info_dict[item]
+            else:
+                self._equipments_info_dict[item], self._parsed_summaries[item] = records
+        self._summary_info_dict = self._summarize()
+        # 이전 결과는 비교에만 필요하므로 참조를 끊어 메모리에 계속 쌓이지 않도록 함
+        self._previous = None
+        self._parsed_summaries = {}
 
     @staticmethod
-    def _equip_or_not_dict(equipment_url: str):
+    def _equip_or_not_dict(equipment_page: parsetag.EquipmentPage):
         """
         총 25종의 장비 아이템(모자 ~ 기계심장) 중 착용하고 있는 장비 아이템의 목록을 dictionary 로 저장
 
-        :param equipment_url: url of equipment detail page (str)
+        :param equipment_page: snapshot of equipment detail page (parsetag.EquipmentPage)
         :return: dictionary of equipped category (dict[str, int])
         """
         # shallow copy : no problem (Since key : str, value: int)
         i_equip_dict = EQUIPMENT_INDEX.copy()
-        html = requests.get(equipment_url)
-        soup = BeautifulSoup(html.content, 'html.parser')
+        soup = equipment_page.soup
         for key, value in EQUIPMENT_INDEX.items():
             item_pot = soup.select_one(f"#container ul.item_pot > li:nth-child({value}) a")
-            item_pot_link = item_pot["href"]
+            if item_pot is None:
+                raise errors.LayoutChangedError(f"item pot {value} : 찾을 수 없음. Changed html.")
+            item_pot_link = item_pot.get("href", "")
             # 해당 아이템을 착용하지 않은 경우
             if item_pot_link == "":
                 i_equip_dict.pop(key)
         return i_equip_dict
 
-    def _scout(self, nickname: str, background: bool, progress_notification: bool)\
-            -> dict[str, equipment.TrimmedInformation]:
+    def _accept_page(self, equipment_page: parsetag.EquipmentPage) -> dict[str, int] | None:
         """
-        해당 nickname 의 캐릭터가 현재 착용하고 있는 장비 아이템에 한해,
-        그 아이템의 정보를 dictionary 로 저장.
+        장비 정보 page snapshot 의 validators, fingerprints 를 저장하고,
+        점검/비공개 여부를 확인한 뒤 착용 중인 장비 아이템의 목록을 반환.
 
-        :param nickname: want to search (str)
-        :param background: selenium browser background run or not option (bool)
-        :param progress_notification: print progress option (bool)
-        :return: information of equipments (dict[str, equipment.TrimmedInformation])
+        :param equipment_page: snapshot of equipment detail page (parsetag.EquipmentPage)
+        :return: dictionary of equipped category, or None if not modified since previous (dict[str, int] or None)
         """
-        # 캐릭터정보 > 장비탭 url get
-        equipment_url = geturl.GetDetailEquipmentUrl(nickname).equipment_url
-        if progress_notification:
-            print("<<< Get equipment detail url : Done >>>")
-            print()
+        nickname = self._nickname
+        # 이전 scout 이후 page 가 바뀌지 않았다면 (304 Not Modified) 이전 결과를 그대로 사용
+        if equipment_page.not_modified:
+            self._validators = self._previous.validators
+            self._fingerprints = self._previous.fingerprints
+            metrics.event('not_modified', nickname=nickname)
+            return None
+        self._validators = equipment_page.validators
 
         # 점검 중 여부 확인
-        parsetag.is_available(equipment_url)
-        if progress_notification:
-            print("<<< Check maintenance : Done >>>")
-            print()
+        with metrics.timer('availability_check', nickname=nickname):
+            parsetag.is_available(equipment_page)
 
         # 착용 중인(정보를 추출할) 아이템만 골라서 dictionary 만들기
-        i_equip_dict = self._equip_or_not_dict(equipment_url)
-        if progress_notification:
-            print("<<< Specify equipments to extract the information : Done >>>")
-            print()
+        with metrics.timer('slot_detection', nickname=nickname):
+            i_equip_dict = self._equip_or_not_dict(equipment_page)
+            self._fingerprints = equipment_page.slot_fingerprints()
+        return i_equip_dict
 
-        equipments_info_dict = {}
-        # selenium 가동
-        open_browser = parsetag.BrowserForEquipmentTag(equipment_url, background)
-        for item in i_equip_dict.keys():
-            item_info_tag = open_browser.get_equipment_info_tag(item)
-            item_information = equipment.TrimmedInformation(item_info_tag)
-            equipments_info_dict[item] = item_information
-            if progress_notification:
-                print(f"<<< Save the information of {item} : Done >>>")
-        if progress_notification:
-            print()
-        open_browser.quit_browser()
-        return equipments_info_dict
+    def _iter_item_tags(self):
+        """
+        해당 nickname 의 캐릭터가 현재 착용하고 있는 장비 아이템에 한해,
+        그 아이템의 정보 Tag 를 하나씩 추출 (파싱은 하지 않음).
+
+        incremental 모드에서 이전 정보를 그대로 사용할 수 있는 부위는 Tag 대신 None.
+
+        :return: (category, Tag of information about the equipment or None) (Iterator[tuple])
+        """
+        import requests
+        nickname = self._nickname
+        # 캐릭터정보 > 장비탭 url get
+        with metrics.timer('url_resolution', nickname=nickname):
+            resolved = geturl.GetDetailEquipmentUrl(nickname)
+
+        # 장비 정보 page 는 한 번만 요청하고, 이후 단계는 모두 이 snapshot 을 공유
+        previous = self._previous
+        validators = previous.validators if previous is not None else None
+        with metrics.timer('equipment_page', nickname=nickname):
+            equipment_page = parsetag.EquipmentPage(resolved.equipment_url, validators)
+        # cache 에 있던 url 이 에러를 돌려주면 cache 를 무시하고 url 을 다시 찾음
+        if resolved.from_cache and not equipment_page.ok:
+            urlcache.get_cache().invalidate(nickname)
+            with metrics.timer('url_resolution', nickname=nickname):
+                resolved = geturl.GetDetailEquipmentUrl(nickname, use_cache=False)
+            with metrics.timer('equipment_page', nickname=nickname):
+                equipment_page = parsetag.EquipmentPage(resolved.equipment_url, validators)
+        equipment_url = resolved.equipment_url
+
+        i_equip_dict = self._accept_page(equipment_page)
+        if i_equip_dict is None:
+            for item in previous.equipments_info_dict.keys():
+                yield item, None
+            return
+
+        # replay 모드에서는 저장해둔 장비 정보 Tag 만 사용하고 브라우저는 띄우지 않음
+        replaying = rawcache.get_mode() == 'replay'
+        tag_extractor = None
+        if replaying:
+            tag_extractor = parsetag.ReplayEquipmentTag(equipment_page)
+        elif self._extractor == 'http':
+            tag_extractor = parsetag.HttpEquipmentTag(equipment_page)
+        # selenium 은 필요할 때만 가동
+        open_browser = None
+        try:
+            for item in i_equip_dict.keys():
+                # incremental 모드 : item pot 이 그대로인 부위는 이전 정보를 재사용
+                if self._is_unchanged(item):
+                    metrics.event('slot_reused', nickname=nickname, slot=item)
+                    yield item, None
+                    continue
+                item_info_tag = None
+                if tag_extractor is not None:
+                    try:
+                        with metrics.timer('slot_extract', nickname=nickname, slot=item, extractor='http'):
+                            item_info_tag = tag_extractor.get_equipment_info_tag(item)
+                    except (RuntimeError, requests.RequestException):
+                        if replaying:
+                            raise
+                        metrics.count('http_fallbacks')
+                        metrics.event('http_fallback', nickname=nickname, slot=item)
+                if item_info_tag is None:
+                    if open_browser is None:
+                        with metrics.timer('browser_startup', nickname=nickname):
+                            open_browser = parsetag.BrowserForEquipmentTag(equipment_url, self._background,
+                                                                           self._browser_pool)
+                    with metrics.timer('slot_extract', nickname=nickname, slot=item, extractor='selenium'):
+                        item_info_tag = open_browser.get_equipment_info_tag(item)
+                if rawcache.get_mode() == 'record':
+                    rawcache.get_cache().put(rawcache.RawHtmlCache.item_key(equipment_url, item),
+                                             str(item_info_tag).encode())
+                yield item, item_info_tag
+        finally:
+            # pool 에서 빌린 브라우저는 예외가 발생하거나 중간에 멈추더라도 반드시 반납
+            if open_browser is not None:
+                open_browser.quit_browser()
+
+    def _scout(self) -> dict:
+        """
+        _iter_item_tags() 로 추출한 장비 정보 Tag 를 차례로 파싱.
+
+        :return: (TrimmedInformation, SummaryInformation) of each item, or None to reuse the previous one
+                 (dict[str, tuple or None])
+        """
+        parsed = {}
+        # 파싱 중 예외가 발생해도 빌린 브라우저를 바로 반납하도록 generator 를 닫음
+        with closing(self._iter_item_tags()) as item_tags:
+            for item, item_info_tag in item_tags:
+                if item_info_tag is None:
+                    parsed[item] = None
+                    continue
+                # 다른 캐릭터와 똑같은 아이템이라면 memo 의 파싱 결과를 재사용
+                parsed[item] = equipment.get_item_memo().parse(item_info_tag)
+                metrics.event('slot_parsed', nickname=self._nickname, slot=item)
+        metrics.event('slots_parsed', nickname=self._nickname)
+        return parsed
+
+    def _is_unchanged(self, item: str) -> bool:
+        """
+        incremental 모드에서 해당 부위의 item pot fingerprint 가 이전 scout 때와 같은지 확인
+
+        :param item: category of the equipment (EQUIPMENT_INDEX) (str)
+        :return: whether the previous information can be reused or not (bool)
+        """
+        previous = self._previous
+        if (previous is None) or (item not in previous.equipments_info_dict):
+            return False
+        return previous.fingerprints.get(item) == self._fingerprints.get(item)
 
-    def _summarize(self, progress_notification: bool) -> dict[str, equipment.SummaryInformation]:
+    def _summarize(self) -> dict[str, equipment.SummaryInformation]:
         """
         _scout() method 로 얻은 착용 장비 아이템 정보를 요약하여 저장
 
-        :param progress_notification: print progress option (bool)
         :return: summarized information of the equipments (dict[str, equipment.SummaryInformation])
         """
         summary_info_dict = {}
+        previous = self._previous
         for category, info in self._equipments_info_dict.items():
-            summary_info = equipment.SummaryInformation(info)
+            # 이전 scout 에서 재사용한 장비는 요약 정보도 재사용
+            if (previous is not None) and (previous.equipments_info_dict.get(category) is info):
+                summary_info_dict[category] = previous.summary_info_dict[category]
+                continue
+            # _scout() 에서 memo 로 함께 얻은 요약 정보
+            summary_info = self._parsed_summaries.get(category)
+            if summary_info is None:
+                summary_info = equipment.SummaryInformation(info)
             summary_info_dict[category] = summary_info
-            if progress_notification:
-                print(f"<<< Summary the information of {category} : Done >>>")
-        if progress_notification:
-            print()
+            metrics.event('slot_summarized', nickname=self._nickname, slot=category)
+        metrics.event('summarized', nickname=self._nickname)
         return summary_info_dict
 
     def print_all(self, option_summary: bool = True):
@@ -111,6 +305,28 @@ class ItemScouter:
             information.print_all_attribute()
             print()
 
+    def refresh(self, progress_notification: bool = False) -> "ItemScouter":
+        """
+        같은 설정으로 다시 scout 하되, 이 결과를 previous 로 넘겨 바뀐 장비만 다시 추출 (incremental 모드).
+
+        :param progress_notification: print progress option (bool)
+        :return: refreshed result (same class as self)
+        """
+        return type(self)(self._nickname, self._background, progress_notification, self._extractor,
+                          self._browser_pool, previous=self)
+
+    @property
+    def nickname(self):
+        return self._nickname
+
+    @property
+    def validators(self):
+        return self._validators
+
+    @property
+    def fingerprints(self):
+        return self._fingerprints
+
     @property
     def equipments_info_dict(self):
         return self._equipments_info_dict
@@ -120,72 +336,119 @@ class ItemScouter:
         return self._summary_info_dict
 
 
+def iter_equipments(nickname: str, background: bool = False, extractor: str = 'http',
+                    browser_pool: browserpool.BrowserPool = None, previous: ItemScouter = None):
+    """
+    ItemScouter 와 같은 과정으로 scout 하되, 모든 장비를 모을 때까지 기다리지 않고
+    장비 아이템 하나의 정보가 파싱되는 즉시 (부위, 장비 정보, 요약 정보) 를 돌려주는 generator.
+
+    필요한 부위만 얻고 멈추면 나머지 부위는 요청하지 않음 (빌린 브라우저도 그때 반납).
+    previous 가 주어지면 ItemScouter 와 같이 바뀌지 않은 부위는 이전 정보를 그대로 돌려줌.
+
+    :param nickname: want to search (str)
+    :param background: selenium browser background run or not option (bool)
+    :param extractor: equipment information extractor, 'http' or 'selenium' (str)
+    :param browser_pool: pool to borrow selenium browsers from (browserpool.BrowserPool or None)
+    :param previous: last scouted result of the same character (ItemScouter or None)
+    :return: (category, TrimmedInformation, SummaryInformation) of each equipment (Iterator[tuple])
+    """
+    item_scouter = ItemScouter._deferred(nickname, background, False, extractor, browser_pool, previous)
+    # 이 generator 가 닫히거나 파싱 중 예외가 발생하면 GC 를 기다리지 않고 바로 추출을 멈추고 브라우저를 반납
+    with closing(item_scouter._iter_item_tags()) as item_tags:
+        for item, item_info_tag in item_tags:
+            if item_info_tag is None:
+                yield item, previous.equipments_info_dict[item], previous.summary_info_dict[item]
+                continue
+            item_information, summary_info = equipment.get_item_memo().parse(item_info_tag)
+            yield item, item_information, summary_info
+
+
+async def aiter_equipments(nickname: str, background: bool = False, extractor: str = 'http',
+                           browser_pool: browserpool.BrowserPool = None, previous: ItemScouter = None):
+    """
+    iter_equipments() 의 async iterator 버전. (parameter 와 돌려주는 값은 iter_equipments() 와 동일)
+
+    요청과 파싱은 thread 에서 실행하므로 event loop 를 막지 않음.
+
+        async for category, information, summary_info in aiter_equipments(nickname):
+            ...
+    """
+    import asyncio
+    equipments = iter_equipments(nickname, background, extractor, browser_pool, previous)
+    finished = object()
+    try:
+        while True:
+            equipped = await asyncio.to_thread(next, equipments, finished)
+            if equipped is finished:
+                return
+            yield equipped
+    finally:
+        # 중간에 멈춘 경우에도 빌린 브라우저를 반납하도록 generator 를 닫음
+        await asyncio.to_thread(equipments.close)
+
+
 class PandasScouter(ItemScouter):
-    def __init__(self, nickname: str, background: bool = False, progress_notification: bool = False):
+    def __init__(self, nickname: str, background: bool = False, progress_notification: bool = False,
+                 extractor: str = 'http', browser_pool: browserpool.BrowserPool = None,
+                 previous: ItemScouter = None):
         """
         ItemScouter 클래스를 상속받아 기능추가.
 
-        모든 아이템 정보를 하나의 pandas dataframe 으로 저장.
+        모든 아이템 정보를 하나의 pandas dataframe 으로 저장. (pandas 는 이 클래스를 사용할 때 import)
 
         :param nickname: want to search (str)
         :param background: selenium browser background run or not option (bool)
         :param progress_notification: print progress option (bool)
+        :param extractor: equipment information extractor, 'http' or 'selenium' (str)
+        :param browser_pool: pool to borrow selenium browsers from (browserpool.BrowserPool or None)
+        :param previous: last scouted result of the same character (ItemScouter or None)
         """
-        super().__init__(nickname, background, progress_notification)
+        super().__init__(nickname, background, progress_notification, extractor, browser_pool, previous)
+
+    def _finish(self, parsed: dict):
+        super()._finish(parsed)
+        self._total_stat = self._sum_stat_vectors()
         self._summary_info_pandas = self._convert_summary_info_dict_to_df()
-        self._total_stat = self._summary_info_pandas.iloc[:-1, 2:].sum(axis=0)
         self._summary_info_without_zero_columns = self._drop_zero_column(self._summary_info_pandas)
 
-    @staticmethod
-    def _summary_info_to_dict(summary_info: equipment.SummaryInformation):
+    def _sum_stat_vectors(self) -> "pd.Series":
         """
-        pandas DataFrame 의 각 row 가 되도록 dictionary 로 변환.
-
-        단독으로 쓰이지 않고 아래 _convert_summary_info_dict_to_df() 안에서 호출.
+        모든 아이템의 StatVector 를 더하여 option 수치의 합계를 계산
 
-        :param summary_info: summarized information of the target equipment (equipment.SummaryInformation)
-        :return: dictionarized information (dict)
+        :return: total stat of every column (pandas.Series)
         """
-        dictionary = {}
-        for attr, value in summary_info.__dict__.items():
-            if type(value) == str:
-                dictionary[attr[1:].upper()] = value
-            elif type(value) == tuple:
-                dictionary[attr[1:].upper()] = value[0]
-                dictionary[attr[1:].upper()+'(%)'] = value[1]
-            else:
-                pass
-        return dictionary
+        import pandas as pd
+        total = equipment.StatVector()
+        for summary_info in super().summary_info_dict.values():
+            total += summary_info.stats
+        return pd.Series(list(total.values), index=STAT_COLUMNS)
 
     def _convert_summary_info_dict_to_df(self):
         """
-        아이템 정보를 하나의 pandas DataFrame 으로 저장.
+        아이템 정보를 하나의 pandas DataFrame 으로 저장. (index : EQUIPMENT_INDEX 의 번호)
 
         마지막 row 는 모든 아이템 option 수치의 합.
 
         :return: information DataFrame (pandas.DataFrame)
         """
-        df = pd.DataFrame()
-        for category, summary_info in super().summary_info_dict.items():
-            index = parsetag.EQUIPMENT_INDEX[category]
-            data = self._summary_info_to_dict(summary_info)
-            new_df = pd.DataFrame(data=data, index=[index])
-            df = pd.concat([df, new_df])
+        builder = SummaryFrameBuilder()
+        builder.add(self.nickname, super().summary_info_dict)
+        df = builder.build().droplevel('nickname')
+        df.index = [EQUIPMENT_INDEX[slot] for slot in df.index]
 
         # 합계 row 추가
-        total_row = df.iloc[:, 2:].sum(axis=0)
-        df.loc['Total'] = total_row
+        df.loc['Total'] = self._total_stat
         return df
 
     @staticmethod
-    def _drop_zero_column(df: pd.DataFrame) -> pd.DataFrame:
+    def _drop_zero_column(df: "pd.DataFrame") -> "pd.DataFrame":
         """
         전달받은 DataFrame 에서 all zero column 이 있다면 그것을 삭제한 DataFrame 을 반환
 
         :param df: pandas DataFrame which may or may not contain zero columns
         :return: pandas DataFrame which has no zero columns
         """
-        return df.loc[:, (df != 0).any(axis=0)]
+        return drop_zero_columns(df)
 
     def tabulate_information(self):
         import tabulate
@@ -204,5 +467,175 @@ class PandasScouter(ItemScouter):
         return self._summary_info_without_zero_columns
 
 
+class SummaryFrameBuilder:
+    """
+    여러 캐릭터의 요약 정보를 (nickname, slot) MultiIndex 의 DataFrame 하나로 만듦.
+
+    row 마다 DataFrame 을 만들어 이어 붙이지 않고, column 별 배열에 값을 모아두었다가 build() 에서 한 번에 생성.
+    stat 수치는 StatVector 의 배열을 그대로 이어 붙여 2차원 배열로 사용.
+    """
+    def __init__(self):
+        self._nicknames = []
+        self._slots = []
+        self._names = []
+        self._categories = []
+        self._stats = array('l')
+
+    def add(self, nickname: str, summary_info_dict: dict[str, equipment.SummaryInformation]):
+        """
+        한 캐릭터의 요약 정보를 추가
+
+        :param nickname: nickname of the character (str)
+        :param summary_info_dict: summarized information of the equipments (dict[str, equipment.SummaryInformation])
+        :return: None
+        """
+        for slot, summary_info in summary_info_dict.items():
+            self._nicknames.append(nickname)
+            self._slots.append(slot)
+            self._names.append(summary_info.name)
+            self._categories.append(summary_info.category)
+            self._stats.extend(summary_info.stats.values)
+
+    def build(self) -> "pd.DataFrame":
+        """
+        :return: NAME, CATEGORY, stat columns indexed by (nickname, slot) (pandas.DataFrame)
+        """
+        import numpy as np
+        import pandas as pd
+        stats = np.asarray(self._stats, dtype=np.int64).reshape(-1, len(STAT_COLUMNS))
+        index = pd.MultiIndex.from_arrays([self._nicknames, self._slots], names=['nickname', 'slot'])
+        df = pd.DataFrame(stats, index=index, columns=STAT_COLUMNS)
+        df.insert(0, 'CATEGORY', self._categories)
+        df.insert(0, 'NAME', self._names)
+        return df
+
+
+def total_stat(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    SummaryFrameBuilder 로 만든 DataFrame 에서 캐릭터 별 option 수치의 합계를 한 번에 계산
+
+    :param df: DataFrame indexed by (nickname, slot) (pandas.DataFrame)
+    :return: total stat of each character, indexed by nickname (pandas.DataFrame)
+    """
+    return df[STAT_COLUMNS].groupby(level='nickname', sort=False).sum()
+
+
+def drop_zero_columns(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    전달받은 DataFrame 에서 all zero column 이 있다면 그것을 삭제한 DataFrame 을 반환
+
+    :param df: pandas DataFrame which may or may not contain zero columns
+    :return: pandas DataFrame which has no zero columns
+    """
+    return df.loc[:, (df != 0).any(axis=0)]
+
+
+class BatchScoutResult:
+    """
+    scout_many() 의 결과. 성공한 캐릭터의 scouter 와 실패한 캐릭터의 예외를 각각 nickname 을 key 로 저장.
+    """
+    def __init__(self):
+        self._scouters = {}
+        self._failures = {}
+
+    def _add_scouter(self, nickname: str, scouter: ItemScouter):
+        self._scouters[nickname] = scouter
+
+    def _add_failure(self, nickname: str, error: Exception):
+        self._failures[nickname] = error
+
+    def to_frame(self) -> "pd.DataFrame":
+        """
+        성공한 모든 캐릭터의 요약 정보를 (nickname, slot) MultiIndex 의 DataFrame 하나로 만듦.
+
+        :return: summarized information of every character (pandas.DataFrame)
+        """
+        builder = SummaryFrameBuilder()
+        for nickname, scouter in self._scouters.items():
+            builder.add(nickname, scouter.summary_info_dict)
+        return builder.build()
+
+    @property
+    def scouters(self):
+        return self._scouters
+
+    @property
+    def failures(self):
+        return self._failures
+
+
+def iter_scout_many(nicknames, max_workers: int = 4, scouter_class: type = ItemScouter, parse_workers: int = 0,
+                    breaker=None, **scouter_kwargs):
+    """
+    scout_many() 와 같이 scout 하되, 캐릭터가 끝나는 대로 하나씩 돌려줌. (결과를 모두 모으지 않고 바로 저장할 때)
+
+    :param nicknames: want to search (Iterable[str])
+    :param max_workers: maximum number of characters scouted (fetched) concurrently (int)
+    :param scouter_class: ItemScouter or its subclass such as PandasScouter (type)
+    :param parse_workers: number of parse processes, 0 to parse in the fetching threads (int)
+    :param breaker: shared by the workers to pause or abort during maintenance (circuitbreaker.CircuitBreaker or None)
+    :param scouter_kwargs: keyword arguments passed to scouter_class (background, extractor, ...)
+    :return: (nickname, scouter or None, exception or None) in completion order (Iterator[tuple])
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers : should be positive, but it is {max_workers}.")
+    if parse_workers > 0:
+        import pipeline
+        yield from pipeline.ScoutPipeline(max_workers, parse_workers, scouter_class=scouter_class, breaker=breaker,
+                                          **scouter_kwargs).iter_results(nicknames)
+        return
+    # 중복 nickname 은 한 번만 scout (순서 유지)
+    nicknames = list(dict.fromkeys(nicknames))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if breaker is None:
+            futures = {executor.submit(scouter_class, nickname, **scouter_kwargs): nickname for nickname in nicknames}
+        else:
+            futures = {executor.submit(breaker.call, scouter_class, nickname, **scouter_kwargs): nickname
+                       for nickname in nicknames}
+        for future in as_completed(futures):
+            # 돌려준 결과는 더 이상 붙잡고 있지 않도록 제거
+            nickname = futures.pop(future)
+            try:
+                item_scouter = future.result()
+            except Exception as error:
+                yield nickname, None, error
+                continue
+            yield nickname, item_scouter, None
+    finally:
+        # 중간에 멈춘 경우 아직 시작하지 않은 캐릭터는 scout 하지 않음
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scout_many(nicknames, max_workers: int = 4, scouter_class: type = ItemScouter, parse_workers: int = 0,
+               breaker=None, **scouter_kwargs) -> BatchScoutResult:
+    """
+    여러 캐릭터를 최대 max_workers 개씩 동시에 scout.
+
+    url 획득, 점검/비공개 확인, 장비 정보 추출 전 과정을 캐릭터 단위로 병렬 수행.
+    비공개, 존재하지 않는 캐릭터, 점검 중 등의 RuntimeError 와 요청 실패뿐 아니라,
+    예상하지 못한 html 로 인한 예외도 한 캐릭터의 실패로 보고 batch 를 중단하지 않고 BatchScoutResult.failures 에 모아둠.
+
+    parse_workers 가 양수이면 파싱은 별도의 process 들이 맡음 (pipeline.ScoutPipeline).
+    breaker 를 주면 점검 중이거나 html 구조가 바뀐 동안 나머지 캐릭터는 요청하지 않고 기다리거나 포기함.
+
+    :param nicknames: want to search (Iterable[str])
+    :param max_workers: maximum number of characters scouted (fetched) concurrently (int)
+    :param scouter_class: ItemScouter or its subclass such as PandasScouter (type)
+    :param parse_workers: number of parse processes, 0 to parse in the fetching threads (int)
+    :param breaker: shared by the workers to pause or abort during maintenance (circuitbreaker.CircuitBreaker or None)
+    :param scouter_kwargs: keyword arguments passed to scouter_class (background, extractor, ...)
+    :return: scouters and failures keyed by nickname (BatchScoutResult)
+    """
+    result = BatchScoutResult()
+    for nickname, item_scouter, error in iter_scout_many(nicknames, max_workers, scouter_class, parse_workers,
+                                                         breaker, **scouter_kwargs):
+        if error is None:
+            result._add_scouter(nickname, item_scouter)
+        else:
+            result._add_failure(nickname, error)
+    return result
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,161 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+import uuid
+import json
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class EquipmentStore:
+    """
+    scout 한 장비 정보를 Parquet 파일로 누적 저장하는 columnar dataset.
+
+    root/scrape_date=YYYY-MM-DD/part-*.parquet 형태로 수집 날짜(timestamp 의 UTC 기준 날짜) 별로 partition 하며,
+    (nickname, slot, timestamp) 당 한 row 에 TrimmedInformation 의 정보를 저장.
+    append() 할 때마다 파일 하나를 새로 쓰므로 기존 파일은 수정하지 않음 (append-only).
+
+    dictionary 형태의 option 정보는 JSON 문자열로 저장.
+    pyarrow 는 이 클래스를 사용할 때 import.
+
+    :param root: root directory of the dataset (str or Path)
+    """
+    JSON_COLUMNS = ('stat_options', 'potential_options', 'additional_options')
+    _schema = None
+
+    def __init__(self, root):
+        self._root = Path(root)
+
+    @classmethod
+    def schema(cls) -> "pa.Schema":
+        """
+        :return: columns of the stored rows (pyarrow.Schema)
+        """
+        if cls._schema is None:
+            import pyarrow as pa
+            cls._schema = pa.schema([('nickname', pa.string()),
+                                     ('slot', pa.string()),
+                                     ('timestamp', pa.timestamp('us', tz='UTC')),
+                                     ('name', pa.string()),
+                                     ('category', pa.string()),
+                                     ('scroll', pa.int32()),
+                                     ('starforce_max', pa.int32()),
+                                     ('starforce_now', pa.int32()),
+                                     ('stat_options', pa.string()),
+                                     ('potential_tier', pa.string()),
+                                     ('potential_options', pa.string()),
+                                     ('additional_tier', pa.string()),
+                                     ('additional_options', pa.string()),
+                                     ('superior', pa.bool_()),
+                                     ('hammer', pa.bool_())])
+        return cls._schema
+
+    @staticmethod
+    def _to_utc(timestamp: datetime) -> datetime:
+        """
+        timezone 이 없는 (naive) datetime 은 local time 이 아닌 UTC 로 간주.
+        (pyarrow 도 naive datetime 을 UTC 로 저장하므로, partition 날짜와 저장되는 timestamp 가 일치)
+
+        :param timestamp: scraped time (datetime)
+        :return: scraped time in UTC (datetime)
+        """
+        if timestamp.tzinfo is None:
+            return timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.astimezone(timezone.utc)
+
+    @staticmethod
+    def _to_json(options: dict) -> str:
+        return json.dumps(dict(options), ensure_ascii=False)
+
+    def _rows(self, scouters, timestamp: datetime) -> dict[str, list]:
+        """
+        ItemScouter 들의 장비 정보를 column 별 list 로 변환
+
+        :param scouters: scouted characters (Iterable[scouter.ItemScouter])
+        :param timestamp: scraped time (datetime)
+        :return: column arrays (dict[str, list])
+        """
+        columns = {field.name: [] for field in self.schema()}
+        for scouter in scouters:
+            for slot, info in scouter.equipments_info_dict.items():
+                columns['nickname'].append(scouter.nickname)
+                columns['slot'].append(slot)
+                columns['timestamp'].append(timestamp)
+                columns['name'].append(info.name)
+                columns['category'].append(info.category)
+                columns['scroll'].append(info.scroll)
+                columns['starforce_max'].append(info.starforce_max)
+                columns['starforce_now'].append(info.starforce_now)
+                columns['stat_options'].append(self._to_json(info.stat_options))
+                columns['potential_tier'].append(info.potential_tier)
+                columns['potential_options'].append(self._to_json(info.potential_options))
+                columns['additional_tier'].append(info.additional_tier)
+                columns['additional_options'].append(self._to_json(info.additional_options))
+                columns['superior'].append(info.superior)
+                columns['hammer'].append(info.hammer)
+        return columns
+
+    def append(self, scouters, timestamp: datetime | None = None) -> int:
+        """
+        여러 캐릭터의 장비 정보를 한 번에 저장 (파일 하나).
+        partition 은 timestamp 를 UTC 로 바꾼 날짜로 정함. (timezone 이 없는 datetime 은 UTC 로 간주)
+
+        :param scouters: scouted characters, e.g. BatchScoutResult.scouters.values() (Iterable[scouter.ItemScouter])
+        :param timestamp: scraped time, now if None (datetime or None)
+        :return: number of appended rows (int)
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        timestamp = self._to_utc(timestamp)
+        table = pa.Table.from_pydict(self._rows(scouters, timestamp), schema=self.schema())
+        if table.num_rows == 0:
+            return 0
+        partition = self._root / f"scrape_date={timestamp.date().isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, partition / f"part-{timestamp:%H%M%S}-{uuid.uuid4().hex}.parquet")
+        return table.num_rows
+
+    def read(self, nicknames=None, slots=None, start_date: date | None = None, end_date: date | None = None,
+             columns: list[str] | None = None, parse_options: bool = False):
+        """
+        조건에 맞는 row 만 읽어 pandas DataFrame 으로 반환. 날짜 조건은 partition 단위로 걸러지므로 빠름.
+
+        :param nicknames: only these characters (Iterable[str] or None)
+        :param slots: only these slots (Iterable[str] or None)
+        :param start_date: first scrape date (UTC), inclusive (date or None)
+        :param end_date: last scrape date (UTC), inclusive (date or None)
+        :param columns: columns to read, all if None (list[str] or None)
+        :param parse_options: convert JSON option columns back into dict (bool)
+        :return: stored rows (pandas.DataFrame)
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        if not self._root.exists():
+            return self.schema().empty_table().to_pandas()
+        partitioning = ds.partitioning(pa.schema([('scrape_date', pa.string())]), flavor='hive')
+        dataset = ds.dataset(self._root, format='parquet', partitioning=partitioning)
+        condition = None
+        conditions = []
+        if nicknames is not None:
+            conditions.append(ds.field('nickname').isin(list(nicknames)))
+        if slots is not None:
+            conditions.append(ds.field('slot').isin(list(slots)))
+        if start_date is not None:
+            conditions.append(ds.field('scrape_date') >= start_date.isoformat())
+        if end_date is not None:
+            conditions.append(ds.field('scrape_date') <= end_date.isoformat())
+        for expression in conditions:
+            condition = expression if condition is None else condition & expression
+        df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+        if parse_options:
+            for column in EquipmentStore.JSON_COLUMNS:
+                if column in df.columns:
+                    df[column] = df[column].map(json.loads)
+        return df
+
+    @property
+    def root(self):
+        return self._root
@@ -0,0 +1,144 @@
+from scouter import STAT_COLUMNS
+from abc import ABC, abstractmethod
+from pathlib import Path
+import json
+import csv
+import sys
+
+
+# 요약 정보 한 row (캐릭터의 장비 하나) 의 column
+SUMMARY_FIELDS = ['nickname', 'slot', 'name', 'category'] + STAT_COLUMNS
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+
+def summary_rows(item_scouter) -> list[dict]:
+    """
+    한 캐릭터의 요약 정보를 장비 하나 당 한 row 의 dictionary 로 변환.
+
+    :param item_scouter: scouted character (scouter.ItemScouter)
+    :return: rows with SUMMARY_FIELDS keys (list[dict])
+    """
+    rows = []
+    for slot, summary_info in item_scouter.summary_info_dict.items():
+        row = {'nickname': item_scouter.nickname, 'slot': slot,
+               'name': summary_info.name, 'category': summary_info.category}
+        row.update(zip(STAT_COLUMNS, summary_info.stats.values))
+        rows.append(row)
+    return rows
+
+
+class _TextWriter(ABC):
+    """
+    파일 또는 stdout 에 한 줄씩 쓰는 writer 의 공통 부분. path 가 None 또는 '-' 이면 stdout.
+    subclass 는 write() 를 구현.
+
+    :param path: output file (str or Path or None)
+    """
+    def __init__(self, path=None):
+        self._own_file = (path is not None) and (str(path) != '-')
+        if self._own_file:
+            self._file = Path(path).open("w", encoding="utf-8", newline="")
+        else:
+            self._file = sys.stdout
+
+    @abstractmethod
+    def write(self, rows: list[dict]):
+        """
+        :param rows: rows with SUMMARY_FIELDS keys (list[dict])
+        :return: None
+        """
+
+    def close(self):
+        self._file.flush()
+        if self._own_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NdjsonWriter(_TextWriter):
+    """
+    row 하나를 JSON 한 줄로 씀. 캐릭터마다 flush 하므로 실행 중에도 앞부분을 읽을 수 있음.
+    """
+    def write(self, rows: list[dict]):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+
+class CsvWriter(_TextWriter):
+    """
+    SUMMARY_FIELDS 를 header 로 하는 CSV. header 는 처음 한 번만 씀.
+    """
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._writer = csv.DictWriter(self._file, fieldnames=SUMMARY_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict]):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+
+class ParquetWriter:
+    """
+    Parquet 파일로 씀 (pyarrow 필요). row 를 row_group_size 개씩 모아 row group 하나로 저장하므로,
+    메모리에는 최대 row_group_size 개의 row 만 쌓임. 파일이 완성되려면 close() 를 호출해야 함.
+
+    :param path: output file, stdout is not supported (str or Path)
+    :param row_group_size: number of rows in a row group (int)
+    """
+    def __init__(self, path, row_group_size: int = 10000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if (path is None) or (str(path) == '-'):
+            raise ValueError("parquet : output file is required.")
+        self._schema = pa.schema([(field, pa.string()) for field in SUMMARY_FIELDS[:4]] +
+                                 [(column, pa.int64()) for column in STAT_COLUMNS])
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._row_group_size = row_group_size
+        self._rows = []
+
+    def _flush(self):
+        import pyarrow as pa
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def write(self, rows: list[dict]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self._row_group_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_writer(output_format: str, path=None):
+    """
+    :param output_format: one of FORMATS (str)
+    :param path: output file, stdout if None or '-' (ndjson, csv only) (str or Path or None)
+    :return: writer with write(rows) and close() (NdjsonWriter, CsvWriter or ParquetWriter)
+    """
+    if output_format == 'ndjson':
+        return NdjsonWriter(path)
+    if output_format == 'csv':
+        return CsvWriter(path)
+    if output_format == 'parquet':
+        return ParquetWriter(path)
+    raise ValueError(f"output_format : should be one of {FORMATS}, but it is {output_format!r}.")
+
+
+if __name__ == "__main__":
+    pass
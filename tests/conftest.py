@@ -0,0 +1,80 @@
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import ratelimit
+import urlcache
+import rawcache
+import metrics
+
+# 캐릭터 별 page 와 장비 정보 Tag 는 benchmark 와 같은 fixture 를 사용
+CHARACTER_FIXTURES = ROOT / "benchmarks" / "fixtures"
+# test 에서만 사용하는 page (점검, html 변경 등)
+PAGE_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+AVAILABLE = ('히슈와', '로하예', '신남')
+
+
+def read_page(name: str) -> str:
+    return (PAGE_FIXTURES / name).read_text(encoding="utf-8")
+
+
+def read_character(nickname: str, kind: str) -> str:
+    """
+    :param nickname: fixture character (str)
+    :param kind: 'ranking', 'detail', 'equipment' or 'items/<부위>' (str)
+    :return: saved html (str)
+    """
+    return (CHARACTER_FIXTURES / nickname / f"{kind}.html").read_text(encoding="utf-8")
+
+
+def read_items(nickname: str) -> dict[str, str]:
+    """
+    :param nickname: fixture character (str)
+    :return: saved html of the equipment information Tag of each slot (dict[str, str])
+    """
+    return {path.stem: path.read_text(encoding="utf-8")
+            for path in sorted((CHARACTER_FIXTURES / nickname / "items").glob("*.html"))}
+
+
+class Response:
+    """
+    requests.Response 중 이 프로젝트가 사용하는 부분만 흉내낸 응답.
+    """
+    def __init__(self, text: str, url: str = "", status_code: int = 200, headers: dict | None = None):
+        self.text = text
+        self.content = text.encode()
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} : {self.url}", response=self)
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch, tmp_path):
+    """
+    모든 test 는 요청 속도 제한 없이, 실행 directory 의 urlcache.sqlite3 와 rawcache 를 건드리지 않고 실행.
+    """
+    ratelimit.configure(rate=1000.0, max_rate=1000.0, concurrency=64)
+    urlcache.configure(str(tmp_path / "urlcache.sqlite3"))
+    rawcache.configure()
+    yield
+    ratelimit.configure()
+    urlcache.configure()
+    metrics.get_registry().reset()
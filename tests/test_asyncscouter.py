@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import Response, read_character, read_items
+import asyncscouter
+import equipment
+import geturl
+import htmlparser
+import parsetag
+
+NICKNAME = '히슈와'
+DETAIL_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+EQUIPMENT_URL = ("https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment"
+                 "?p=aGlzaHV3YV9wYXJhbQ%3D%3D")
+
+
+class FakeAsyncClient:
+    """
+    fixture 의 page 로 응답하는 httpclient.AsyncHttpClient
+    """
+    def __init__(self):
+        page = parsetag.EquipmentPage.from_html(EQUIPMENT_URL, read_character(NICKNAME, "equipment"))
+        extractor = parsetag.HttpEquipmentTag(page)
+        self._pages = {geturl.GetCharacterDetailUrl.ranking_search_url(NICKNAME): read_character(NICKNAME, "ranking"),
+                       DETAIL_URL: read_character(NICKNAME, "detail"),
+                       EQUIPMENT_URL: read_character(NICKNAME, "equipment")}
+        for slot, html in read_items(NICKNAME).items():
+            self._pages[extractor._get_equipment_link(slot)] = f'<div class="item_info">{html}</div>'
+
+    async def get(self, url: str, headers: dict | None = None):
+        return Response(self._pages[url], url)
+
+    async def close(self):
+        pass
+
+
+def test_blocking_work_runs_off_the_event_loop(monkeypatch):
+    loop_threads = set()
+    blocked = []
+    parse = htmlparser.parse
+
+    def tracked_parse(markup, backend=None):
+        if threading.get_ident() in loop_threads:
+            blocked.append(markup[:40])
+        return parse(markup, backend)
+
+    monkeypatch.setattr(htmlparser, "parse", tracked_parse)
+    equipment.get_item_memo().clear()
+
+    client = FakeAsyncClient()
+
+    async def scout():
+        loop_threads.add(threading.get_ident())
+        async with asyncscouter.AsyncItemScouter(client=client) as async_scouter:
+            return await async_scouter.scout(NICKNAME)
+
+    item_scouter = asyncio.run(scout())
+    assert set(item_scouter.equipments_info_dict) == set(read_items(NICKNAME))
+    assert item_scouter.equipments_info_dict['모자'].name == "앱솔랩스 나이트헬름"
+    assert blocked == []
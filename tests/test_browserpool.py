@@ -0,0 +1,36 @@
+import pytest
+
+import browserpool
+
+pytest.importorskip("selenium")
+
+
+class FakeService:
+    process = None
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.service = FakeService()
+        self.quitted = False
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url: str):
+        pass
+
+    def quit(self):
+        self.quitted = True
+
+
+def test_unreadable_memory_retires_browser():
+    pytest.importorskip("psutil")
+    pool = browserpool.BrowserPool(size=1)
+    browser = FakeBrowser()
+    pool._slots.acquire()
+    # chromedriver 프로세스를 알 수 없어도 release() 는 예외 없이 브라우저를 교체
+    pool.release(browser, pages=1)
+    assert browser.quitted
+    # 자리도 반납되어 다시 빌릴 수 있음
+    assert pool._slots.acquire(blocking=False)
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+import circuitbreaker
+import errors
+
+
+class FakeClock:
+    """
+    time.monotonic 대신 사용하는 시계. sleep 하면 그만큼 시간이 흐르고, sleep 한 시간을 기록.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float):
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuitbreaker.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(circuitbreaker.time, "sleep", fake.sleep)
+    monkeypatch.setattr(asyncio, "sleep", fake.async_sleep)
+    return fake
+
+
+class Site:
+    """
+    처음 failures 번은 점검 중이고 이후에는 정상인 홈페이지를 흉내낸 scout 함수.
+    """
+    def __init__(self, failures: int, error: type = errors.MaintenanceError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, nickname: str) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("점검 중")
+        return nickname
+
+    async def scout(self, nickname: str) -> str:
+        return self(nickname)
+
+
+def test_failed_probes_double_the_pause_up_to_max_pause(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0, max_pause=35.0, max_wait=1000.0)
+    site = Site(failures=4)
+    assert breaker.call(site, '히슈와') == '히슈와'
+    # 처음 실패로 열린 후 probe 가 세 번 실패하여 간격이 10 -> 20 -> 35 (max_pause)
+    assert clock.sleeps == [10.0, 20.0, 35.0, 35.0]
+    assert site.calls == 5
+    assert (breaker.state, breaker.reason) == ('closed', 'maintenance')
+
+
+def test_successful_probe_closes_and_resets_the_pause(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0, max_pause=100.0)
+    breaker.call(Site(failures=3), '히슈와')
+    assert breaker.state == 'closed'
+    clock.sleeps.clear()
+    # 다시 열리면 처음 간격부터 시작
+    breaker.call(Site(failures=2), '로하예')
+    assert clock.sleeps == [10.0, 20.0]
+
+
+def test_breaker_gives_up_after_max_wait(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0, max_pause=100.0, max_wait=25.0)
+    site = Site(failures=100)
+    with pytest.raises(errors.CircuitOpenError) as raised:
+        breaker.call(site, '히슈와')
+    # 두 번째 probe 는 max_wait 까지만 기다린 후 포기
+    assert clock.sleeps == [10.0, 15.0]
+    assert site.calls == 2
+    assert (breaker.state, raised.value.reason) == ('aborted', 'maintenance')
+    # 포기한 후에는 요청하지 않고 바로 실패
+    with pytest.raises(errors.CircuitOpenError):
+        breaker.call(site, '로하예')
+    assert site.calls == 2
+    breaker.reset()
+    assert breaker.state == 'closed'
+
+
+def test_only_one_probe_at_a_time(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0)
+    with pytest.raises(errors.MaintenanceError):
+        with breaker.guard():
+            raise errors.MaintenanceError("점검 중")
+    assert breaker._try_admit() == (10.0, False)
+    clock.now = 10.0
+    assert breaker._try_admit() == (0.0, True)
+    # probe 의 결과를 기다리는 동안 다른 캐릭터는 잠시 기다림
+    assert breaker._try_admit() == (1.0, False)
+    breaker._record(None, probe=True)
+    assert breaker._try_admit() == (0.0, False)
+
+
+def test_failures_started_before_opening_do_not_extend_the_pause(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0)
+    breaker._record(errors.MaintenanceError("점검 중"), probe=False)
+    clock.now = 5.0
+    breaker._record(errors.MaintenanceError("점검 중"), probe=False)
+    assert breaker._try_admit() == (5.0, False)
+
+
+def test_layout_changes_open_after_threshold(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', layout_threshold=3, pause=10.0)
+    for _ in range(2):
+        breaker._record(errors.LayoutChangedError("html 변경"), probe=False)
+    # 정상인 캐릭터 (비공개 포함) 가 있으면 연속 횟수를 다시 셈
+    breaker._record(errors.PrivateCharacterError("비공개"), probe=False)
+    for _ in range(2):
+        breaker._record(errors.LayoutChangedError("html 변경"), probe=False)
+    assert breaker.state == 'closed'
+    breaker._record(errors.LayoutChangedError("html 변경"), probe=False)
+    assert (breaker.state, breaker.reason) == ('open', 'layout_changed')
+    # 'pause' mode 에서도 layout 변경은 call() 이 다시 시도하지 않음
+    with pytest.raises(errors.LayoutChangedError):
+        breaker.call(Site(failures=1, error=errors.LayoutChangedError), '히슈와')
+
+
+def test_abort_mode_fails_fast(clock):
+    breaker = circuitbreaker.CircuitBreaker('abort')
+    site = Site(failures=1)
+    with pytest.raises(errors.MaintenanceError):
+        breaker.call(site, '히슈와')
+    with pytest.raises(errors.CircuitOpenError):
+        breaker.call(site, '로하예')
+    assert (site.calls, clock.sleeps) == (1, [])
+
+
+def test_acall_waits_and_retries(clock):
+    breaker = circuitbreaker.CircuitBreaker('pause', pause=10.0, max_pause=35.0)
+    site = Site(failures=3)
+    assert asyncio.run(breaker.acall(site.scout, '히슈와')) == '히슈와'
+    assert clock.sleeps == [10.0, 20.0, 35.0]
+    assert breaker.state == 'closed'
@@ -0,0 +1,164 @@
+import pickle
+import re
+import types
+
+import pytest
+
+from conftest import AVAILABLE, read_items
+import equipment
+import htmlparser
+import parsetag
+
+
+@pytest.fixture
+def memoized():
+    memo = equipment.ParsedItemMemo()
+    html = read_items('히슈와')['엠블렘']
+    first = memo.parse(htmlparser.parse(html))
+    second = memo.parse(htmlparser.parse(html))
+    assert first[0] is second[0]
+    return first
+
+
+def test_shared_records_are_read_only(memoized):
+    trimmed, summary = memoized
+    potential = dict(trimmed.potential_options)
+    with pytest.raises(TypeError):
+        trimmed.potential_options['보스 몬스터 공격 시 데미지'] = '+40%'
+    with pytest.raises(TypeError):
+        del trimmed.stats_dict['STR']
+    with pytest.raises(AttributeError):
+        trimmed._potential_options = {}
+    with pytest.raises(AttributeError):
+        summary._name = "다른 장비"
+    assert trimmed.potential_options == potential
+
+
+def test_adding_stats_does_not_change_shared_summary(memoized):
+    _, summary = memoized
+    before = list(summary.stats.values)
+    total = summary.stats
+    total += summary.stats
+    assert list(summary.stats.values) == before
+
+
+def test_read_only_records_survive_pickle(memoized):
+    trimmed, summary = memoized
+    assert pickle.loads(pickle.dumps(trimmed)).potential_options == trimmed.potential_options
+    assert pickle.loads(pickle.dumps(summary)).stats == summary.stats
+
+
+def baseline_fields(parsed_tag: parsetag.ParseInfoTag) -> dict:
+    """
+    stats_dict 를 항목마다 따로 순회하던 이전 EquipmentInformation 의 _set_* 결과를 그대로 재현.
+    """
+    def section(prefix: str) -> tuple[str, list]:
+        tier, options = '일반', []
+        for key_str, value_tag in parsed_tag.stats_dict.items():
+            if key_str[:len(prefix)] == prefix:
+                match = re.search(r"\((\w+).+\)", key_str)
+                if match is not None:
+                    tier = match.group(1)
+                options = value_tag.get_text(strip=True, separator='\n').splitlines()
+        return tier, options
+
+    etc_list = []
+    basic = {}
+    for key_str, value_tag in parsed_tag.stats_dict.items():
+        if key_str == "기타":
+            etc_list = value_tag.get_text(strip=True, separator='\n').splitlines()
+        elif key_str[:4] != "잠재옵션" and key_str[:9] != "에디셔널 잠재옵션":
+            basic[key_str] = value_tag.text
+    star_values = [int(integer) for text in etc_list if "성까지 강화 가능" in text
+                   for integer in ''.join((ch if ch in '0123456789' else ' ') for ch in text).split()]
+    starforce = (0, 0)
+    if len(star_values) == 1:
+        starforce = (star_values[-1], 0)
+    elif len(star_values) == 2:
+        starforce = (star_values[-1], star_values[0])
+    title = parsed_tag.title
+    return {'name': title if title[-1] != ")" else re.sub(' +', ' ', re.match(r".+(?=\s\(\+\d+\))", title).group()),
+            'scroll': 0 if title[-1] != ")" else int(re.search(r"\s\(\+(\d+)\)", title).group(1)),
+            'category': parsed_tag.category, 'stats_dict': basic,
+            'potential': section("잠재옵션"), 'additional': section("에디셔널 잠재옵션"), 'starforce': starforce,
+            'superior': any("슈페리얼" in text for text in etc_list),
+            'hammer': any("황금망치 제련 적용" in text for text in etc_list)}
+
+
+@pytest.mark.parametrize("nickname", AVAILABLE)
+def test_single_pass_matches_baseline(nickname):
+    for slot, html in read_items(nickname).items():
+        parsed_tag = parsetag.ParseInfoTag(htmlparser.parse(html))
+        info = equipment.EquipmentInformation(parsed_tag)
+        expected = baseline_fields(parsed_tag)
+        # 공유되는 record 이므로 잠재옵션 목록은 list 가 아닌 tuple 로 저장 (내용은 같음)
+        assert isinstance(info.potential[1], tuple) and isinstance(info.additional[1], tuple)
+        assert {'name': info.name, 'scroll': info.scroll, 'category': info.category,
+                'stats_dict': dict(info.stats_dict),
+                'potential': (info.potential[0], list(info.potential[1])),
+                'additional': (info.additional[0], list(info.additional[1])),
+                'starforce': (info.starforce_max, info.starforce_now),
+                'superior': info.superior, 'hammer': info.hammer} == expected, slot
+
+
+# 이전 SummaryInformation 의 _set_* 순서와 각 _set_* 가 찾던 keyword
+BASELINE_STAT_KEYWORDS = (('str', ('STR',)), ('dex', ('DEX',)), ('int', ('INT',)), ('luk', ('LUK',)),
+                          ('maxhp', ('MaxHP', '최대 HP')), ('allstat', ('올스탯',)), ('attack', ('공격력',)),
+                          ('magic_attack', ('마력',)), ('critical_damage', ('크리티컬 데미지',)),
+                          ('boss_damage', ('보스 몬스터공격 시 데미지', '보스 몬스터 공격 시 데미지')),
+                          ('damage', ('데미지',)), ('ignore_def', ('몬스터 방어율 무시', '몬스터 방어력 무시')),
+                          ('critical_rate', ('크리티컬 확률',)))
+
+
+def baseline_stats(information) -> dict[str, tuple[int, int]]:
+    """
+    option 문자열을 이어 붙인 후 합산하던 이전 _search_and_append_stats / _summate_stat 의 결과.
+    """
+    stats = {}
+    for name, keywords in BASELINE_STAT_KEYWORDS:
+        aggregated = "".join(options.get(keyword, "") for keyword in keywords
+                             for options in (information.stat_options, information.potential_options,
+                                             information.additional_options))
+        fixed, percent = 0, 0
+        for split in aggregated.split('+'):
+            if split == '':
+                pass
+            elif split[-1] == '%':
+                percent += int(split[:-1])
+            else:
+                fixed += int(split)
+        stats[name] = (fixed, percent)
+    return stats
+
+
+def summary_stats(summary: equipment.SummaryInformation) -> dict[str, tuple[int, int]]:
+    return {name: summary.stat(name) for name in equipment.STAT_NAMES}
+
+
+def test_stat_aliases_are_summed_like_baseline():
+    information = types.SimpleNamespace(
+        name="테스트 장비", category="장신구",
+        stat_options={'MaxHP': '+255', '공격력': '+3', '몬스터 방어율 무시': '+10%'},
+        potential_options={'최대 HP': '+9%', '보스 몬스터 공격 시 데미지': '+40%', '몬스터 방어력 무시': '+30%'},
+        additional_options={'MaxHP': '+300', '보스 몬스터공격 시 데미지': '+12%', '데미지': '+6%'})
+    summary = equipment.SummaryInformation(information)
+    assert summary_stats(summary) == baseline_stats(information)
+    assert summary.stat('maxhp') == (555, 9)
+    assert summary.stat('boss_damage') == (0, 52)
+    assert summary.stat('ignore_def') == (0, 40)
+
+
+@pytest.mark.parametrize("nickname", AVAILABLE)
+def test_fixture_stats_match_baseline(nickname):
+    memo = equipment.ParsedItemMemo(maxsize=0)
+    for slot, html in read_items(nickname).items():
+        trimmed, summary = memo.parse(htmlparser.parse(html))
+        assert summary_stats(summary) == baseline_stats(trimmed), slot
+
+
+def test_stat_columns_keep_baseline_order():
+    import scouter
+    # 이전 PandasScouter 는 SummaryInformation 의 attribute 순서대로 'STR', 'STR(%)', ... column 을 만들었음
+    assert scouter.STAT_COLUMNS == [column for name, _ in BASELINE_STAT_KEYWORDS
+                                    for column in (name.upper(), name.upper() + '(%)')]
+    assert equipment.STAT_NAMES == tuple(name for name, _ in BASELINE_STAT_KEYWORDS)
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from conftest import Response, read_character, read_page
+import circuitbreaker
+import errors
+import geturl
+import httpclient
+import rawcache
+import urlcache
+
+NICKNAME = '히슈와'
+DETAIL_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+EQUIPMENT_URL = ("https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment"
+                 "?p=aGlzaHV3YV9wYXJhbQ%3D%3D")
+STALE_DETAIL_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와?p=stale"
+STALE_EQUIPMENT_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment?p=stale"
+
+
+@pytest.fixture
+def replaying(tmp_path):
+    """
+    fixture 의 랭킹, 캐릭터 정보 page 를 기록한 rawcache 를 replay 모드로 설정하고,
+    urlcache 에는 기록과 다른 (오래된) url 을 넣어둠.
+    """
+    pytest.importorskip("requests")
+    root = tmp_path / "rawcache"
+    rawcache.configure(root, mode='record')
+    cache = rawcache.get_cache()
+    cache.put(geturl.GetCharacterDetailUrl.ranking_search_url(NICKNAME),
+              read_character(NICKNAME, "ranking").encode(), encoding="utf-8")
+    cache.put(DETAIL_URL, read_character(NICKNAME, "detail").encode(), encoding="utf-8")
+    urlcache.get_cache().put_detail_urls({NICKNAME: STALE_DETAIL_URL})
+    urlcache.get_cache().put_equipment_url(NICKNAME, STALE_EQUIPMENT_URL)
+    rawcache.configure(root, mode='replay')
+    yield
+    rawcache.configure()
+
+
+def test_replay_resolves_urls_from_records(replaying):
+    assert geturl.GetCharacterDetailUrl(NICKNAME).detail_url == DETAIL_URL
+    resolved = geturl.GetDetailEquipmentUrl(NICKNAME)
+    assert (resolved.equipment_url, resolved.from_cache) == (EQUIPMENT_URL, False)
+    # replay 한 url 로 실제 urlcache 를 덮어쓰지 않음
+    assert urlcache.get_cache().get_equipment_url(NICKNAME) == STALE_EQUIPMENT_URL
+
+
+def test_async_replay_resolves_urls_from_records(replaying):
+    async def resolve():
+        client = httpclient.AsyncHttpClient()
+        try:
+            return await geturl.resolve_equipment_url(client, NICKNAME)
+        finally:
+            await client.close()
+    assert asyncio.run(resolve()) == (EQUIPMENT_URL, False)
+    assert urlcache.get_cache().get_detail_url(NICKNAME) == STALE_DETAIL_URL
+
+
+@pytest.fixture
+def ranking_page(monkeypatch):
+    """
+    :return: function setting the html returned for the ranking search (callable)
+    """
+    pages = {}
+
+    def get(url, **kwargs):
+        return Response(pages['ranking'], url)
+
+    monkeypatch.setattr(geturl.httpclient, "get", get)
+    return lambda html: pages.update(ranking=html)
+
+
+def test_ranking_under_maintenance_is_maintenance(ranking_page):
+    ranking_page(read_page("maintenance.html"))
+    with pytest.raises(errors.MaintenanceError):
+        geturl.GetCharacterDetailUrl(NICKNAME)
+
+
+def test_ranking_without_table_is_layout_change(ranking_page):
+    ranking_page(read_page("ranking_no_table.html"))
+    with pytest.raises(errors.LayoutChangedError):
+        geturl.GetCharacterDetailUrl(NICKNAME)
+
+
+def test_character_missing_from_ranking_table_is_not_found(ranking_page):
+    ranking_page(read_character(NICKNAME, "ranking"))
+    with pytest.raises(errors.CharacterNotFoundError):
+        geturl.GetCharacterDetailUrl("없는캐릭터")
+
+
+def scout_through(breaker: circuitbreaker.CircuitBreaker, nickname: str):
+    try:
+        with breaker.guard():
+            geturl.GetCharacterDetailUrl(nickname)
+    except errors.ScoutError:
+        pass
+
+
+def test_ranking_failures_keep_the_breaker_informed(ranking_page):
+    breaker = circuitbreaker.CircuitBreaker('abort', layout_threshold=2)
+    ranking_page(read_page("ranking_no_table.html"))
+    scout_through(breaker, NICKNAME)
+    scout_through(breaker, NICKNAME)
+    assert (breaker.state, breaker.reason) == ('open', 'layout_changed')
+
+    breaker = circuitbreaker.CircuitBreaker('abort')
+    ranking_page(read_page("maintenance.html"))
+    scout_through(breaker, NICKNAME)
+    assert (breaker.state, breaker.reason) == ('open', 'maintenance')
+
+
+def test_stale_cached_detail_url_searches_again(monkeypatch):
+    pytest.importorskip("requests")
+    pages = {geturl.GetCharacterDetailUrl.ranking_search_url(NICKNAME): read_character(NICKNAME, "ranking"),
+             DETAIL_URL: read_character(NICKNAME, "detail")}
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        if url not in pages:
+            return Response("", url, status_code=404)
+        return Response(pages[url], url)
+
+    monkeypatch.setattr(geturl.httpclient, "get", get)
+    cache = urlcache.get_cache()
+    cache.put_detail_urls({NICKNAME: STALE_DETAIL_URL})
+    resolved = geturl.GetDetailEquipmentUrl(NICKNAME)
+    # cache 의 url 이 404 이므로 cache 를 지우고 랭킹 검색부터 다시 수행
+    assert requested == [STALE_DETAIL_URL, geturl.GetCharacterDetailUrl.ranking_search_url(NICKNAME), DETAIL_URL]
+    assert (resolved.equipment_url, resolved.from_cache) == (EQUIPMENT_URL, False)
+    assert (cache.get_detail_url(NICKNAME), cache.get_equipment_url(NICKNAME)) == (DETAIL_URL, EQUIPMENT_URL)
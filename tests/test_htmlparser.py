@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import AVAILABLE, read_character, read_items
+import equipment
+import geturl
+import htmlparser
+import parsetag
+import scouter
+from test_parsetag import item_fields
+
+MODULES = {'lxml': 'lxml', 'html5lib': 'html5lib', 'selectolax': 'selectolax'}
+
+
+def extracted(nickname: str, backend: str) -> dict:
+    """
+    :return: everything extracted from the fixture pages of the character with the backend (dict)
+    """
+    def parse(kind):
+        return htmlparser.parse(read_character(nickname, kind), backend)
+    htmlparser.configure(backend)
+    try:
+        page = parsetag.EquipmentPage.from_html("", read_character(nickname, "equipment"))
+    finally:
+        htmlparser.configure()
+    return {'ranking': geturl.GetCharacterDetailUrl._find_ranking_urls(parse("ranking")),
+            'equipment_url': geturl.GetDetailEquipmentUrl._find_equipment_url(parse("detail")),
+            'equip_or_not': scouter.ItemScouter._equip_or_not_dict(page),
+            'items': {slot: item_fields(equipment.TrimmedInformation(htmlparser.parse(html, backend)))
+                      for slot, html in read_items(nickname).items()}}
+
+
+def test_default_backend_does_not_depend_on_installed_packages():
+    htmlparser.configure()
+    assert htmlparser.get_backend() == 'html.parser'
+
+
+@pytest.mark.parametrize("backend", [backend for backend in htmlparser.BACKENDS if backend != 'html.parser'])
+@pytest.mark.parametrize("nickname", AVAILABLE)
+def test_backends_extract_the_same_fields(backend, nickname):
+    pytest.importorskip(MODULES[backend])
+    assert extracted(nickname, backend) == extracted(nickname, 'html.parser')
+
+
+@pytest.mark.parametrize("backend", htmlparser.BACKENDS)
+def test_equipment_url_ignores_links_with_nested_tags(backend):
+    if backend in MODULES:
+        pytest.importorskip(MODULES[backend])
+    # 메뉴의 '가이드 <em>장비 강화</em>' 링크가 장비 탭보다 먼저 나옴
+    url = geturl.GetDetailEquipmentUrl._find_equipment_url(
+        htmlparser.parse(read_character('히슈와', "detail"), backend))
+    assert url == ("https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment"
+                   "?p=aGlzaHV3YV9wYXJhbQ%3D%3D")
+
+
+@pytest.mark.parametrize("backend", htmlparser.BACKENDS)
+@pytest.mark.parametrize("markup, string", [
+    ("<a>장비</a>", "장비"),
+    ("<a><span>장비</span></a>", "장비"),
+    ("<a>장비 <span>안내</span></a>", None),
+    ("<a></a>", None),
+])
+def test_string_matches_bs4(backend, markup, string):
+    if backend in MODULES:
+        pytest.importorskip(MODULES[backend])
+    assert htmlparser.parse(markup, backend).select_one("a").string == string
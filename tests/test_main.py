@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+import errors
+import main
+import metrics
+import scouter
+
+
+def interrupted_scout_many(nicknames, **kwargs):
+    yield nicknames[0], None, errors.PrivateCharacterError("공개하지 않은 정보입니다.")
+    yield nicknames[1], None, errors.CharacterNotFoundError("랭킹 검색 결과 존재하지 않음.")
+    raise KeyboardInterrupt
+
+
+def test_failures_and_metrics_are_written_when_interrupted(monkeypatch, tmp_path):
+    monkeypatch.setattr(scouter, "iter_scout_many", interrupted_scout_many)
+    failures_path, metrics_path = tmp_path / "failures.ndjson", tmp_path / "metrics.json"
+    metrics.count('requests', 3)
+    with pytest.raises(KeyboardInterrupt):
+        main.main(['비공개', '없는캐릭터', '히슈와', '-o', str(tmp_path / "out.ndjson"), '--on-outage', 'off',
+                   '--failures', str(failures_path), '--metrics', str(metrics_path)])
+    failures = [json.loads(line) for line in failures_path.read_text(encoding="utf-8").splitlines()]
+    assert [(failure['nickname'], failure['kind']) for failure in failures] == \
+        [('비공개', 'private'), ('없는캐릭터', 'not_found')]
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))['counters']['requests'] >= 3
@@ -0,0 +1,93 @@
+import json
+
+import metrics
+
+
+def small_registry() -> metrics.MetricsRegistry:
+    registry = metrics.MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe('parsing', 0.05)
+    registry.observe('parsing', 0.5)
+    registry.observe('url_resolution', 2.0, ok=False)
+    registry.count('requests', 3)
+    registry.count('bytes', 2048)
+    return registry
+
+
+def test_prometheus_text_format():
+    assert small_registry().to_prometheus() == (
+        '# HELP scouter_stage_seconds Elapsed seconds of each scouting stage.\n'
+        '# TYPE scouter_stage_seconds histogram\n'
+        'scouter_stage_seconds_bucket{stage="parsing",le="0.1"} 1\n'
+        'scouter_stage_seconds_bucket{stage="parsing",le="1.0"} 2\n'
+        'scouter_stage_seconds_bucket{stage="parsing",le="+Inf"} 2\n'
+        'scouter_stage_seconds_sum{stage="parsing"} 0.55\n'
+        'scouter_stage_seconds_count{stage="parsing"} 2\n'
+        'scouter_stage_seconds_bucket{stage="url_resolution",le="0.1"} 0\n'
+        'scouter_stage_seconds_bucket{stage="url_resolution",le="1.0"} 0\n'
+        'scouter_stage_seconds_bucket{stage="url_resolution",le="+Inf"} 1\n'
+        'scouter_stage_seconds_sum{stage="url_resolution"} 2.0\n'
+        'scouter_stage_seconds_count{stage="url_resolution"} 1\n'
+        '# TYPE scouter_bytes_total counter\n'
+        'scouter_bytes_total 2048\n'
+        '# TYPE scouter_requests_total counter\n'
+        'scouter_requests_total 3\n')
+
+
+def test_prometheus_escapes_labels_and_metric_names():
+    registry = metrics.MetricsRegistry(buckets=(1.0,))
+    registry.observe('say "hi"\\\n', 0.5)
+    registry.count('memo-hits.v2')
+    text = registry.to_prometheus()
+    assert 'scouter_stage_seconds_count{stage="say \\"hi\\"\\\\\\n"} 1\n' in text
+    assert 'scouter_memo_hits_v2_total 1\n' in text
+    # 줄바꿈이 label 밖으로 새지 않음
+    assert all(line.startswith(('#', 'scouter_')) for line in text.splitlines())
+
+
+def test_textfile_exporter_writes_at_most_once_per_interval(tmp_path):
+    registry = small_registry()
+    path = tmp_path / "scouter.prom"
+    exporter = metrics.TextfileExporter(registry, path, interval=3600.0)
+    registry.add_hook(exporter)
+    registry.count('requests')
+    assert path.read_text(encoding="utf-8") == registry.to_prometheus()
+    registry.count('requests')
+    assert 'scouter_requests_total 4\n' in path.read_text(encoding="utf-8")
+    exporter.flush()
+    assert 'scouter_requests_total 5\n' in path.read_text(encoding="utf-8")
+    # 임시 파일은 남지 않음
+    assert [file.name for file in tmp_path.iterdir()] == ["scouter.prom"]
+
+
+def test_json_lines_exporter_writes_one_event_per_line(tmp_path):
+    registry = metrics.MetricsRegistry()
+    path = tmp_path / "events.jsonl"
+    registry.add_hook(metrics.JsonLinesExporter(path))
+    registry.observe('parsing', 0.25, nickname='히슈와', slot='모자')
+    registry.count('retries')
+    registry.event('slot_reused', nickname='히슈와', slot=tmp_path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [(event['kind'], event['name']) for event in events] == [
+        ('stage', 'parsing'), ('count', 'retries'), ('event', 'slot_reused')]
+    assert (events[0]['seconds'], events[0]['ok'], events[0]['slot']) == (0.25, True, '모자')
+    assert events[1]['amount'] == 1
+    # json 으로 바꿀 수 없는 값은 str 로, 한글은 escape 하지 않고 저장
+    assert events[2]['slot'] == str(tmp_path)
+    assert '히슈와' in lines[0]
+    assert all(isinstance(event['time'], float) for event in events)
+
+
+def test_progress_printer_prints_only_its_character(capsys):
+    registry = metrics.MetricsRegistry()
+    registry.add_hook(metrics.ProgressPrinter('히슈와'))
+    registry.observe('url_resolution', 0.1, nickname='히슈와')
+    registry.observe('availability_check', 0.1, ok=False, nickname='히슈와')
+    registry.event('slot_parsed', nickname='로하예', slot='모자')
+    registry.event('slot_parsed', nickname='히슈와', slot='모자')
+    registry.event('slots_parsed', nickname='히슈와')
+    registry.count('requests', nickname='히슈와')
+    assert capsys.readouterr().out == ("<<< Get equipment detail url : Done >>>\n"
+                                       "\n"
+                                       "<<< Save the information of 모자 : Done >>>\n"
+                                       "\n")
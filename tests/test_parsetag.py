@@ -0,0 +1,174 @@
+import json
+import re
+
+import pytest
+
+from conftest import AVAILABLE, Response, read_character, read_items, read_page
+import errors
+import equipment
+import parsetag
+
+EQUIPMENT_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+EMPTY_ITEM_INFO = '<div class="item_info"></div>'
+
+
+def item_fields(info: equipment.TrimmedInformation) -> dict:
+    return {'name': info.name, 'scroll': info.scroll, 'category': info.category,
+            'stat_options': dict(info.stat_options),
+            'potential': (info.potential_tier, dict(info.potential_options)),
+            'additional': (info.additional_tier, dict(info.additional_options)),
+            'starforce': (info.starforce_max, info.starforce_now),
+            'superior': info.superior, 'hammer': info.hammer}
+
+
+class FakeElement:
+    def __init__(self, browser, slot: str):
+        self._browser = browser
+        self._slot = slot
+
+    def click(self):
+        # 클릭하면 item_info 에 해당 장비의 정보가 채워진 page 가 됨
+        self._browser.page_source = self._browser.page.replace(
+            EMPTY_ITEM_INFO, f'<div class="item_info">{self._browser.items[self._slot]}</div>')
+
+
+class FakeBrowser:
+    """
+    장비 정보 page 와 장비 정보 Tag fixture 로 selenium 브라우저의 클릭 결과를 재현.
+    """
+    def __init__(self, page: str, items: dict[str, str]):
+        self.page = page
+        self.items = items
+        self.page_source = ""
+
+    def get(self, url: str):
+        self.page_source = self.page
+
+    def find_element(self, by, value: str):
+        index = int(re.search(r"nth-child\((\d+)\)", value).group(1))
+        slot = next(slot for slot, number in parsetag.EQUIPMENT_INDEX.items() if number == index)
+        return FakeElement(self, slot)
+
+
+class FakePool:
+    def __init__(self, browser: FakeBrowser):
+        self._browser = browser
+        self.released = []
+
+    def acquire(self):
+        return self._browser
+
+    def release(self, browser, pages: int = 0, broken: bool = False):
+        self.released.append(broken)
+
+
+def http_extractor(monkeypatch, nickname: str, respond=None) -> tuple[parsetag.HttpEquipmentTag, list]:
+    """
+    :param respond: item html -> response text, '<div class="item_info">' 로 감싼 조각이 기본값 (callable or None)
+    :return: extractor and the (url, headers) of requests it sent (tuple)
+    """
+    items = read_items(nickname)
+    page = parsetag.EquipmentPage.from_html(EQUIPMENT_URL, read_character(nickname, "equipment"))
+    links = {parsetag.HttpEquipmentTag(page)._get_equipment_link(slot): slot for slot in items}
+    if respond is None:
+        def respond(html):
+            return f'<div class="item_info">{html}</div>'
+    requests = []
+
+    def get(url, headers=None, **kwargs):
+        requests.append((url, headers))
+        return Response(respond(items[links[url]]), url)
+
+    monkeypatch.setattr(parsetag.httpclient, "get", get)
+    return parsetag.HttpEquipmentTag(page), requests
+
+
+def selenium_extractor(nickname: str) -> parsetag.BrowserForEquipmentTag:
+    pytest.importorskip("selenium")
+    browser = FakeBrowser(read_character(nickname, "equipment"), read_items(nickname))
+    return parsetag.BrowserForEquipmentTag(EQUIPMENT_URL, pool=FakePool(browser))
+
+
+@pytest.mark.parametrize("nickname", AVAILABLE)
+def test_http_extractor_matches_selenium(monkeypatch, nickname):
+    http, _ = http_extractor(monkeypatch, nickname)
+    browser = selenium_extractor(nickname)
+    for slot in read_items(nickname):
+        http_info = equipment.TrimmedInformation(http.get_equipment_info_tag(slot))
+        browser_info = equipment.TrimmedInformation(browser.get_equipment_info_tag(slot))
+        assert item_fields(http_info) == item_fields(browser_info), slot
+
+
+def test_http_extractor_fields(monkeypatch):
+    http, requests = http_extractor(monkeypatch, '히슈와')
+    helmet = equipment.TrimmedInformation(http.get_equipment_info_tag('모자'))
+    assert (helmet.name, helmet.scroll, helmet.category) == ("앱솔랩스 나이트헬름", 12, "모자")
+    assert helmet.stat_options['STR'] == "+101"
+    assert (helmet.potential_tier, helmet.potential_options) == ('레전드리', {'STR': '+12%+9%', '올스탯': '+6%'})
+    assert (helmet.additional_tier, helmet.additional_options) == ('유니크', {'공격력': '+10', 'STR': '+4%'})
+    assert (helmet.starforce_max, helmet.starforce_now, helmet.hammer, helmet.superior) == (25, 22, True, False)
+
+    shoes = equipment.TrimmedInformation(http.get_equipment_info_tag('신발'))
+    assert (shoes.name, shoes.scroll, shoes.superior, shoes.hammer) == ("타일런트 알테어 부츠", 0, True, False)
+    assert (shoes.starforce_max, shoes.starforce_now, shoes.additional_tier) == (15, 12, '일반')
+
+    # item pot 링크를 XMLHttpRequest 로 요청
+    url, headers = requests[0]
+    assert url.startswith("https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment/3?p=")
+    assert headers == {'X-Requested-With': 'XMLHttpRequest', 'Referer': EQUIPMENT_URL}
+
+
+def test_http_extractor_json_view(monkeypatch):
+    http, _ = http_extractor(monkeypatch, '히슈와',
+                             lambda html: json.dumps({'view': f'<div class="item_info">{html}</div>'}))
+    assert equipment.TrimmedInformation(http.get_equipment_info_tag('무기')).name == "제네시스 투핸드소드"
+
+
+def test_full_page_response_is_layout_change(monkeypatch):
+    # 요청한 장비가 아닌 (page 가 처음 보여주는) 장비를 파싱하지 않도록 전체 page 는 거부
+    http, _ = http_extractor(monkeypatch, '히슈와', lambda html: read_page("item_full_page.html"))
+    with pytest.raises(errors.LayoutChangedError):
+        http.get_equipment_info_tag('모자')
+
+
+def test_response_without_item_info_is_layout_change(monkeypatch):
+    http, _ = http_extractor(monkeypatch, '히슈와', lambda html: html)
+    with pytest.raises(errors.LayoutChangedError):
+        http.get_equipment_info_tag('모자')
+
+
+def test_unworn_slot_is_layout_change():
+    page = parsetag.EquipmentPage.from_html(EQUIPMENT_URL, read_character('히슈와', "equipment"))
+    with pytest.raises(errors.LayoutChangedError):
+        parsetag.HttpEquipmentTag(page).get_equipment_info_tag('안드로이드')
+
+
+class FailingBrowser(FakeBrowser):
+    def __init__(self, error: BaseException):
+        super().__init__("", {})
+        self._error = error
+
+    def get(self, url: str):
+        raise self._error
+
+
+@pytest.mark.parametrize("error_name, broken", [("WebDriverException", True), ("KeyboardInterrupt", False),
+                                                ("ConnectionError", False)])
+def test_failed_page_load_releases_browser(error_name, broken):
+    pytest.importorskip("selenium")
+    import requests
+    from selenium.common.exceptions import WebDriverException
+    error = {'WebDriverException': WebDriverException(), 'KeyboardInterrupt': KeyboardInterrupt(),
+             'ConnectionError': requests.ConnectionError()}[error_name]
+    pool = FakePool(FailingBrowser(error))
+    with pytest.raises(type(error)):
+        parsetag.BrowserForEquipmentTag(EQUIPMENT_URL, pool=pool)
+    assert pool.released == [broken]
+
+
+def test_selenium_without_item_info_is_layout_change():
+    pytest.importorskip("selenium")
+    browser = FakeBrowser(read_character('히슈와', "equipment"), {'모자': ""})
+    extractor = parsetag.BrowserForEquipmentTag(EQUIPMENT_URL, pool=FakePool(browser))
+    with pytest.raises(errors.LayoutChangedError):
+        extractor.get_equipment_info_tag('모자')
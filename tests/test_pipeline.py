@@ -0,0 +1,97 @@
+import os
+import threading
+
+import pytest
+
+from conftest import read_items
+import metrics
+import pipeline
+
+
+class FakeScouter:
+    """
+    장비 없이 바로 완성되는 scouter_class. 만들어진 (요청을 시작한) nickname 을 기록.
+    """
+    started = []
+
+    def __init__(self, nickname: str):
+        self.nickname = nickname
+
+    @classmethod
+    def _deferred(cls, nickname: str, **kwargs):
+        cls.started.append(nickname)
+        if nickname == '종료':
+            # _fetch 가 잡지 못하는 예외로 fetch thread 가 끝남
+            raise SystemExit(nickname)
+        return cls(nickname)
+
+    def _iter_item_tags(self):
+        yield from ()
+
+    def _finish(self, parsed: dict):
+        pass
+
+
+@pytest.fixture
+def started():
+    FakeScouter.started = []
+    return FakeScouter.started
+
+
+def test_closing_results_cancels_pending_fetches(started):
+    nicknames = [f"캐릭터{i}" for i in range(100)]
+    results = pipeline.ScoutPipeline(fetch_workers=1, parse_workers=1,
+                                     scouter_class=FakeScouter).iter_results(nicknames)
+    nickname, item_scouter, error = next(results)
+    assert (item_scouter.nickname, error) == (nickname, None)
+    results.close()
+    assert len(started) < len(nicknames)
+
+
+def test_fetch_thread_exiting_silently_does_not_hang(started):
+    outcome = []
+
+    def consume():
+        try:
+            list(pipeline.ScoutPipeline(fetch_workers=2, parse_workers=1, scouter_class=FakeScouter)
+                 .iter_results(['히슈와', '종료', '로하예']))
+        except BaseException as error:
+            outcome.append(error)
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert isinstance(outcome[0], SystemExit)
+
+
+class ItemScouterWithTags(FakeScouter):
+    """
+    fixture 의 장비 정보 Tag 를 파싱하도록 넘기는 scouter_class
+    """
+    def _iter_item_tags(self):
+        for slot, html in read_items('히슈와').items():
+            yield slot, html
+
+    def _finish(self, parsed: dict):
+        self.parsed = parsed
+
+
+def test_parse_workers_do_not_inherit_metrics_hooks(tmp_path, started):
+    path = tmp_path / "events.txt"
+
+    def hook(event):
+        with open(path, "a") as file:
+            file.write(f"{os.getpid()}\n")
+
+    metrics.add_hook(hook)
+    try:
+        results = list(pipeline.ScoutPipeline(parse_workers=1, scouter_class=ItemScouterWithTags)
+                       .iter_results(['히슈와']))
+    finally:
+        metrics.remove_hook(hook)
+    (_, item_scouter, error), = results
+    assert error is None
+    assert item_scouter.parsed['모자'][0].name == "앱솔랩스 나이트헬름"
+    # parse process 의 event 는 main process 에서 기록됨
+    assert set(path.read_text().split()) == {str(os.getpid())}
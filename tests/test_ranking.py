@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from conftest import Response, read_character, read_page
+import errors
+import htmlparser
+import ranking
+
+
+class CountingCrawler(ranking.RankingCrawler):
+    """
+    page 마다 rows_per_page 개의 row 를 돌려주고, 요청한 page 를 기록하는 crawler.
+    """
+    def __init__(self, rows_per_page: int = 10, last_page: int = 100):
+        super().__init__()
+        self.rows_per_page = rows_per_page
+        self.last_page = last_page
+        self.fetched = []
+
+    def fetch_page(self, page: int) -> list[ranking.RankingRow]:
+        self.fetched.append(page)
+        if page > self.last_page:
+            return []
+        first = (page - 1) * self.rows_per_page + 1
+        return [ranking.RankingRow(rank=rank, nickname=f"캐릭터{rank}", detail_url="", job="", level=None, exp=None,
+                                   popularity=None, guild="")
+                for rank in range(first, first + self.rows_per_page)]
+
+
+@pytest.mark.parametrize("max_rows, pages", [(10, [1]), (20, [1, 2]), (15, [1, 2]), (0, [])])
+def test_crawl_stops_fetching_at_max_rows(max_rows, pages):
+    crawler = CountingCrawler()
+    rows = list(crawler.crawl(max_rows=max_rows))
+    assert [row.rank for row in rows] == list(range(1, max_rows + 1))
+    assert crawler.fetched == pages
+
+
+def test_crawl_stops_at_empty_page():
+    crawler = CountingCrawler(last_page=2)
+    assert len(list(crawler.crawl())) == 20
+    assert crawler.fetched == [1, 2, 3]
+
+
+def test_ranking_page_under_maintenance_is_not_the_last_page():
+    with pytest.raises(errors.MaintenanceError):
+        ranking.parse_ranking_rows(htmlparser.parse(read_page("maintenance.html")))
+
+
+def test_ranking_page_past_the_end_is_empty():
+    html = re.sub(r"<tbody>.*</tbody>", "<tbody></tbody>", read_character('히슈와', "ranking"), flags=re.S)
+    assert ranking.parse_ranking_rows(htmlparser.parse(html)) == []
+
+
+def test_ranking_page_without_table_is_layout_change():
+    with pytest.raises(errors.LayoutChangedError):
+        ranking.parse_ranking_rows(htmlparser.parse(read_page("ranking_no_table.html")))
+
+
+def test_crawl_raises_on_layout_change(monkeypatch):
+    def get(url, **kwargs):
+        return Response(read_page("ranking_no_table.html"), url)
+
+    monkeypatch.setattr(ranking.httpclient, "get", get)
+    with pytest.raises(errors.LayoutChangedError):
+        list(ranking.RankingCrawler().crawl())
@@ -0,0 +1,102 @@
+import pytest
+
+from conftest import Response
+import httpclient
+import ratelimit
+
+URL = "https://maplestory.nexon.com/N23Ranking/World/Total?c=히슈와"
+
+
+NORMAL_PAGE = ("<html><body><div id=\"container\"><ul class=\"board\">"
+               + "<li>공지사항</li>" * 400 + "<li>{post}</li></ul></div></body></html>")
+
+
+class FakeSession:
+    def __init__(self, response: Response):
+        self._response = response
+
+    def get(self, url, **kwargs):
+        return self._response
+
+
+def test_interrupted_acquire_returns_window():
+    limiter = ratelimit.AdaptiveLimiter(rate=1000.0, concurrency=1.0)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    limiter._bucket.take = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        limiter.acquire()
+    assert limiter._in_flight == 0
+
+
+def test_interrupted_acquire_async_returns_window():
+    import asyncio
+    limiter = ratelimit.AdaptiveLimiter(rate=1000.0, concurrency=1.0)
+
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    limiter._bucket.take_async = cancelled
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(limiter.acquire_async())
+    assert limiter._in_flight == 0
+
+
+@pytest.mark.parametrize("body, congested", [
+    ("<html><body><p>비정상적인 접근이 감지되어 요청이 차단되었습니다.</p></body></html>", True),
+    ("<html><body><h1>Access Denied</h1></body></html>", True),
+    ("<html><body><div id='container'>정상 page</div></body></html>", False),
+    # 정상 page 의 게시글 등에 같은 문구가 있는 경우
+    (NORMAL_PAGE.format(post="서버에 요청이 너무 많아서 그런가요? 잠시 후 다시 이용해 볼게요"), False),
+], ids=["block-page", "access-denied", "normal-page", "marker-in-normal-page"])
+def test_block_page_served_with_200_is_congestion(monkeypatch, body, congested):
+    pytest.importorskip("requests")
+    ratelimit.configure(rate=1000.0, max_rate=1000.0, concurrency=4.0, cooldown=0.0)
+    client = httpclient.HttpClient()
+    monkeypatch.setattr(client, "_session", FakeSession(Response(body, URL)))
+    client.get(URL)
+    assert (ratelimit.get_limiter(URL).concurrency < 4) == congested
+
+
+def test_block_page_markers_are_checked_only_without_container_or_in_small_bodies():
+    marker = "요청이 너무 많습니다."
+    large_page = NORMAL_PAGE.format(post=marker).encode()
+    assert len(large_page) >= ratelimit.BLOCK_PAGE_MAX_BYTES
+    assert not ratelimit.is_block_page(large_page)
+    # #container 가 없으면 크기와 무관하게 확인
+    assert ratelimit.is_block_page(large_page.replace(b'id="container"', b'id="blocked"'))
+    # 작은 차단 page 는 #container 가 있어도 확인
+    assert ratelimit.is_block_page(f"<div id='container'>{marker}</div>".encode())
+    assert not ratelimit.is_block_page(NORMAL_PAGE.format(post="정상 게시글").encode())
+
+
+class SequenceSession:
+    def __init__(self, responses: list[Response]):
+        self._responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self._responses.pop(0)
+
+
+def test_each_retry_goes_through_the_limiter(monkeypatch):
+    pytest.importorskip("requests")
+    limiter = ratelimit.get_limiter(URL)
+    acquired = []
+    acquire = limiter.acquire
+
+    def counted_acquire():
+        acquired.append(limiter._in_flight)
+        acquire()
+
+    monkeypatch.setattr(limiter, "acquire", counted_acquire)
+    client = httpclient.HttpClient(backoff_factor=0.0)
+    session = SequenceSession([Response("", URL, status_code=503), Response("<div id='container'></div>", URL)])
+    monkeypatch.setattr(client, "_session", session)
+    assert client.get(URL).status_code == 200
+    assert session.calls == 2
+    # 두 번째 시도는 첫 번째 시도의 자리를 반납한 후에 다시 얻음
+    assert acquired == [0, 0]
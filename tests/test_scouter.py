@@ -0,0 +1,283 @@
+import gc
+import sys
+
+import pytest
+
+from conftest import AVAILABLE, Response, read_character, read_items
+import errors
+import equipment
+import geturl
+import htmlparser
+import parsetag
+import scouter
+import urlcache
+
+DETAIL_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+EQUIPMENT_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+
+
+class BrokenScouter:
+    """
+    html 변경이 TypeError 등으로 드러나는 경우를 흉내낸 scouter_class
+    """
+    def __init__(self, nickname: str, **kwargs):
+        if nickname == '깨짐':
+            raise TypeError("'NoneType' object is not subscriptable")
+        self.nickname = nickname
+
+
+def test_unexpected_errors_are_recorded_per_nickname():
+    result = scouter.scout_many(['히슈와', '깨짐', '로하예'], max_workers=2, scouter_class=BrokenScouter)
+    assert set(result.scouters) == {'히슈와', '로하예'}
+    assert isinstance(result.failures['깨짐'], TypeError)
+
+
+def test_missing_item_pot_is_layout_change():
+    html = read_character('히슈와', "equipment").replace('class="item_pot"', 'class="item_slots"')
+    with pytest.raises(errors.LayoutChangedError):
+        scouter.ItemScouter._equip_or_not_dict(parsetag.EquipmentPage.from_html("", html))
+
+
+@pytest.mark.parametrize("selector_class", ["item_title", "item_ability", "stet_th", "point_td"])
+def test_missing_item_part_is_layout_change(selector_class):
+    html = read_items('히슈와')['모자'].replace(f'class="{selector_class}"', 'class="renamed"')
+    with pytest.raises(errors.LayoutChangedError):
+        equipment.TrimmedInformation(htmlparser.parse(html))
+
+
+class TrackedTags:
+    """
+    _iter_item_tags() 대신 fixture 의 장비 정보 Tag 를 돌려주고, 닫혔는지 기록.
+    generator 를 붙잡아두어 (traceback 등이 참조하는 경우처럼) GC 로 닫히지 않도록 함.
+    """
+    def __init__(self, items: dict[str, str]):
+        self.items = items
+        self.generators = []
+        self.closed = False
+
+    def __call__(self):
+        generator = self._iter()
+        self.generators.append(generator)
+        return generator
+
+    def _iter(self):
+        try:
+            for slot, html in self.items.items():
+                yield slot, htmlparser.parse(html)
+        finally:
+            self.closed = True
+
+
+def test_stopping_iter_equipments_closes_extraction(monkeypatch):
+    tracked = TrackedTags(read_items('히슈와'))
+    monkeypatch.setattr(scouter.ItemScouter, "_iter_item_tags", tracked)
+    equipments = scouter.iter_equipments('히슈와')
+    next(equipments)
+    equipments.close()
+    assert tracked.closed
+
+
+def test_parse_error_closes_extraction(monkeypatch):
+    tracked = TrackedTags({'모자': read_items('히슈와')['모자'], '무기': "<div>깨진 장비 정보</div>"})
+    monkeypatch.setattr(scouter.ItemScouter, "_iter_item_tags", tracked)
+    item_scouter = scouter.ItemScouter._deferred('히슈와')
+    with pytest.raises(errors.LayoutChangedError):
+        item_scouter._scout()
+    assert tracked.closed
+
+
+def finished_scouter(nickname: str, items: dict[str, str]) -> scouter.PandasScouter:
+    memo = equipment.ParsedItemMemo(maxsize=0)
+    pandas_scouter = scouter.PandasScouter._deferred(nickname)
+    pandas_scouter._finish({slot: memo.parse(htmlparser.parse(html)) for slot, html in items.items()})
+    return pandas_scouter
+
+
+def baseline_frame(summary_info_dict: dict, index) -> "pd.DataFrame":
+    """
+    row 마다 DataFrame 을 만들어 pd.concat 으로 이어 붙이던 이전 PandasScouter 의 DataFrame (합계 row 제외).
+    """
+    import pandas as pd
+    df = pd.DataFrame()
+    for slot, summary_info in summary_info_dict.items():
+        data = {'NAME': summary_info.name, 'CATEGORY': summary_info.category}
+        for name in equipment.STAT_NAMES:
+            data[name.upper()], data[name.upper() + '(%)'] = summary_info.stat(name)
+        df = pd.concat([df, pd.DataFrame(data=data, index=[index(slot)])])
+    return df
+
+
+@pytest.mark.parametrize("nickname", AVAILABLE)
+def test_pandas_scouter_matches_concat_frame(nickname):
+    pd = pytest.importorskip("pandas")
+    pandas_scouter = finished_scouter(nickname, read_items(nickname))
+    expected = baseline_frame(pandas_scouter.summary_info_dict, parsetag.EQUIPMENT_INDEX.get)
+    expected.loc['Total'] = expected.iloc[:, 2:].sum(axis=0)
+    pd.testing.assert_frame_equal(pandas_scouter.summary_info_pandas, expected)
+    # 합계는 StatVector 로 더하므로 float 이 아닌 int
+    pd.testing.assert_series_equal(pandas_scouter.total_stat, expected.iloc[:-1, 2:].sum(axis=0), check_dtype=False)
+    assert pandas_scouter.total_stat.dtype == 'int64'
+    pd.testing.assert_frame_equal(pandas_scouter.summary_info_without_zero_columns,
+                                  expected.loc[:, (expected != 0).any(axis=0)])
+
+
+def test_pandas_scouter_without_equipped_items():
+    pytest.importorskip("pandas")
+    pandas_scouter = finished_scouter('빈캐릭', {})
+    df = pandas_scouter.summary_info_pandas
+    assert list(df.index) == ['Total']
+    assert list(df.columns) == ['NAME', 'CATEGORY'] + scouter.STAT_COLUMNS
+    assert (df.loc['Total', scouter.STAT_COLUMNS] == 0).all()
+    assert (pandas_scouter.total_stat == 0).all()
+    assert list(pandas_scouter.summary_info_without_zero_columns.columns) == ['NAME', 'CATEGORY']
+
+
+def test_batch_frame_matches_concat_frames():
+    pd = pytest.importorskip("pandas")
+    result = scouter.BatchScoutResult()
+    expected = {}
+    for nickname in list(AVAILABLE) + ['빈캐릭']:
+        items = read_items(nickname) if nickname in AVAILABLE else {}
+        pandas_scouter = finished_scouter(nickname, items)
+        result._add_scouter(nickname, pandas_scouter)
+        if items:
+            expected[nickname] = baseline_frame(pandas_scouter.summary_info_dict, str)
+    df = result.to_frame()
+    pd.testing.assert_frame_equal(df, pd.concat(expected, names=['nickname', 'slot']))
+    # 장비가 없는 캐릭터는 row 가 없으므로 합계에도 나타나지 않음
+    totals = scouter.total_stat(df)
+    assert list(totals.index) == list(AVAILABLE)
+    for nickname in AVAILABLE:
+        assert list(totals.loc[nickname]) == list(result.scouters[nickname].total_stat)
+    pd.testing.assert_frame_equal(scouter.drop_zero_columns(df), df.loc[:, (df != 0).any(axis=0)])
+
+
+class FakeServer:
+    """
+    랭킹 검색, 캐릭터 정보, 장비 정보 page 와 각 item pot 링크에 fixture 를 돌려주는 httpclient.get.
+    장비 정보 page 는 ETag 를 붙여 보내고, If-None-Match 가 같으면 304 로 응답.
+    """
+    def __init__(self, nickname: str):
+        self.requests = []
+        self.pages = {geturl.GetCharacterDetailUrl.ranking_search_url(nickname): read_character(nickname, "ranking"),
+                      DETAIL_URL: read_character(nickname, "detail")}
+        self.set_page(read_character(nickname, "equipment"), read_items(nickname), etag='"1"')
+
+    def set_page(self, html: str, items: dict[str, str], etag: str):
+        page = parsetag.EquipmentPage.from_html(EQUIPMENT_URL, html)
+        extractor = parsetag.HttpEquipmentTag(page)
+        self.html = html
+        self.etag = etag
+        self.items = {extractor._get_equipment_link(slot): item_html for slot, item_html in items.items()}
+
+    def get(self, url: str, headers=None, **kwargs):
+        self.requests.append(url)
+        if url == EQUIPMENT_URL:
+            if (headers or {}).get('If-None-Match') == self.etag:
+                return Response("", url, status_code=304, headers={'ETag': self.etag})
+            return Response(self.html, url, headers={'ETag': self.etag})
+        if url in self.pages:
+            return Response(self.pages[url], url)
+        return Response(f'<div class="item_info">{self.items[url]}</div>', url)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    pytest.importorskip("requests")
+    fake = FakeServer('히슈와')
+    urlcache.get_cache().put_equipment_url('히슈와', EQUIPMENT_URL)
+    monkeypatch.setattr(parsetag.httpclient, "get", fake.get)
+    return fake
+
+
+def test_scout_fetches_each_page_once(server):
+    urlcache.get_cache().invalidate('히슈와')
+    item_scouter = scouter.ItemScouter('히슈와')
+    # 점검/비공개 확인, 착용 장비 확인, 장비 정보 추출이 장비 정보 page 하나를 공유
+    assert server.requests.count(EQUIPMENT_URL) == 1
+    assert server.requests[:3] == [geturl.GetCharacterDetailUrl.ranking_search_url('히슈와'), DETAIL_URL,
+                                   EQUIPMENT_URL]
+    items = server.requests[3:]
+    assert sorted(items) == sorted(server.items)
+    assert len(item_scouter.equipments_info_dict) == len(items)
+
+
+def test_refresh_reuses_everything_when_not_modified(server):
+    first = scouter.ItemScouter('히슈와')
+    server.requests.clear()
+    refreshed = first.refresh()
+    # 조건부 요청 한 번이 304 이므로 장비 정보는 요청하지 않음
+    assert server.requests == [EQUIPMENT_URL]
+    assert refreshed.equipments_info_dict.keys() == first.equipments_info_dict.keys()
+    for slot, info in first.equipments_info_dict.items():
+        assert refreshed.equipments_info_dict[slot] is info
+        assert refreshed.summary_info_dict[slot] is first.summary_info_dict[slot]
+    assert refreshed.validators == {'ETag': '"1"'}
+    assert refreshed.fingerprints == first.fingerprints
+
+
+def test_refresh_reparses_only_the_changed_slot(server):
+    first = scouter.ItemScouter('히슈와')
+    items = read_items('히슈와')
+    items['모자'] = items['모자'].replace("앱솔랩스 나이트헬름", "아케인셰이드 나이트햇")
+    html = read_character('히슈와', "equipment").replace('Equipment/3?p=', 'Equipment/3?changed=1&p=').replace(
+        'alt="앱솔랩스 나이트헬름"', 'alt="아케인셰이드 나이트햇"')
+    server.set_page(html, items, etag='"2"')
+    server.requests.clear()
+    refreshed = first.refresh()
+    changed = [url for url in server.requests if url != EQUIPMENT_URL]
+    assert len(changed) == 1 and 'Equipment/3?changed=1' in changed[0]
+    assert refreshed.equipments_info_dict['모자'].name == "아케인셰이드 나이트햇"
+    for slot, info in first.equipments_info_dict.items():
+        if slot != '모자':
+            assert refreshed.equipments_info_dict[slot] is info
+            assert refreshed.summary_info_dict[slot] is first.summary_info_dict[slot]
+    assert refreshed.validators == {'ETag': '"2"'}
+
+
+# 이 module 의 객체가 결과에서 참조되면 html (Tag, page 전체) 이 메모리에 남아있다는 뜻
+DOM_MODULES = ('bs4', 'selectolax', 'htmlparser')
+BACKEND_MODULES = {'lxml': 'lxml', 'html5lib': 'html5lib', 'selectolax': 'selectolax'}
+
+
+def dom_references(root) -> list[str]:
+    """
+    root 에서 참조를 따라가며 DOM_MODULES 의 객체가 있는지 찾음. (benchmarks/bench_memory.py 와 같은 방법)
+
+    :return: type names of found DOM objects (list[str])
+    """
+    found = set()
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        module = type(obj).__module__.split('.')[0]
+        if module in DOM_MODULES:
+            found.add(f"{type(obj).__module__}.{type(obj).__name__}")
+            continue
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, (type, type(sys))) or id(referent) in seen:
+                continue
+            seen.add(id(referent))
+            stack.append(referent)
+    return sorted(found)
+
+
+@pytest.mark.parametrize("backend", htmlparser.BACKENDS)
+def test_finished_scouter_holds_no_dom_nodes(server, backend):
+    if backend in BACKEND_MODULES:
+        pytest.importorskip(BACKEND_MODULES[backend])
+    htmlparser.configure(backend)
+    equipment.configure_item_memo()
+    try:
+        item_scouter = scouter.PandasScouter('히슈와')
+        assert dom_references(item_scouter) == []
+        # 다른 캐릭터와 공유하는 memo 의 record 도 Tag 를 붙잡고 있지 않음
+        memo = equipment.get_item_memo()
+        assert memo.stats()['size'] == len(item_scouter.equipments_info_dict)
+        assert dom_references(list(memo._items.values())) == []
+        server.set_page(server.html, read_items('히슈와'), etag='"2"')
+        assert dom_references(item_scouter.refresh()) == []
+    finally:
+        htmlparser.configure()
+        equipment.configure_item_memo()
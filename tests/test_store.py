@@ -0,0 +1,93 @@
+from datetime import date, datetime, timedelta, timezone
+import types
+
+import pytest
+
+from conftest import read_items
+import equipment
+import htmlparser
+
+pytest.importorskip("pyarrow")
+import store
+
+KST = timezone(timedelta(hours=9))
+
+
+def fake_scouter(nickname: str, source: str = '히슈와', slots=None) -> types.SimpleNamespace:
+    """
+    :return: object with nickname and equipments_info_dict like a finished ItemScouter (SimpleNamespace)
+    """
+    items = read_items(source)
+    if slots is not None:
+        items = {slot: items[slot] for slot in slots}
+    memo = equipment.ParsedItemMemo(maxsize=0)
+    return types.SimpleNamespace(nickname=nickname, equipments_info_dict={
+        slot: memo.parse(htmlparser.parse(html))[0] for slot, html in items.items()})
+
+
+def partitions(equipment_store: store.EquipmentStore) -> list[str]:
+    return sorted(path.name for path in equipment_store.root.iterdir())
+
+
+def test_append_and_read_back(tmp_path):
+    equipment_store = store.EquipmentStore(tmp_path / "store")
+    scouter = fake_scouter('히슈와')
+    timestamp = datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc)
+    assert equipment_store.append([scouter], timestamp) == len(scouter.equipments_info_dict)
+    df = equipment_store.read()
+    assert len(df) == len(scouter.equipments_info_dict)
+    assert set(df['nickname']) == {'히슈와'}
+    assert (df['timestamp'] == timestamp).all()
+    rows = df.set_index('slot')
+    for slot, info in scouter.equipments_info_dict.items():
+        row = rows.loc[slot]
+        assert (row['name'], row['category'], row['scroll']) == (info.name, info.category, info.scroll)
+        assert (row['starforce_max'], row['starforce_now']) == (info.starforce_max, info.starforce_now)
+        assert (row['superior'], row['hammer']) == (info.superior, info.hammer)
+    assert equipment_store.append([fake_scouter('빈캐릭', slots=[])], timestamp) == 0
+
+
+def test_read_filters_partitions_and_nicknames(tmp_path):
+    equipment_store = store.EquipmentStore(tmp_path / "store")
+    first, second = datetime(2026, 10, 17, tzinfo=timezone.utc), datetime(2026, 10, 18, tzinfo=timezone.utc)
+    equipment_store.append([fake_scouter('히슈와', slots=['모자', '엠블렘']),
+                            fake_scouter('로하예', '로하예', slots=['모자'])], first)
+    equipment_store.append([fake_scouter('히슈와', slots=['모자'])], second)
+    assert partitions(equipment_store) == ['scrape_date=2026-10-17', 'scrape_date=2026-10-18']
+
+    assert len(equipment_store.read()) == 4
+    assert len(equipment_store.read(start_date=date(2026, 10, 18))) == 1
+    assert len(equipment_store.read(end_date=date(2026, 10, 17))) == 3
+    df = equipment_store.read(nicknames=['히슈와'], slots=['모자'])
+    assert sorted(df['scrape_date']) == ['2026-10-17', '2026-10-18']
+    assert list(equipment_store.read(nicknames=['로하예'], columns=['nickname', 'slot'])['slot']) == ['모자']
+    assert len(equipment_store.read(nicknames=['없는캐릭'])) == 0
+
+
+def test_option_columns_round_trip_as_json(tmp_path):
+    equipment_store = store.EquipmentStore(tmp_path / "store")
+    scouter = fake_scouter('히슈와', slots=['엠블렘'])
+    equipment_store.append([scouter])
+    info = scouter.equipments_info_dict['엠블렘']
+    raw = equipment_store.read().iloc[0]
+    # 한글 key 를 escape 하지 않은 JSON 문자열로 저장
+    assert '보스 몬스터 공격 시 데미지' in raw['potential_options']
+    parsed = equipment_store.read(parse_options=True).iloc[0]
+    assert parsed['stat_options'] == dict(info.stat_options)
+    assert parsed['potential_options'] == dict(info.potential_options)
+    assert parsed['additional_options'] == dict(info.additional_options)
+    assert parsed['potential_tier'] == info.potential_tier
+
+
+@pytest.mark.parametrize("timestamp, partition", [
+    # KST 10/19 01:00 은 UTC 10/18 16:00
+    (datetime(2026, 10, 19, 1, 0, tzinfo=KST), 'scrape_date=2026-10-18'),
+    # timezone 이 없으면 local time 이 아닌 UTC 로 간주
+    (datetime(2026, 10, 18, 23, 30), 'scrape_date=2026-10-18'),
+])
+def test_partition_date_is_utc(tmp_path, timestamp, partition):
+    equipment_store = store.EquipmentStore(tmp_path / "store")
+    equipment_store.append([fake_scouter('히슈와', slots=['모자'])], timestamp)
+    assert partitions(equipment_store) == [partition]
+    stored = equipment_store.read()['timestamp'].iloc[0]
+    assert stored.to_pydatetime() == store.EquipmentStore._to_utc(timestamp)
@@ -0,0 +1,78 @@
+import csv
+import json
+import types
+
+import pytest
+
+from conftest import AVAILABLE, read_items
+import equipment
+import htmlparser
+import scouter
+import summarywriter
+
+
+@pytest.fixture
+def rows() -> list[dict]:
+    memo = equipment.ParsedItemMemo(maxsize=0)
+    rows = []
+    for nickname in AVAILABLE:
+        item_scouter = types.SimpleNamespace(nickname=nickname, summary_info_dict={
+            slot: memo.parse(htmlparser.parse(html))[1] for slot, html in read_items(nickname).items()})
+        rows += summarywriter.summary_rows(item_scouter)
+    return rows
+
+
+def test_summary_rows_follow_summary_fields(rows):
+    assert all(list(row) == summarywriter.SUMMARY_FIELDS for row in rows)
+    assert any(row['BOSS_DAMAGE(%)'] > 0 for row in rows)
+
+
+def test_ndjson_round_trip(tmp_path, rows):
+    path = tmp_path / "summary.ndjson"
+    with summarywriter.open_writer('ndjson', path) as writer:
+        writer.write(rows[:3])
+        writer.write(rows[3:])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == rows
+    # 한글은 escape 하지 않음
+    assert rows[0]['nickname'] in lines[0]
+
+
+def test_csv_round_trip(tmp_path, rows):
+    path = tmp_path / "summary.csv"
+    with summarywriter.open_writer('csv', path) as writer:
+        writer.write(rows[:3])
+        writer.write(rows[3:])
+    with path.open(encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        assert reader.fieldnames == summarywriter.SUMMARY_FIELDS
+        read = [dict(row, **{column: int(row[column]) for column in scouter.STAT_COLUMNS}) for row in reader]
+    assert read == rows
+
+
+def test_parquet_round_trip(tmp_path, rows):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "summary.parquet"
+    writer = summarywriter.ParquetWriter(path, row_group_size=5)
+    with writer:
+        for row in rows:
+            writer.write([row])
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == -(-len(rows) // 5)
+    assert parquet_file.read().to_pylist() == rows
+
+
+def test_text_writers_default_to_stdout(capsys, rows):
+    with summarywriter.open_writer('ndjson', '-') as writer:
+        writer.write(rows[:1])
+    assert json.loads(capsys.readouterr().out) == rows[0]
+
+
+def test_writer_errors():
+    with pytest.raises(TypeError):
+        summarywriter._TextWriter()
+    with pytest.raises(ValueError):
+        summarywriter.open_writer('xlsx')
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        summarywriter.open_writer('parquet', '-')
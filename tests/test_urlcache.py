@@ -0,0 +1,80 @@
+import pytest
+
+import urlcache
+
+DETAIL_URL = "https://maplestory.nexon.com/Common/Character/Detail/히슈와?p=aGlzaHV3YV9wYXJhbQ%3D%3D"
+EQUIPMENT_URL = ("https://maplestory.nexon.com/Common/Character/Detail/히슈와/Equipment"
+                 "?p=aGlzaHV3YV9wYXJhbQ%3D%3D")
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(urlcache.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return urlcache.UrlCache(str(tmp_path / "urls.sqlite3"), ttl=60)
+
+
+def test_urls_expire_after_ttl(cache, clock):
+    cache.put_detail_urls({'히슈와': DETAIL_URL})
+    clock.now += 30
+    cache.put_equipment_url('히슈와', EQUIPMENT_URL)
+    clock.now += 29
+    assert (cache.get_detail_url('히슈와'), cache.get_equipment_url('히슈와')) == (DETAIL_URL, EQUIPMENT_URL)
+    # 각 url 은 저장된 시각부터 ttl 만큼만 유효
+    clock.now += 1
+    assert (cache.get_detail_url('히슈와'), cache.get_equipment_url('히슈와')) == (None, EQUIPMENT_URL)
+    clock.now += 30
+    assert cache.get_equipment_url('히슈와') is None
+
+
+def test_urls_survive_reopening_the_file(cache):
+    cache.put_detail_urls({'히슈와': DETAIL_URL})
+    reopened = urlcache.UrlCache(cache.path, ttl=cache.ttl)
+    assert reopened.get_detail_url('히슈와') == DETAIL_URL
+
+
+def test_invalidate_removes_only_that_nickname(cache):
+    cache.put_detail_urls({'히슈와': DETAIL_URL, '로하예': DETAIL_URL.replace('히슈와', '로하예')})
+    cache.put_equipment_url('히슈와', EQUIPMENT_URL)
+    cache.invalidate('히슈와')
+    assert (cache.get_detail_url('히슈와'), cache.get_equipment_url('히슈와')) == (None, None)
+    assert cache.get_detail_url('로하예') is not None
+
+
+def test_equipment_url_not_matching_the_pattern_is_invalidated(cache):
+    cache.put_detail_urls({'히슈와': DETAIL_URL})
+    cache.put_equipment_url('히슈와', "https://maplestory.nexon.com/Common/Character/Detail/히슈와")
+    assert cache.get_equipment_url('히슈와') is None
+    # 잘못된 url 과 함께 캐릭터 정보 page url 도 삭제되어 랭킹 검색부터 다시 수행
+    assert cache.get_detail_url('히슈와') is None
+
+
+def test_new_detail_url_clears_the_equipment_url(cache):
+    cache.put_detail_urls({'히슈와': DETAIL_URL})
+    cache.put_equipment_url('히슈와', EQUIPMENT_URL)
+    # 같은 url 이면 장비 정보 page url 은 그대로 유지
+    cache.put_detail_urls({'히슈와': DETAIL_URL})
+    assert cache.get_equipment_url('히슈와') == EQUIPMENT_URL
+    cache.put_detail_urls({'히슈와': DETAIL_URL + "&new"})
+    assert cache.get_detail_url('히슈와') == DETAIL_URL + "&new"
+    assert cache.get_equipment_url('히슈와') is None
+
+
+def test_configure_none_disables_the_cache(tmp_path):
+    urlcache.configure(None)
+    assert urlcache.get_cache() is None
+    urlcache.configure(str(tmp_path / "other.sqlite3"), ttl=5)
+    assert (urlcache.get_cache().path, urlcache.get_cache().ttl) == (str(tmp_path / "other.sqlite3"), 5)
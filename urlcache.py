@@ -0,0 +1,149 @@
+from contextlib import closing
+import threading
+import sqlite3
+import time
+import re
+
+
+# GetDetailEquipmentUrl._find_equipment_url 의 유효성 검사와 같은 pattern
+EQUIPMENT_URL_PATTERN = re.compile(r".+/Common/Character/Detail/.+/Equipment\?p.+")
+
+
+class UrlCache:
+    """
+    nickname -> 캐릭터 정보 page url, 장비 정보 page url 을 SQLite 파일에 저장하는 cache.
+
+    url 은 주기적으로 바뀌는 듯 하므로 ttl 초가 지난 url 은 사용하지 않음.
+    저장된 장비 정보 page url 이 pattern 에 맞지 않으면 삭제하고 다시 찾도록 함.
+
+    :param path: sqlite database file path (str)
+    :param ttl: seconds for which cached urls are valid (float)
+    """
+    def __init__(self, path: str = "urlcache.sqlite3", ttl: float = 24 * 60 * 60):
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS character_url ("
+                         "nickname TEXT PRIMARY KEY, "
+                         "detail_url TEXT, detail_updated REAL, "
+                         "equipment_url TEXT, equipment_updated REAL)")
+
+    def _connect(self):
+        # thread 마다 connection 을 새로 열어 사용 (sqlite connection 은 thread 간 공유 불가)
+        return closing(sqlite3.connect(self._path, timeout=30))
+
+    def _fresh(self, updated) -> bool:
+        return (updated is not None) and (time.time() - updated < self._ttl)
+
+    def _row(self, nickname: str):
+        with self._connect() as conn:
+            return conn.execute("SELECT detail_url, detail_updated, equipment_url, equipment_updated "
+                                "FROM character_url WHERE nickname = ?", (nickname,)).fetchone()
+
+    def get_detail_url(self, nickname: str) -> str | None:
+        """
+        :param nickname: want to search (str)
+        :return: cached detail url, or None if missing or expired (str or None)
+        """
+        row = self._row(nickname)
+        if (row is None) or (row[0] is None) or (not self._fresh(row[1])):
+            return None
+        return row[0]
+
+    def get_equipment_url(self, nickname: str) -> str | None:
+        """
+        :param nickname: want to search (str)
+        :return: cached equipment url, or None if missing, expired or invalid (str or None)
+        """
+        row = self._row(nickname)
+        if (row is None) or (row[2] is None) or (not self._fresh(row[3])):
+            return None
+        if EQUIPMENT_URL_PATTERN.match(row[2]) is None:
+            self.invalidate(nickname)
+            return None
+        return row[2]
+
+    def put_detail_urls(self, detail_urls: dict[str, str]):
+        """
+        랭킹 검색 결과의 모든 (nickname, 캐릭터 정보 page url) 을 저장.
+        캐릭터 정보 page url 이 바뀐 캐릭터는 장비 정보 page url 도 더 이상 유효하지 않으므로 삭제.
+
+        :param detail_urls: detail url of each nickname (dict[str, str])
+        :return: None
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn, conn:
+            for nickname, detail_url in detail_urls.items():
+                conn.execute("INSERT INTO character_url (nickname, detail_url, detail_updated) VALUES (?, ?, ?) "
+                             "ON CONFLICT(nickname) DO UPDATE SET "
+                             "equipment_url = CASE WHEN detail_url = excluded.detail_url "
+                             "THEN equipment_url ELSE NULL END, "
+                             "detail_url = excluded.detail_url, detail_updated = excluded.detail_updated",
+                             (nickname, detail_url, now))
+
+    def put_equipment_url(self, nickname: str, equipment_url: str):
+        """
+        :param nickname: want to search (str)
+        :param equipment_url: url of equipment detail page (str)
+        :return: None
+        """
+        with self._lock, self._connect() as conn, conn:
+            conn.execute("INSERT INTO character_url (nickname, equipment_url, equipment_updated) VALUES (?, ?, ?) "
+                         "ON CONFLICT(nickname) DO UPDATE SET "
+                         "equipment_url = excluded.equipment_url, equipment_updated = excluded.equipment_updated",
+                         (nickname, equipment_url, time.time()))
+
+    def invalidate(self, nickname: str):
+        """
+        해당 nickname 의 cache 삭제. 저장된 url 이 더 이상 동작하지 않을 때 호출.
+
+        :param nickname: want to search (str)
+        :return: None
+        """
+        with self._lock, self._connect() as conn, conn:
+            conn.execute("DELETE FROM character_url WHERE nickname = ?", (nickname,))
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_cache_settings = {}
+
+
+def configure(path: str | None = "urlcache.sqlite3", ttl: float = 24 * 60 * 60):
+    """
+    geturl 이 사용하는 공용 cache 설정. path=None 이면 cache 를 사용하지 않음.
+
+    :param path: sqlite database file path, or None to disable caching (str or None)
+    :param ttl: seconds for which cached urls are valid (float)
+    :return: None
+    """
+    global _cache
+    with _cache_lock:
+        _cache_settings.clear()
+        _cache_settings.update(path=path, ttl=ttl)
+        _cache = None
+
+
+def get_cache() -> UrlCache | None:
+    """
+    geturl 이 사용하는 공용 cache. 처음 호출될 때 생성.
+
+    :return: shared cache, or None if disabled (UrlCache or None)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = _cache_settings.get("path", "urlcache.sqlite3")
+            if path is None:
+                return None
+            _cache = UrlCache(path, _cache_settings.get("ttl", 24 * 60 * 60))
+        return _cache